@@ -0,0 +1,152 @@
+"""
+Лента последних действий.
+
+Одна фоновая задача опрашивает ClickHouse и забирает только действия новее
+последнего увиденного, а последние ACTIONS_FEED_SIZE действий хранит в
+кольцевом буфере в памяти. /v1/last_actioins отдаётся из буфера, а
+подписчики WebSocket получают новые действия сразу после опроса. Нагрузка на
+ClickHouse не зависит от числа открытых дашбордов.
+"""
+
+import asyncio
+import datetime
+import logging
+from collections import deque
+from typing import Deque, List, Optional, Set
+
+from app import config
+from app.clickhouse_pool import clickhouse_reader
+from app.crud import get_last_actions_from_clickhouse
+from app.schemas import Action
+
+logger = logging.getLogger(__name__)
+
+
+def _action_key(action: Action) -> tuple:
+    return (action.name, action.date, action.login, action.page, action.action, action.status)
+
+
+class ActionsFeed:
+    """Кольцевой буфер последних действий с рассылкой подписчикам."""
+
+    def __init__(self, size: int, poll_interval: float, queue_size: int):
+        self.size = size
+        self.poll_interval = poll_interval
+        self.queue_size = queue_size
+        # Самое новое действие - первое
+        self._actions: Deque[Action] = deque(maxlen=size)
+        self._last_seen: Optional[datetime.datetime] = None
+        self._seen_at_last: Set[tuple] = set()
+        self._loaded = False
+        self._lock = asyncio.Lock()
+        self._subscribers: Set[asyncio.Queue] = set()
+        self._stop = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    async def refresh(self) -> List[Action]:
+        """Загрузка действий новее последнего увиденного. Возвращает новые действия."""
+        async with self._lock:
+            rows = await get_last_actions_from_clickhouse(
+                clickhouse_reader, since=self._last_seen, limit=self.size
+            )
+            # Действия с тем же временем, что и последнее увиденное, уже могли попасть в буфер
+            new_actions = [row for row in reversed(rows) if _action_key(row) not in self._seen_at_last]
+            for action in new_actions:
+                self._actions.appendleft(action)
+
+            if new_actions:
+                newest = max(action.date for action in new_actions)
+                if self._last_seen is None or newest > self._last_seen:
+                    self._last_seen = newest
+                    self._seen_at_last = set()
+                self._seen_at_last.update(
+                    _action_key(action) for action in new_actions if action.date == self._last_seen
+                )
+            self._loaded = True
+
+        if new_actions:
+            self._publish(new_actions)
+        return new_actions
+
+    async def get_actions(self) -> List[Action]:
+        """Последние действия, самое новое первым."""
+        if not self._loaded:
+            await self.refresh()
+        return list(self._actions)
+
+    def subscribe(self) -> asyncio.Queue:
+        """Подписка на новые действия."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        """Отписка от новых действий."""
+        self._subscribers.discard(queue)
+
+    def _publish(self, actions: List[Action]) -> None:
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(actions)
+            except asyncio.QueueFull:
+                # Медленный подписчик отключается, чтобы не копить очередь
+                self._disconnect(queue)
+
+    def _disconnect(self, queue: asyncio.Queue) -> None:
+        # None в очереди - сигнал подписчику завершить соединение
+        self._subscribers.discard(queue)
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(None)
+
+    async def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error("Ошибка обновления ленты действий: %s", e)
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        """Запуск опроса ClickHouse."""
+        if self._task is None:
+            self._stop.clear()
+            self._task = asyncio.create_task(self._run(), name="actions_feed")
+
+    async def stop(self) -> None:
+        """Остановка опроса и отключение подписчиков."""
+        if self._task is not None:
+            # Задача завершается по флагу, а не отменой, чтобы не прервать запрос
+            self._stop.set()
+            await self._task
+            self._task = None
+        for queue in list(self._subscribers):
+            self._disconnect(queue)
+
+    def get_stats(self) -> dict:
+        """Состояние ленты для мониторинга."""
+        return {
+            "size": len(self._actions),
+            "subscribers": len(self._subscribers),
+            "last_seen": self._last_seen,
+        }
+
+
+actions_feed = ActionsFeed(
+    size=config.ACTIONS_FEED_SIZE,
+    poll_interval=config.ACTIONS_FEED_POLL_INTERVAL,
+    queue_size=config.ACTIONS_FEED_SUBSCRIBER_QUEUE,
+)
+
+
+async def start_actions_feed() -> None:
+    """Запуск ленты последних действий."""
+    actions_feed.start()
+
+
+async def stop_actions_feed() -> None:
+    """Остановка ленты последних действий."""
+    await actions_feed.stop()
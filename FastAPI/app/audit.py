@@ -0,0 +1,117 @@
+"""
+Аудит действий на стороне сервера.
+
+ASGI-middleware записывает в журнал действий ClickHouse каждый вызов
+диагностических эндпоинтов и эндпоинтов исправления: пользователя, логин
+абонента, страницу и действие, статус ответа и время выполнения. Запись идёт
+через буфер пакетной записи, поэтому ответ клиенту не задерживается.
+
+Эндпоинт дополняет запись через set_audit_details: поля провалидированного
+тела запроса попадают в payload, action уточняет действие из AUDITED_ROUTES.
+"""
+
+import logging
+import time
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs
+
+from starlette.requests import Request
+
+from app import config
+from app.auth_cache import principal_cache
+from app.clickhouse_writer import action_log_writer
+
+logger = logging.getLogger(__name__)
+
+# (метод, шаблон пути) -> (страница, действие)
+AUDITED_ROUTES: Dict[Tuple[str, str], Tuple[str, str]] = {
+    ("GET", "/v1/app"): ("Приложение", "Просмотр"),
+    ("PATCH", "/v1/app/change_role"): ("Приложение", "Изменение роли"),
+    ("DELETE", "/v1/app/houses_flats_subscribers/{house_id}/{flat_id}"): ("Приложение", "Отвязка от квартиры"),
+    ("PATCH", "/v1/app/relocate"): ("Приложение", "Переселение"),
+    ("GET", "/v1/TV"): ("TV", "Просмотр"),
+    ("POST", "/v1/TV/fix"): ("TV", "Исправление расхождений"),
+    ("GET", "/v1/intercom"): ("Домофония", "Просмотр"),
+    ("POST", "/v1/intercom/fix-manual-block"): ("Видеонаблюдение", "Исправление manual block"),
+    ("GET", "/v1/cameras"): ("Видеонаблюдение", "Просмотр"),
+    ("POST", "/camera/{camera_id}"): ("Видеонаблюдение", "Изменение настроек"),
+    ("GET", "/v1/payment"): ("Оплата", "Просмотр"),
+    ("GET", "/v1/failure"): ("Аварии", "Просмотр"),
+    ("GET", "/v1/network"): ("Сеть", "Просмотр"),
+}
+
+
+def set_audit_details(request: Request, action: Optional[str] = None, **details: Any) -> None:
+    """Данные действия для записи аудита текущего запроса."""
+    request.state.audit = (action, details)
+
+
+class AuditMiddleware:
+    """Запись вызовов эндпоинтов из AUDITED_ROUTES в журнал действий."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not config.AUDIT_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            try:
+                self._record(scope, status_code, time.perf_counter() - started)
+            except Exception as e:
+                logger.error("Ошибка записи аудита: %s", e)
+
+    @staticmethod
+    def _record(scope, status_code: int, duration: float) -> None:
+        # Маршрут становится известен только после обработки запроса роутером
+        route = scope.get("route")
+        if route is None:
+            return
+        names = AUDITED_ROUTES.get((scope["method"], route.path))
+        if names is None:
+            return
+        page, action = names
+        # Request.state эндпоинта хранится в scope["state"]
+        audit_action, details = scope.get("state", {}).get("audit", (None, {}))
+        action = audit_action or action
+
+        headers = dict(scope["headers"])
+        token = headers.get(b"x-token", b"").decode("latin-1")
+        # Токен уже проверен зависимостью эндпоинта, пользователь есть в кэше
+        principal = principal_cache.get(token) if token else None
+
+        query_string = scope.get("query_string", b"").decode("latin-1")
+        query = parse_qs(query_string)
+        url = scope["path"] + ("?" + query_string if query_string else "")
+
+        action_log_writer.enqueue(
+            user_name=principal.username if principal else "",
+            login=query.get("login", [""])[0],
+            page=page,
+            action=action,
+            success=status_code < 400,
+            message=f"HTTP {status_code}",
+            url=url,
+            payload={
+                "method": scope["method"],
+                "route": route.path,
+                "status_code": status_code,
+                "duration_ms": round(duration * 1000, 3),
+                "path_params": scope.get("path_params", {}),
+                "details": details,
+            },
+            user_id=principal.user_id if principal else 0,
+        )
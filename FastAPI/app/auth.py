@@ -1,14 +1,49 @@
+"""
+Хэширование паролей.
+
+bcrypt выполняется в отдельном пуле потоков, чтобы не блокировать
+event loop. Число одновременных операций ограничено семафором.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
 import bcrypt
 
+from app.config import BCRYPT_MAX_WORKERS, BCRYPT_ROUNDS
+
+_executor = ThreadPoolExecutor(max_workers=BCRYPT_MAX_WORKERS, thread_name_prefix="bcrypt")
+_semaphore = asyncio.Semaphore(BCRYPT_MAX_WORKERS)
+
+
+async def _run_in_executor(func, *args):
+    async with _semaphore:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, func, *args)
+
+
+def _hash_password(password: str) -> str:
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(BCRYPT_ROUNDS)).decode()
+
+
+def _verify_password(password: str, hashed_password: str) -> bool:
+    return bcrypt.checkpw(password.encode(), hashed_password.encode())
+
 
 async def hash_password(password: str) -> str:
-    password = password.encode()
-    password = bcrypt.hashpw(password, bcrypt.gensalt())
-    password = password.decode()
-    return password
+    return await _run_in_executor(_hash_password, password)
 
 
 async def verify_password(password: str, hashed_password: str) -> bool:
-    password = password.encode()
-    hashed_password = hashed_password.encode()
-    return bcrypt.checkpw(password, hashed_password)
+    return await _run_in_executor(_verify_password, password, hashed_password)
+
+
+def needs_rehash(hashed_password: str) -> bool:
+    """Проверка, отличается ли стоимость хэша от настроенной BCRYPT_ROUNDS."""
+    try:
+        return int(hashed_password.split("$")[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+
+def shutdown_executor() -> None:
+    _executor.shutdown(wait=False, cancel_futures=True)
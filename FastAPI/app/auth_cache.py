@@ -0,0 +1,113 @@
+"""
+Кэш аутентифицированных пользователей.
+
+Хранит соответствие токена и неизменяемого Principal (пользователь, роль,
+срок действия токена), чтобы проверка токена не обращалась к MySQL на
+каждом запросе. Размер кэша ограничен, вытеснение - LRU. Записи живут
+не дольше AUTH_CACHE_TTL и не дольше срока действия самого токена.
+Выход, удаление пользователя и смена роли сбрасывают записи явно.
+"""
+
+import datetime
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from sqlalchemy import select
+
+from app import config
+from app.models import Role, Session, Token, User
+from app.schemas import Principal
+
+
+class PrincipalCache:
+    """TTL-кэш токен -> Principal с LRU-вытеснением."""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._items: "OrderedDict[str, Tuple[float, Principal]]" = OrderedDict()
+
+    def get(self, token: str) -> Optional[Principal]:
+        """Получение пользователя по токену, если запись ещё актуальна."""
+        item = self._items.get(token)
+        if item is None:
+            return None
+
+        deadline, principal = item
+        if deadline <= time.monotonic():
+            del self._items[token]
+            return None
+
+        self._items.move_to_end(token)
+        return principal
+
+    def set(self, principal: Principal) -> None:
+        """Сохранение пользователя в кэш."""
+        token_ttl = (principal.expires_at - datetime.datetime.now()).total_seconds()
+        ttl = min(self.ttl, token_ttl)
+        if ttl <= 0:
+            return
+
+        self._items[principal.token] = (time.monotonic() + ttl, principal)
+        self._items.move_to_end(principal.token)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def invalidate_token(self, token: str) -> None:
+        """Сброс записи по токену."""
+        self._items.pop(token, None)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Сброс всех записей пользователя."""
+        for token in [t for t, (_, p) in self._items.items() if p.user_id == user_id]:
+            del self._items[token]
+
+    def clear(self) -> None:
+        """Полная очистка кэша."""
+        self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+principal_cache = PrincipalCache(config.AUTH_CACHE_MAX_SIZE, config.AUTH_CACHE_TTL)
+
+
+async def load_principal(session: Session, token: str) -> Optional[Principal]:  # type: ignore
+    """Загрузка пользователя по действующему токену из базы данных."""
+    min_creation_time = datetime.datetime.now() - datetime.timedelta(seconds=int(config.TOKEN_TTL))
+    query = (
+        select(Token.creation_time, User.id, User.username, User.role_id, Role.name)
+        .join(User, Token.user_id == User.id)
+        .join(Role, User.role_id == Role.id)
+        .where(Token.token == token, Token.creation_time >= min_creation_time)
+        .limit(1)
+    )
+    row = (await session.execute(query)).first()
+    if row is None:
+        return None
+
+    creation_time, user_id, username, role_id, role_name = row
+    return Principal(
+        token=token,
+        user_id=user_id,
+        username=username,
+        role_id=role_id,
+        role_name=role_name,
+        expires_at=creation_time + datetime.timedelta(seconds=int(config.TOKEN_TTL)),
+    )
+
+
+async def get_principal(token: str) -> Optional[Principal]:
+    """Получение пользователя по токену: сначала из кэша, затем из базы."""
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+
+    async with Session() as session:
+        principal = await load_principal(session, token)
+
+    if principal is not None:
+        principal_cache.set(principal)
+    return principal
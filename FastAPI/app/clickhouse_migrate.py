@@ -0,0 +1,126 @@
+"""
+Миграция схемы ClickHouse.
+
+Создаёт базу, таблицу actions_logs, её проекции, таблицы почасовых
+агрегатов и материализованные представления. Повторный запуск ничего не
+меняет.
+
+Запуск:
+    python -m app.clickhouse_migrate [--materialize] [--backfill] [--dry-run]
+
+--materialize строит проекции для уже записанных строк (мутация в фоне).
+--backfill переносит в таблицы агрегатов действия, записанные до создания
+их материализованных представлений. Представление учитывает действия с
+date не раньше границы, заполнение - строго раньше, поэтому ни одна строка
+не учитывается дважды.
+
+date строке ставит ActionLogWriter при постановке в буфер, а в ClickHouse
+она попадает позже, до CLICKHOUSE_LOG_MAX_LAG секунд. Поэтому граница
+выбирается на CLICKHOUSE_LOG_MAX_LAG в будущем: строки после неё
+вставляются уже после создания представлений. Заполнение ждёт, пока
+граница и ещё CLICKHOUSE_LOG_MAX_LAG пройдут, чтобы все строки до неё
+были записаны. Строки, пролежавшие в буфере дольше (ClickHouse был
+недоступен дольше паузы повтора), в агрегаты не попадут.
+
+Заполнение возможно только в запуске, создавшем представление; для
+повторного заполнения таблица агрегатов и её представление удаляются
+вручную.
+"""
+
+import argparse
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Set
+
+import clickhouse_connect
+
+from app import config
+from app.clickhouse_schema import (
+    ACTIONS_LOGS_PROJECTIONS,
+    AGGREGATE_SELECTS,
+    DATABASE,
+    backfill_sql,
+    materialize_projection_sql,
+    migrations,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def get_client():
+    """Клиент ClickHouse для миграции."""
+    return clickhouse_connect.get_client(
+        host=config.CLICKHOUSE_HOST or "localhost",
+        username=config.CLICKHOUSE_USER or "default",
+        password=config.CLICKHOUSE_PASSWORD or "",
+    )
+
+
+def existing_views(client) -> Set[str]:
+    """Материализованные представления, уже созданные в базе."""
+    result = client.query(
+        "SELECT name FROM system.tables WHERE database = %(database)s AND engine = 'MaterializedView'",
+        parameters={"database": DATABASE},
+    )
+    return {f"{DATABASE}.{name}" for (name,) in result.result_rows}
+
+
+def _wait_until(moment: datetime) -> None:
+    delay = (moment - datetime.now(timezone.utc)).total_seconds()
+    if delay > 0:
+        logger.info("Ожидание записи буферов журнала действий: %.0f с", delay)
+        time.sleep(delay)
+
+
+def migrate(client, materialize: bool = False, backfill: bool = False, dry_run: bool = False) -> None:
+    """Применение схемы."""
+    # Граница между представлениями и заполнением: строки с date после неё
+    # ещё не записаны, когда представления уже созданы
+    lag = timedelta(seconds=config.CLICKHOUSE_LOG_MAX_LAG)
+    cutoff = datetime.now(timezone.utc) + lag
+    created_before = set() if dry_run else existing_views(client)
+
+    statements = list(migrations(cutoff))
+    if materialize:
+        statements += [materialize_projection_sql(name) for name in ACTIONS_LOGS_PROJECTIONS]
+
+    for statement in statements:
+        logger.info("%s", " ".join(statement.split()))
+        if not dry_run:
+            client.command(statement)
+
+    if backfill:
+        # Представление прошлого запуска учитывает действия со своей границы,
+        # которая здесь неизвестна - заполнение удвоило бы счётчики
+        for table in AGGREGATE_SELECTS:
+            if f"{table}_mv" in created_before:
+                logger.info("Представление %s_mv создано ранее, заполнение пропущено", table)
+        tables = [table for table in AGGREGATE_SELECTS if f"{table}_mv" not in created_before]
+        if tables and not dry_run:
+            _wait_until(cutoff + lag)
+        for table in tables:
+            statement = backfill_sql(table, cutoff)
+            logger.info("%s", " ".join(statement.split()))
+            if not dry_run:
+                client.command(statement)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Миграция схемы ClickHouse")
+    parser.add_argument("--materialize", action="store_true", help="построить проекции для существующих данных")
+    parser.add_argument("--backfill", action="store_true", help="заполнить таблицы агрегатов при создании представлений")
+    parser.add_argument("--dry-run", action="store_true", help="только вывести выражения")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    client = None if args.dry_run else get_client()
+    try:
+        migrate(client, materialize=args.materialize, backfill=args.backfill, dry_run=args.dry_run)
+    finally:
+        if client is not None:
+            client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Общий клиент ClickHouse для чтения.
+
+Клиент создаётся один раз в lifespan приложения и использует пул
+HTTP-соединений с поддержкой сжатия. Запросы выполняются в отдельном пуле
+потоков, поэтому не блокируют event loop. Число одновременных запросов
+ограничено, у каждого запроса есть таймаут.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+import clickhouse_connect
+from clickhouse_connect.driver import httputil
+from clickhouse_connect.driver.query import QueryResult
+from fastapi import HTTPException
+
+from app import config
+
+logger = logging.getLogger(__name__)
+
+
+class ClickHouseReader:
+    """Асинхронная обёртка над синхронным клиентом clickhouse_connect."""
+
+    def __init__(self, max_concurrent: int, timeout: float):
+        self.max_concurrent = max_concurrent
+        self.timeout = timeout
+        self._client = None
+        self._client_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self.stats: Dict[str, Any] = {
+            "queries": 0,
+            "errors": 0,
+            "timeouts": 0,
+            "in_flight": 0,
+            "waits": 0,
+            "time_total": 0.0,
+        }
+
+    def _get_client(self):
+        with self._client_lock:
+            if self._client is None:
+                self._client = self._create_client()
+        return self._client
+
+    def _create_client(self):
+        client = clickhouse_connect.get_client(
+            host=config.CLICKHOUSE_HOST or "localhost",
+            username=config.CLICKHOUSE_USER or "default",
+            password=config.CLICKHOUSE_PASSWORD or "",
+            compress=True,
+            connect_timeout=config.CLICKHOUSE_CONNECT_TIMEOUT,
+            send_receive_timeout=config.CLICKHOUSE_QUERY_TIMEOUT,
+            # Без сессии, иначе ClickHouse не даёт выполнять запросы параллельно
+            autogenerate_session_id=False,
+            pool_mgr=httputil.get_pool_manager(maxsize=self.max_concurrent, num_pools=1),
+        )
+        logger.info("Клиент ClickHouse создан (max_concurrent=%s)", self.max_concurrent)
+        return client
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrent, thread_name_prefix="clickhouse"
+            )
+        return self._executor
+
+    def _query(self, query: str, parameters: Optional[Dict], settings: Dict) -> QueryResult:
+        return self._get_client().query(query, parameters=parameters, settings=settings)
+
+    async def query(
+        self, query: str, parameters: Optional[Dict] = None, timeout: Optional[float] = None
+    ) -> QueryResult:
+        """Выполнение запроса на чтение с таймаутом."""
+        timeout = timeout or self.timeout
+        # Сервер сам прерывает запрос, превысивший таймаут
+        settings = {"max_execution_time": int(timeout) or 1}
+
+        if self._semaphore.locked():
+            self.stats["waits"] += 1
+        async with self._semaphore:
+            self.stats["in_flight"] += 1
+            started = time.perf_counter()
+            loop = asyncio.get_running_loop()
+            try:
+                return await asyncio.wait_for(
+                    loop.run_in_executor(self._get_executor(), self._query, query, parameters, settings),
+                    timeout=timeout,
+                )
+            except asyncio.TimeoutError as e:
+                self.stats["timeouts"] += 1
+                raise HTTPException(status_code=504, detail="Превышено время ожидания ClickHouse") from e
+            except Exception:
+                self.stats["errors"] += 1
+                raise
+            finally:
+                self.stats["in_flight"] -= 1
+                self.stats["queries"] += 1
+                self.stats["time_total"] += time.perf_counter() - started
+
+    async def connect(self) -> None:
+        """Создание клиента; обращается к серверу, поэтому выполняется в потоке."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._get_executor(), self._get_client)
+
+    def close(self) -> None:
+        """Закрытие клиента и пула потоков."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._client is not None:
+            try:
+                self._client.close()
+            except Exception as e:
+                logger.error("Ошибка закрытия клиента ClickHouse: %s", e)
+            self._client = None
+
+    def get_stats(self) -> dict:
+        """Статистика запросов для мониторинга."""
+        queries = self.stats["queries"]
+        return {
+            "max_concurrent": self.max_concurrent,
+            "queries": queries,
+            "errors": self.stats["errors"],
+            "timeouts": self.stats["timeouts"],
+            "in_flight": self.stats["in_flight"],
+            "waits": self.stats["waits"],
+            "time_avg_ms": self.stats["time_total"] / queries * 1000 if queries else 0.0,
+        }
+
+
+clickhouse_reader = ClickHouseReader(
+    max_concurrent=config.CLICKHOUSE_MAX_CONCURRENT_QUERIES,
+    timeout=config.CLICKHOUSE_QUERY_TIMEOUT,
+)
+
+
+def get_clickhouse_reader() -> ClickHouseReader:
+    """Получение общего клиента ClickHouse для чтения."""
+    return clickhouse_reader
+
+
+async def start_clickhouse_reader() -> None:
+    """Создание клиента ClickHouse для чтения."""
+    try:
+        await clickhouse_reader.connect()
+    except Exception as e:
+        # ClickHouse недоступен при старте - клиент будет создан при первом запросе
+        logger.error("Не удалось создать клиент ClickHouse: %s", e)
+
+
+async def close_clickhouse_reader() -> None:
+    """Закрытие клиента ClickHouse для чтения."""
+    clickhouse_reader.close()
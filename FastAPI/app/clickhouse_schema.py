@@ -0,0 +1,235 @@
+"""
+Схема таблиц ClickHouse, с которыми работает приложение.
+
+actions_logs разбита на партиции по месяцам и упорядочена по
+(день, логин, пользователь, время). page и action хранятся как
+LowCardinality, payload сжимается ZSTD, старые строки удаляются по TTL.
+
+Проекции actions_logs хранят копию данных, упорядоченную по (login, date),
+и готовые счётчики по логину. Запросы истории абонента читают их
+диапазоном по первичному ключу, а не сканируют всю таблицу.
+
+Материализованные представления при каждой вставке в actions_logs
+дописывают почасовые счётчики по страницам, действиям, пользователям и
+логинам в небольшие таблицы SummingMergeTree, а квантили времени ответа эндпоинтов
+(по записям серверного аудита) - в таблицу AggregatingMergeTree.
+Дашборды и /v1/stats/* читают их вместо исходной таблицы. Представление
+учитывает только действия не раньше момента своего создания, более ранние
+действия переносятся в таблицу агрегатов отдельной вставкой (--backfill),
+поэтому ни одна строка не попадает в счётчики дважды.
+
+Все выражения идемпотентны и применяются командой
+python -m app.clickhouse_migrate.
+"""
+
+from datetime import datetime, timezone
+from typing import List
+
+from app import config
+
+DATABASE = "Diagnostic_APP"
+ACTIONS_LOGS_TABLE = f"{DATABASE}.actions_logs"
+ACTIONS_HOURLY_TABLE = f"{DATABASE}.actions_hourly"
+ACTIONS_HOURLY_BY_LOGIN_TABLE = f"{DATABASE}.actions_hourly_by_login"
+REQUEST_LATENCY_HOURLY_TABLE = f"{DATABASE}.request_latency_hourly"
+
+CREATE_DATABASE = f"CREATE DATABASE IF NOT EXISTS {DATABASE}"
+
+CREATE_ACTIONS_LOGS = f"""
+    CREATE TABLE IF NOT EXISTS {ACTIONS_LOGS_TABLE}
+    (
+        user_name LowCardinality(String),
+        login String,
+        page LowCardinality(String),
+        action LowCardinality(String),
+        status Bool,
+        message String CODEC(ZSTD(3)),
+        date DateTime64(6, 'UTC'),
+        url String CODEC(ZSTD(3)),
+        payload String CODEC(ZSTD(3)),
+        user_id UInt32,
+        PROJECTION by_login
+        (
+            SELECT *
+            ORDER BY login, date
+        ),
+        PROJECTION login_action_counts
+        (
+            SELECT login, page, action, count(), countIf(status)
+            GROUP BY login, page, action
+        )
+    )
+    ENGINE = MergeTree
+    PARTITION BY toYYYYMM(date)
+    ORDER BY (toDate(date), login, user_name, date)
+    TTL toDateTime(date) + INTERVAL {config.ACTIONS_LOG_TTL_DAYS} DAY
+"""
+
+# Для таблицы, созданной до появления схемы в приложении
+MODIFY_ACTIONS_LOGS_TTL = f"""
+    ALTER TABLE {ACTIONS_LOGS_TABLE}
+    MODIFY TTL toDateTime(date) + INTERVAL {config.ACTIONS_LOG_TTL_DAYS} DAY
+"""
+
+# История действий по логину: WHERE login = ... AND date < ... ORDER BY date DESC
+ACTIONS_LOGS_BY_LOGIN_PROJECTION = f"""
+    ALTER TABLE {ACTIONS_LOGS_TABLE}
+    ADD PROJECTION IF NOT EXISTS by_login
+    (
+        SELECT *
+        ORDER BY login, date
+    )
+"""
+
+# Счётчики действий по логину, странице и действию
+ACTIONS_LOGS_LOGIN_COUNTS_PROJECTION = f"""
+    ALTER TABLE {ACTIONS_LOGS_TABLE}
+    ADD PROJECTION IF NOT EXISTS login_action_counts
+    (
+        SELECT login, page, action, count(), countIf(status)
+        GROUP BY login, page, action
+    )
+"""
+
+ACTIONS_LOGS_PROJECTIONS = {
+    "by_login": ACTIONS_LOGS_BY_LOGIN_PROJECTION,
+    "login_action_counts": ACTIONS_LOGS_LOGIN_COUNTS_PROJECTION,
+}
+
+# Почасовые счётчики по страницам, действиям и пользователям. Все измерения
+# в одной таблице, чтобы любой фильтр /v1/stats/actions применялся к любому срезу
+CREATE_ACTIONS_HOURLY = f"""
+    CREATE TABLE IF NOT EXISTS {ACTIONS_HOURLY_TABLE}
+    (
+        hour DateTime('UTC'),
+        page LowCardinality(String),
+        action LowCardinality(String),
+        user_name LowCardinality(String),
+        total UInt64,
+        success UInt64
+    )
+    ENGINE = SummingMergeTree
+    PARTITION BY toYYYYMM(hour)
+    ORDER BY (hour, page, action, user_name)
+    TTL hour + INTERVAL {config.ACTIONS_LOG_TTL_DAYS} DAY
+"""
+
+ACTIONS_HOURLY_SELECT = f"""
+    SELECT
+        toStartOfHour(toDateTime(date, 'UTC')) AS hour,
+        page,
+        action,
+        user_name,
+        count() AS total,
+        countIf(status) AS success
+    FROM {ACTIONS_LOGS_TABLE}
+    WHERE {{condition}}
+    GROUP BY hour, page, action, user_name
+"""
+
+# Почасовые счётчики по логинам для топа абонентов
+CREATE_ACTIONS_HOURLY_BY_LOGIN = f"""
+    CREATE TABLE IF NOT EXISTS {ACTIONS_HOURLY_BY_LOGIN_TABLE}
+    (
+        hour DateTime('UTC'),
+        page LowCardinality(String),
+        action LowCardinality(String),
+        user_name LowCardinality(String),
+        login String,
+        total UInt64
+    )
+    ENGINE = SummingMergeTree
+    PARTITION BY toYYYYMM(hour)
+    ORDER BY (hour, page, action, user_name, login)
+    TTL hour + INTERVAL {config.ACTIONS_LOG_TTL_DAYS} DAY
+"""
+
+ACTIONS_HOURLY_BY_LOGIN_SELECT = f"""
+    SELECT
+        toStartOfHour(toDateTime(date, 'UTC')) AS hour,
+        page,
+        action,
+        user_name,
+        login,
+        count() AS total
+    FROM {ACTIONS_LOGS_TABLE}
+    WHERE login != '' AND {{condition}}
+    GROUP BY hour, page, action, user_name, login
+"""
+
+
+# Почасовые квантили времени ответа по эндпоинтам из записей серверного аудита
+CREATE_REQUEST_LATENCY_HOURLY = f"""
+    CREATE TABLE IF NOT EXISTS {REQUEST_LATENCY_HOURLY_TABLE}
+    (
+        hour DateTime('UTC'),
+        endpoint LowCardinality(String),
+        requests SimpleAggregateFunction(sum, UInt64),
+        latency AggregateFunction(quantiles(0.5, 0.95, 0.99), Float64)
+    )
+    ENGINE = AggregatingMergeTree
+    PARTITION BY toYYYYMM(hour)
+    ORDER BY (hour, endpoint)
+    TTL hour + INTERVAL {config.ACTIONS_LOG_TTL_DAYS} DAY
+"""
+
+REQUEST_LATENCY_HOURLY_SELECT = f"""
+    SELECT
+        toStartOfHour(toDateTime(date, 'UTC')) AS hour,
+        concat(JSONExtractString(payload, 'method'), ' ', JSONExtractString(payload, 'route')) AS endpoint,
+        toUInt64(count()) AS requests,
+        quantilesState(0.5, 0.95, 0.99)(JSONExtractFloat(payload, 'duration_ms')) AS latency
+    FROM {ACTIONS_LOGS_TABLE}
+    WHERE JSONHas(payload, 'duration_ms') AND JSONHas(payload, 'route') AND {{condition}}
+    GROUP BY hour, endpoint
+"""
+
+
+# Таблица агрегатов -> запрос её материализованного представления
+AGGREGATE_SELECTS = {
+    ACTIONS_HOURLY_TABLE: ACTIONS_HOURLY_SELECT,
+    ACTIONS_HOURLY_BY_LOGIN_TABLE: ACTIONS_HOURLY_BY_LOGIN_SELECT,
+    REQUEST_LATENCY_HOURLY_TABLE: REQUEST_LATENCY_HOURLY_SELECT,
+}
+
+
+def _date_condition(operator: str, cutoff: datetime) -> str:
+    value = cutoff.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f")
+    return f"date {operator} toDateTime64('{value}', 6, 'UTC')"
+
+
+def materialized_view_sql(table: str, cutoff: datetime) -> str:
+    """Представление, дописывающее в таблицу агрегатов действия начиная с cutoff."""
+    select = AGGREGATE_SELECTS[table].format(condition=_date_condition(">=", cutoff))
+    return f"CREATE MATERIALIZED VIEW IF NOT EXISTS {table}_mv TO {table} AS {select}"
+
+
+def backfill_sql(table: str, cutoff: datetime) -> str:
+    """Заполнение таблицы агрегатов действиями до cutoff."""
+    select = AGGREGATE_SELECTS[table].format(condition=_date_condition("<", cutoff))
+    return f"INSERT INTO {table} {select}"
+
+
+def materialize_projection_sql(name: str) -> str:
+    """Построение проекции для уже записанных данных."""
+    return f"ALTER TABLE {ACTIONS_LOGS_TABLE} MATERIALIZE PROJECTION {name}"
+
+
+def migrations(cutoff: datetime) -> List[str]:
+    """Выражения миграции в порядке применения.
+
+    Новые материализованные представления учитывают действия начиная с
+    cutoff, более ранние дописывает backfill_sql с тем же cutoff.
+    """
+    return [
+        CREATE_DATABASE,
+        CREATE_ACTIONS_LOGS,
+        MODIFY_ACTIONS_LOGS_TTL,
+        *ACTIONS_LOGS_PROJECTIONS.values(),
+        CREATE_ACTIONS_HOURLY,
+        materialized_view_sql(ACTIONS_HOURLY_TABLE, cutoff),
+        CREATE_ACTIONS_HOURLY_BY_LOGIN,
+        materialized_view_sql(ACTIONS_HOURLY_BY_LOGIN_TABLE, cutoff),
+        CREATE_REQUEST_LATENCY_HOURLY,
+        materialized_view_sql(REQUEST_LATENCY_HOURLY_TABLE, cutoff),
+    ]
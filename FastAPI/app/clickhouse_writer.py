@@ -0,0 +1,220 @@
+"""
+Буферизированная запись журнала действий в ClickHouse.
+
+/v1/log только кладёт строку в буфер в памяти. Фоновая задача, запущенная
+в lifespan, сбрасывает буфер пачками (по размеру пачки или по таймеру)
+колоночной вставкой в отдельном потоке, не блокируя event loop.
+При ошибке записи пачка возвращается в буфер и запись повторяется с
+нарастающей паузой. Размер буфера ограничен: при переполнении
+отбрасываются самые старые строки. При остановке приложения буфер
+дописывается до конца.
+"""
+
+import asyncio
+import datetime
+import json
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import clickhouse_connect
+import pytz
+
+from app import config
+
+logger = logging.getLogger(__name__)
+
+ACTIONS_LOG_DATABASE = "Diagnostic_APP"
+ACTIONS_LOG_TABLE = "actions_logs"
+ACTIONS_LOG_COLUMNS = (
+    "user_name", "login", "page", "action", "status",
+    "message", "date", "url", "payload", "user_id",
+)
+
+# Используем UTC+5 (Екатеринбург)
+TIMEZONE = pytz.timezone("Asia/Yekaterinburg")
+
+
+class ActionLogWriter:
+    """Буфер строк actions_logs с фоновой пакетной записью."""
+
+    def __init__(self, batch_size: int, flush_interval: float, max_buffer: int):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self._buffer: Deque[Tuple] = deque()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stop = asyncio.Event()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._client = None
+        self.stats: Dict[str, Any] = {
+            "enqueued": 0,
+            "written": 0,
+            "dropped": 0,
+            "batches": 0,
+            "failures": 0,
+            "last_error": None,
+            "last_flush": None,
+        }
+
+    def enqueue(
+        self,
+        user_name: str,
+        login: str,
+        page: str,
+        action: str,
+        success: bool,
+        message: str,
+        url: str,
+        payload: Dict,
+        user_id: int,
+    ) -> None:
+        """Добавление строки в буфер без ожидания записи."""
+        row = (
+            user_name, login, page, action, success,
+            message, datetime.datetime.now(TIMEZONE), url, json.dumps(payload), user_id,
+        )
+        self._buffer.append(row)
+        self.stats["enqueued"] += 1
+        self._trim()
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    def _trim(self) -> None:
+        while len(self._buffer) > self.max_buffer:
+            self._buffer.popleft()
+            self.stats["dropped"] += 1
+
+    def _get_client(self):
+        # Клиент используется только из потока записи
+        if self._client is None:
+            self._client = clickhouse_connect.get_client(
+                host=config.CLICKHOUSE_HOST or "localhost",
+                username=config.CLICKHOUSE_USER or "default",
+                password=config.CLICKHOUSE_PASSWORD or "",
+                compress=True,
+            )
+        return self._client
+
+    def _insert(self, rows: List[Tuple]) -> None:
+        columns = [list(column) for column in zip(*rows)]
+        try:
+            self._get_client().insert(
+                ACTIONS_LOG_TABLE,
+                columns,
+                column_names=ACTIONS_LOG_COLUMNS,
+                database=ACTIONS_LOG_DATABASE,
+                column_oriented=True,
+            )
+        except Exception:
+            self._close_client()
+            raise
+
+    def _close_client(self) -> None:
+        if self._client is not None:
+            try:
+                self._client.close()
+            except Exception:
+                pass
+            self._client = None
+
+    async def flush(self) -> int:
+        """Запись одной пачки из буфера. Возвращает число записанных строк."""
+        if not self._buffer:
+            return 0
+
+        rows = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(self._executor, self._insert, rows)
+        except Exception as e:
+            # Пачка возвращается в начало буфера для повторной записи
+            self._buffer.extendleft(reversed(rows))
+            self._trim()
+            self.stats["failures"] += 1
+            self.stats["last_error"] = str(e)
+            raise
+
+        self.stats["written"] += len(rows)
+        self.stats["batches"] += 1
+        self.stats["last_flush"] = datetime.datetime.now()
+        return len(rows)
+
+    async def _run(self) -> None:
+        retry_delay = self.flush_interval
+        while not self._stop.is_set():
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if self._stop.is_set():
+                break
+
+            try:
+                while len(self._buffer) >= self.batch_size:
+                    await self.flush()
+                await self.flush()
+                retry_delay = self.flush_interval
+            except Exception as e:
+                logger.error("Ошибка при записи в ClickHouse: %s", e)
+                try:
+                    # Повтор после паузы; новые строки паузу не прерывают
+                    await asyncio.wait_for(self._stop.wait(), timeout=retry_delay)
+                except asyncio.TimeoutError:
+                    pass
+                retry_delay = min(retry_delay * 2, config.CLICKHOUSE_LOG_MAX_RETRY_DELAY)
+
+    def start(self) -> None:
+        """Запуск фоновой записи."""
+        if self._task is None:
+            self._stop.clear()
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="clickhouse-log")
+            self._task = asyncio.create_task(self._run(), name="clickhouse_log_writer")
+
+    async def stop(self) -> None:
+        """Остановка фоновой записи с дописыванием буфера."""
+        if self._task is None:
+            return
+
+        # Задача завершается по флагу, а не отменой, чтобы не прервать вставку
+        self._stop.set()
+        self._wakeup.set()
+        await self._task
+        self._task = None
+
+        try:
+            while self._buffer:
+                await self.flush()
+        except Exception as e:
+            logger.error(
+                "Не удалось дописать журнал действий, потеряно строк: %s (%s)",
+                len(self._buffer), e,
+            )
+
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._close_client)
+        self._executor.shutdown(wait=True)
+        self._executor = None
+
+    def get_stats(self) -> dict:
+        """Статистика записи для мониторинга."""
+        return {**self.stats, "buffered": len(self._buffer)}
+
+
+action_log_writer = ActionLogWriter(
+    batch_size=config.CLICKHOUSE_LOG_BATCH_SIZE,
+    flush_interval=config.CLICKHOUSE_LOG_FLUSH_INTERVAL_MS / 1000,
+    max_buffer=config.CLICKHOUSE_LOG_MAX_BUFFER,
+)
+
+
+async def start_action_log_writer() -> None:
+    """Запуск записи журнала действий."""
+    action_log_writer.start()
+
+
+async def stop_action_log_writer() -> None:
+    """Остановка записи журнала действий."""
+    await action_log_writer.stop()
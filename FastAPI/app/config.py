@@ -31,6 +31,43 @@ REDIS_PORT = int(os.getenv("REDIS_PORT", 6379))
 REDIS_PASSWORD = os.getenv("REDIS_PASSWORD")
 REDIS_LOGIN = os.getenv("REDIS_LOGIN")
 
+# Пул подключений к Redis
+REDIS_POOL_MAX_SIZE = int(os.getenv("REDIS_POOL_MAX_SIZE", 50))
+REDIS_POOL_TIMEOUT = float(os.getenv("REDIS_POOL_TIMEOUT", 5))
+REDIS_HEALTH_CHECK_INTERVAL = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", 30))
+REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", 5))
+REDIS_SOCKET_CONNECT_TIMEOUT = float(os.getenv("REDIS_SOCKET_CONNECT_TIMEOUT", 3))
+
+# Постраничный поиск RediSearch: LIMIT одной страницы и COUNT курсора
+REDIS_SEARCH_PAGE_SIZE = int(os.getenv("REDIS_SEARCH_PAGE_SIZE", 1000))
+# Количество подсказок в поиске логинов
+SEARCH_LOGINS_LIMIT = int(os.getenv("SEARCH_LOGINS_LIMIT", 50))
+# Максимум документов аварий по одному логину
+FAILURE_SEARCH_LIMIT = int(os.getenv("FAILURE_SEARCH_LIMIT", 100))
+
+# Кэш документов login:* со сбросом по keyspace-уведомлениям Redis
+LOGIN_CACHE_ENABLED = os.getenv("LOGIN_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+LOGIN_CACHE_MAX_SIZE = int(os.getenv("LOGIN_CACHE_MAX_SIZE", 1000))
+LOGIN_CACHE_TTL = float(os.getenv("LOGIN_CACHE_TTL", 60))
+LOGIN_CACHE_RECONNECT_DELAY = float(os.getenv("LOGIN_CACHE_RECONNECT_DELAY", 5))
+LOGIN_CACHE_RECHECK_INTERVAL = float(os.getenv("LOGIN_CACHE_RECHECK_INTERVAL", 60))
+# Если задано, при запуске выполняется CONFIG SET notify-keyspace-events
+REDIS_NOTIFY_KEYSPACE_EVENTS = os.getenv("REDIS_NOTIFY_KEYSPACE_EVENTS")
+# Ожидание событий пробной записи, если CONFIG GET запрещён
+KEYSPACE_PROBE_TIMEOUT = float(os.getenv("KEYSPACE_PROBE_TIMEOUT", 2))
+
+# Индекс активных аварий в памяти процесса
+FAILURE_INDEX_ENABLED = os.getenv("FAILURE_INDEX_ENABLED", "true").lower() in ("1", "true", "yes")
+FAILURE_INDEX_REFRESH_INTERVAL = float(os.getenv("FAILURE_INDEX_REFRESH_INTERVAL", 30))
+FAILURE_INDEX_DEBOUNCE = float(os.getenv("FAILURE_INDEX_DEBOUNCE", 0.5))
+# Индекс старше этого не используется, аварии ищутся в Redis
+FAILURE_INDEX_MAX_AGE = float(os.getenv("FAILURE_INDEX_MAX_AGE", 120))
+FAILURE_INDEX_RECONNECT_DELAY = float(os.getenv("FAILURE_INDEX_RECONNECT_DELAY", 5))
+
+# Кэш логинов, затронутых аварией (/v1/failure/{id}/affected)
+AFFECTED_LOGINS_CACHE_MAX_LOGINS = int(os.getenv("AFFECTED_LOGINS_CACHE_MAX_LOGINS", 200000))
+AFFECTED_LOGINS_CACHE_TTL = float(os.getenv("AFFECTED_LOGINS_CACHE_TTL", 600))
+
 # DSN для подключения к базам данных
 DSN = f"mysql+aiomysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}:{MYSQL_PORT}/{MYSQL_DB}"
 RADIUS_DSN = f"mysql+aiomysql://{RADIUS_MYSQL_USER}:{RADIUS_MYSQL_PASS}@{RADIUS_MYSQL_HOST}:{RADIUS_MYSQL_PORT}/{RADIUS_MYSQL_DB}"
@@ -38,6 +75,22 @@ RADIUS_DSN = f"mysql+aiomysql://{RADIUS_MYSQL_USER}:{RADIUS_MYSQL_PASS}@{RADIUS_
 # Время жизни токена
 TOKEN_TTL = int(os.getenv("TOKEN_TTL", 60 * 60 * 24))  # 24 часа по умолчанию
 
+# Очистка просроченных токенов
+TOKEN_PURGE_INTERVAL = int(os.getenv("TOKEN_PURGE_INTERVAL", 60 * 60))  # раз в час по умолчанию
+TOKEN_PURGE_BATCH_SIZE = int(os.getenv("TOKEN_PURGE_BATCH_SIZE", 1000))
+
+# Кэш аутентифицированных пользователей
+AUTH_CACHE_TTL = int(os.getenv("AUTH_CACHE_TTL", 60))
+AUTH_CACHE_MAX_SIZE = int(os.getenv("AUTH_CACHE_MAX_SIZE", 1000))
+
+# Постраничная выдача списка пользователей
+USERS_PAGE_SIZE = int(os.getenv("USERS_PAGE_SIZE", 100))
+USERS_PAGE_MAX_SIZE = int(os.getenv("USERS_PAGE_MAX_SIZE", 500))
+
+# Хэширование паролей (bcrypt)
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+BCRYPT_MAX_WORKERS = int(os.getenv("BCRYPT_MAX_WORKERS", 4))  # одновременных операций bcrypt
+
 # Токены для различных хостов
 host_tokens = {
     "video-krd.freedom1.ru": os.getenv("KRD_TOKEN"),
@@ -68,13 +121,60 @@ POSTGRES_USER = os.getenv("RBT_USER")
 POSTGRES_PASSWORD = os.getenv("RBT_PASSWORD")
 POSTGRES_DATABASE = os.getenv("RBT_DATABASE")
 
+# Пул подключений к PostgreSQL RBT
+RBT_POOL_MIN_SIZE = int(os.getenv("RBT_POOL_MIN_SIZE", 2))
+RBT_POOL_MAX_SIZE = int(os.getenv("RBT_POOL_MAX_SIZE", 10))
+RBT_POOL_MAX_INACTIVE_LIFETIME = float(os.getenv("RBT_POOL_MAX_INACTIVE_LIFETIME", 300))
+RBT_POOL_ACQUIRE_TIMEOUT = float(os.getenv("RBT_POOL_ACQUIRE_TIMEOUT", 10))
+RBT_STATEMENT_CACHE_SIZE = int(os.getenv("RBT_STATEMENT_CACHE_SIZE", 100))
+
 # Настройки ClickHouse
 CLICKHOUSE_HOST = os.getenv("CLICKHOUSE_HOST")
+# Клиенты подключаются к HTTP-порту по умолчанию; CLICKHOUSE_PORT часто
+# задаёт нативный порт 9000, поэтому клиентам не передаётся
 CLICKHOUSE_PORT = os.getenv("CLICKHOUSE_PORT")
 CLICKHOUSE_DATABASE = os.getenv("CLICKHOUSE_DATABASE")
 CLICKHOUSE_USER = os.getenv("CLICKHOUSE_USER")
 CLICKHOUSE_PASSWORD = os.getenv("CLICKHOUSE_PASSWORD")
 
+# Срок хранения журнала действий в ClickHouse
+ACTIONS_LOG_TTL_DAYS = int(os.getenv("ACTIONS_LOG_TTL_DAYS", 365))
+
+# Серверный аудит действий в журнал ClickHouse
+AUDIT_ENABLED = os.getenv("AUDIT_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# Клиент ClickHouse для чтения
+CLICKHOUSE_MAX_CONCURRENT_QUERIES = int(os.getenv("CLICKHOUSE_MAX_CONCURRENT_QUERIES", 8))
+CLICKHOUSE_QUERY_TIMEOUT = int(os.getenv("CLICKHOUSE_QUERY_TIMEOUT", 30))
+CLICKHOUSE_CONNECT_TIMEOUT = int(os.getenv("CLICKHOUSE_CONNECT_TIMEOUT", 5))
+
+# Пакетная запись журнала действий в ClickHouse
+CLICKHOUSE_LOG_BATCH_SIZE = int(os.getenv("CLICKHOUSE_LOG_BATCH_SIZE", 500))
+CLICKHOUSE_LOG_FLUSH_INTERVAL_MS = int(os.getenv("CLICKHOUSE_LOG_FLUSH_INTERVAL_MS", 1000))
+CLICKHOUSE_LOG_MAX_BUFFER = int(os.getenv("CLICKHOUSE_LOG_MAX_BUFFER", 50000))  # строк в памяти
+CLICKHOUSE_LOG_MAX_RETRY_DELAY = float(os.getenv("CLICKHOUSE_LOG_MAX_RETRY_DELAY", 30))
+# Сколько строка может ждать в буфере записи: интервал сброса, пауза повтора
+# и запас на расхождение часов. Граница --backfill миграции ClickHouse
+CLICKHOUSE_LOG_MAX_LAG = float(os.getenv(
+    "CLICKHOUSE_LOG_MAX_LAG", CLICKHOUSE_LOG_FLUSH_INTERVAL_MS / 1000 + CLICKHOUSE_LOG_MAX_RETRY_DELAY + 10
+))
+
+# История действий по логину
+ACTIONS_PAGE_SIZE = int(os.getenv("ACTIONS_PAGE_SIZE", 50))
+ACTIONS_PAGE_MAX_SIZE = int(os.getenv("ACTIONS_PAGE_MAX_SIZE", 500))
+
+# Лента последних действий
+ACTIONS_FEED_SIZE = int(os.getenv("ACTIONS_FEED_SIZE", 20))
+ACTIONS_FEED_POLL_INTERVAL = float(os.getenv("ACTIONS_FEED_POLL_INTERVAL", 5))
+ACTIONS_FEED_SUBSCRIBER_QUEUE = int(os.getenv("ACTIONS_FEED_SUBSCRIBER_QUEUE", 100))
+
+# Статистика действий и времени ответа
+STATS_CACHE_TTL = float(os.getenv("STATS_CACHE_TTL", 60))
+STATS_CACHE_MAX_SIZE = int(os.getenv("STATS_CACHE_MAX_SIZE", 256))
+STATS_DEFAULT_WINDOW_HOURS = int(os.getenv("STATS_DEFAULT_WINDOW_HOURS", 24))
+STATS_TOP_LOGINS = int(os.getenv("STATS_TOP_LOGINS", 10))
+STATS_TOP_LOGINS_MAX = int(os.getenv("STATS_TOP_LOGINS_MAX", 100))
+
 # URL для работы Фриды
 UTILS_URL = os.getenv("UTILS_URL")
 
@@ -82,3 +182,10 @@ TV_FIX = os.getenv('TV_FIX')
 
 # Таймауты для внешних API
 EXTERNAL_API_TIMEOUT = int(os.getenv("EXTERNAL_API_TIMEOUT", 30))
+EXTERNAL_API_CONNECT_TIMEOUT = int(os.getenv("EXTERNAL_API_CONNECT_TIMEOUT", 5))
+
+# Пулы HTTP-соединений к внешним API
+HTTP_POOL_LIMIT = int(os.getenv("HTTP_POOL_LIMIT", 100))
+HTTP_POOL_LIMIT_PER_HOST = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", 20))
+HTTP_KEEPALIVE_TIMEOUT = int(os.getenv("HTTP_KEEPALIVE_TIMEOUT", 30))
+HTTP_DNS_CACHE_TTL = int(os.getenv("HTTP_DNS_CACHE_TTL", 300))
@@ -5,10 +5,10 @@ Redis и внешними API.
 
 import logging
 import asyncio
+import base64
 import datetime
-import json
 import re
-from typing import Literal, Optional, Dict, List
+from typing import Literal, Optional, Dict, List, Sequence, Tuple
 
 import pytz
 import aiohttp
@@ -16,12 +16,13 @@ from aiohttp import ClientTimeout
 from fastapi import HTTPException
 from redis.commands.search.result import Result
 
-from sqlalchemy import select
+from sqlalchemy import delete, select
 from sqlalchemy.exc import IntegrityError
 
 from app.depencies import RedisDependency
 from app.schemas import (
     Action,
+    ActionCount,
     Camera1CModel,
     CameraCheckModel,
     CameraDataToChange,
@@ -31,17 +32,27 @@ from app.schemas import (
     IntercomService,
     LoginFailureData,
     MistralRequest,
-    RBT_phone,
-    RBTApsSettings,
     RedisAddressModelResponse,
     RedisLoginSearch,
     Search2ResponseData,
     Service1C,
     ServiceOp,
-    StatusResponse,
 )
-from app.models import FridaLogs, LogHash, Session, ORM_OBJECT, ORM_CLS
+from app.models import FridaLogs, LogHash, Session, Token, ORM_OBJECT, ORM_CLS
+from app.http_clients import (
+    FLUSSONIC,
+    ONE_C,
+    TV24,
+    TVIP,
+    UTILS,
+    get_http_client,
+)
 from app import config
+from app.clickhouse_schema import ACTIONS_LOGS_TABLE
+from app.decoding import loads, read_body, read_json, read_model, redis_json, validate_json
+from app.failure_index import FailureLookup, failure_index
+from app.login_cache import KEY_PREFIX as LOGIN_KEY_PREFIX, MISSING, login_cache
+from app.redis_search import iter_search_keys, search
 
 logger = logging.getLogger(__name__)
 
@@ -51,12 +62,13 @@ async def fetch_data(session, url, model):
     try:
         async with session.get(url) as response:
             try:
-                data = await response.json()
-                if isinstance(data, list):
-                    return [model(**item) for item in data]
+                body = await read_body(response)
+                if body.lstrip().startswith(b"["):
+                    return validate_json(List[model], body)
+                data = loads(body)
                 if not data and model.__name__ == "RecPaymnent":
                     data = {"recurringPayment": None}
-                return model(**data)
+                return model.model_validate(data)
             except Exception as e:
                 logger.error(f"Ошибка обработки данных из внешнего API: {e}")
                 raise HTTPException(
@@ -90,9 +102,14 @@ async def add_item(session: Session, item: ORM_OBJECT) -> ORM_OBJECT:  # type: i
     return item
 
 
-async def get_item(session: Session, orm_class: ORM_CLS, item_id: int) -> ORM_OBJECT:  # type: ignore
-    """Получение элемента из базы данных по ID."""
-    orm_obj = await session.get(orm_class, item_id)
+async def get_item(
+    session: Session, orm_class: ORM_CLS, item_id: int, options: Optional[list] = None  # type: ignore
+) -> ORM_OBJECT:  # type: ignore
+    """Получение элемента из базы данных по ID.
+
+    В options можно передать опции загрузки связей, например selectinload(User.role).
+    """
+    orm_obj = await session.get(orm_class, item_id, options=options)
     if orm_obj is None:
         raise HTTPException(
             status_code=404, detail=f"{orm_class.__name__} не найден с ID {item_id}"
@@ -100,6 +117,27 @@ async def get_item(session: Session, orm_class: ORM_CLS, item_id: int) -> ORM_OB
     return orm_obj
 
 
+async def purge_expired_tokens(session: Session, batch_size: int) -> int:  # type: ignore
+    """Удаление просроченных токенов порциями по batch_size строк.
+
+    Возвращает количество удалённых строк.
+    """
+    expired_before = datetime.datetime.now() - datetime.timedelta(seconds=int(config.TOKEN_TTL))
+    stmt = (
+        delete(Token)
+        .where(Token.creation_time < expired_before)
+        .with_dialect_options(mysql_limit=batch_size)
+    )
+
+    removed = 0
+    while True:
+        result = await session.execute(stmt)
+        await session.commit()
+        removed += result.rowcount
+        if result.rowcount < batch_size:
+            return removed
+
+
 async def get_last_frida_logs(
     session: Session, user_id: int, limit: int = 3
 ) -> list[FridaLogs]:  # type: ignore
@@ -115,30 +153,71 @@ async def get_last_frida_logs(
     return result.scalars().all()
 
 
-async def find_failure_by_login(
-    redis: RedisDependency, login_data: LoginFailureData
-) -> Optional[List[dict]]:
-    """Поиск аварии по логину в Redis."""
-    if login_data is not None:
-        if login_data.hostId:
-            query = f"@host:[{login_data.hostId} {login_data.hostId}]"
-            result = await redis.ft("idx:failure").search(query)
-            if result.docs:
-                return json.loads(result.docs[0].json)
+FAILURE_INDEX = "idx:failure"
+LOGIN_FAILURE_FIELDS = ("hostId", "addressCodes")
+
+
+def _failure_query(host_id: Optional[int], address_codes: Optional[List[int]]) -> Optional[str]:
+    clauses = []
+    if host_id:
+        clauses.append(f"@host:[{host_id} {host_id}]")
+    for address in address_codes or []:
+        clauses.append(f"@address:[{address} {address}]")
+    return " | ".join(clauses) or None
+
+
+def _collect_failures(documents) -> Optional[List[dict]]:
+    # Документ аварии - список аварий, поэтому списки объединяются
+    failures = []
+    for data in documents:
+        if isinstance(data, list):
+            failures.extend(data)
+        elif data is not None:
+            failures.append(data)
+    return failures or None
+
 
-        if login_data.addressCodes:
-            for address in login_data.addressCodes:
-                query = f"@address:[{address} {address}]"
-                result = await redis.ft("idx:failure").search(query)
-                if result.docs:
-                    return json.loads(result.docs[0].json)
+async def get_login_failure_data(login: str, redis) -> LoginFailureData:
+    """hostId и addressCodes логина из кэша или Redis. Если логина нет, возвращает 404."""
+    key = f"login:{login}"
+    data = login_cache.get(key)
+    if data is MISSING:
+        paths = [f"$.{field}" for field in LOGIN_FAILURE_FIELDS]
+        data = _project_json(key, await redis_json(redis).get(key, *paths), LOGIN_FAILURE_FIELDS)
+    if data is None:
+        raise HTTPException(
+            status_code=404, detail=f"Данные по логину {login} не найдены"
+        )
+    return LoginFailureData(**{field: data[field] for field in LOGIN_FAILURE_FIELDS if field in data})
+
+
+async def find_failures_by_login(login: str, redis: RedisDependency) -> FailureLookup:
+    """Поиск всех аварий по hostId и addressCodes логина.
+
+    hostId и addressCodes читаются из кэша логинов или одним JSON.GET. При
+    загруженном индексе аварий (app.failure_index) аварии ищутся по словарям
+    в памяти, иначе одним FT.SEARCH с OR по хосту и адресам. Если логина
+    нет, возвращает 404.
+    """
+    login_data = await get_login_failure_data(login, redis)
+    if failure_index.ready:
+        return FailureLookup(
+            _collect_failures(failure_index.lookup(login_data.hostId, login_data.addressCodes)),
+            failure_index.version,
+            failure_index.age,
+        )
 
-    return None
+    query = _failure_query(login_data.hostId, login_data.addressCodes)
+    if query is None:
+        return FailureLookup(None)
+    result = await search(redis, FAILURE_INDEX, query, limit=config.FAILURE_SEARCH_LIMIT)
+    return FailureLookup(_collect_failures(doc.data for doc in result.docs))
 
 
 async def get_login_data(login: str, redis: RedisDependency) -> Dict:
     """Получение данных по логину из Redis."""
-    login_data = await redis.json().get(f"login:{login}")
+    key = f"login:{login}"
+    login_data = await login_cache.get_or_load(key, lambda: redis_json(redis).get(key))
     if login_data:
         return login_data
     else:
@@ -147,32 +226,106 @@ async def get_login_data(login: str, redis: RedisDependency) -> Dict:
         )
 
 
+def _project_json(key: str, value, fields: Sequence[str]) -> Optional[dict]:
+    if value is None:
+        return None
+    if isinstance(value, Exception):
+        logger.error("Ошибка чтения %s из Redis: %s", key, value)
+        return None
+    # С одним путём JSON.GET возвращает список совпадений, с несколькими - объект путь -> список
+    if len(fields) == 1:
+        value = {f"$.{fields[0]}": value}
+    return {
+        field: value[f"$.{field}"][0]
+        for field in fields
+        if value.get(f"$.{field}")
+    }
+
+
+async def get_json_documents(
+    keys: Sequence[str], redis, fields: Optional[Sequence[str]] = None
+) -> Dict[str, Optional[dict]]:
+    """Получение JSON-документов по списку ключей за один запрос к Redis.
+
+    Без fields документы читаются целиком через JSON.MGET, иначе конвейером
+    JSON.GET только с полями верхнего уровня из fields. Для отсутствующего
+    ключа в результате None. Документы логинов из кэша в Redis не запрашиваются.
+    """
+    documents: Dict[str, Optional[dict]] = {}
+    for key in keys:
+        cached = login_cache.get(key) if key.startswith(LOGIN_KEY_PREFIX) else MISSING
+        if cached is not MISSING:
+            documents[key] = {field: cached[field] for field in fields if field in cached} if fields else cached
+
+    missing = [key for key in dict.fromkeys(keys) if key not in documents]
+    if missing:
+        json_commands = redis_json(redis)
+        if not fields:
+            markers = {key: login_cache.begin_load(key) for key in missing if key.startswith(LOGIN_KEY_PREFIX)}
+            try:
+                values = await json_commands.mget(missing, "$")
+            except BaseException:
+                for key, marker in markers.items():
+                    login_cache.cancel_load(key, marker)
+                raise
+            for key, value in zip(missing, values):
+                documents[key] = value[0] if value else None
+                if key in markers:
+                    login_cache.finish_load(key, markers[key], documents[key])
+        else:
+            paths = [f"$.{field}" for field in fields]
+            # redis_json уже зарегистрировал разбор ответов JSON.GET через orjson
+            async with redis.pipeline(transaction=False) as pipe:
+                for key in missing:
+                    pipe.execute_command("JSON.GET", key, *paths)
+                values = await pipe.execute(raise_on_error=False)
+            for key, value in zip(missing, values):
+                documents[key] = _project_json(key, value, fields)
+
+    return {key: documents[key] for key in keys}
+
+
+async def search_json_documents(
+    redis, index: str, query: str, fields: Optional[Sequence[str]] = None
+) -> List[dict]:
+    """Документы всех результатов поиска.
+
+    Ключи читаются курсором FT.AGGREGATE, документы - get_json_documents по
+    странице ключей. Документ, удалённый между поиском и чтением, пропускается.
+    """
+    documents = []
+    async for keys in iter_search_keys(redis, index, query):
+        page = await get_json_documents(keys, redis, fields)
+        documents.extend(data for data in page.values() if data is not None)
+    return documents
+
+
 async def get_cameras(
     login: str, retries: int = 2, timeout: int = 3
 ) -> CamerasData | None:
     """Получение данных камер из внешнего API."""
     query_string = f"http://server1c.freedom1.ru/UNF_CRM_WS/hs/Grafana/anydata?query=cameras&login={login}"
     timeout_settings = ClientTimeout(total=timeout)
+    session = get_http_client(ONE_C)
 
-    async with aiohttp.ClientSession(timeout=timeout_settings) as session:
-        attempt = 0
-        while attempt < retries:
-            try:
-                async with session.get(query_string) as response:
-                    if response.status != 200:
-                        response.raise_for_status()
-                    data = await response.json()
-                    return CamerasData(cameras=data)
-            except aiohttp.ClientError:
-                attempt += 1
-                if attempt >= retries:
-                    return None
-            except asyncio.TimeoutError:
-                attempt += 1
-                if attempt >= retries:
-                    return None
-            except Exception:
+    attempt = 0
+    while attempt < retries:
+        try:
+            async with session.get(query_string, timeout=timeout_settings) as response:
+                if response.status != 200:
+                    response.raise_for_status()
+                cameras = await read_model(response, Optional[List[Camera1CModel]])
+                return CamerasData(cameras=cameras)
+        except aiohttp.ClientError:
+            attempt += 1
+            if attempt >= retries:
+                return None
+        except asyncio.TimeoutError:
+            attempt += 1
+            if attempt >= retries:
                 return None
+        except Exception:
+            return None
 
 
 async def fetch_services(uuid: str, uuid2: str):
@@ -181,13 +334,13 @@ async def fetch_services(uuid: str, uuid2: str):
     payload = {"UUID": uuid, "UUID2": uuid2}
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=payload) as response:
-                if response.status != 200:
-                    response.raise_for_status()
+        session = get_http_client(ONE_C)
+        async with session.post(url, json=payload) as response:
+            if response.status != 200:
+                response.raise_for_status()
 
-                services = await response.json()
-                return services
+            services = await read_json(response)
+            return services
     except aiohttp.ClientError as e:
         logger.error(f"Aiohttp client error occurred: {e}")
         return None
@@ -236,42 +389,36 @@ async def get_cameras_difference(cameras_from_1C_raw, cameras_from_redis_list):
     return comparison_results if comparison_results else None
 
 
+# Поля камеры, которые нужны CameraRedisModel
+CAMERA_FIELDS = ("Id", "Name", "Host", "IP", "available", "URL", "houseIds", "Model")
+
+
+def _camera_from_doc(data: dict) -> CameraRedisModel:
+    return CameraRedisModel(
+        id=data["Id"],
+        name=data["Name"],
+        host=data["Host"],
+        ipaddress=data["IP"],
+        **data,
+    )
+
+
 async def get_cameras_from_redis(login: str, redis, login_data):
     flatId = login_data.get("flatId")
 
     if flatId and flatId != 0:
         # Поиск камер по flatId в Redis
         query = f"@CamType:{{Личная}} @flatIds:[{flatId} {flatId}]"
-        redis_result = await redis.ft("idx:camera").search(query)
-        cameras_from_redis_list = [
-            CameraRedisModel(
-                id=json.loads(doc.json)["Id"],
-                name=json.loads(doc.json)["Name"],
-                host=json.loads(doc.json)["Host"],
-                ipaddress=json.loads(doc.json)["IP"],
-                **json.loads(doc.json),
-            )
-            for doc in redis_result.docs
-        ]
-        return cameras_from_redis_list
     else:
-        cameras_from_redis_list = []
-        query = "@CamType:{Личная}"
-        redis_result = await redis.ft("idx:camera").search(query)
-        all_cameras_from_redis_list = [
-            CameraRedisModel(
-                id=json.loads(doc.json)["Id"],
-                name=json.loads(doc.json)["Name"],
-                host=json.loads(doc.json)["Host"],
-                ipaddress=json.loads(doc.json)["IP"],
-                **json.loads(doc.json),
-            )
-            for doc in redis_result.docs
-        ]
-        for camera in all_cameras_from_redis_list:
-            if camera.houseIds is not None and login in camera.houseIds:
-                cameras_from_redis_list.append(camera)
-        return cameras_from_redis_list
+        # Без квартиры - камеры дома логина; отбор по houseIds делает индекс
+        house_ids = login_data.get("houseId")
+        house_ids = house_ids if isinstance(house_ids, list) else [house_ids]
+        clauses = [f"@houseIds:[{house_id} {house_id}]" for house_id in house_ids if house_id]
+        if not clauses:
+            return []
+        query = f"@CamType:{{Личная}} ({' | '.join(clauses)})"
+    documents = await search_json_documents(redis, "idx:camera", query, CAMERA_FIELDS)
+    return [_camera_from_doc(data) for data in documents]
 
 
 async def check_cameras_dif(
@@ -537,13 +684,13 @@ async def get_camera_form_flussonic(camera_model):
 
 async def fetch_flussonic_stream(host: str, url: str, token: str):
     """Запрос к Flussonic для получения данных о потоке."""
-    async with aiohttp.ClientSession() as session:
-        async with session.get(
-            f"https://{host}/streamer/api/v3/streams/{url}",
-            headers={"Authorization": f"Bearer {token}"},
-        ) as response:
-            response_data = await response.json()
-            return response_data
+    session = get_http_client(FLUSSONIC)
+    async with session.get(
+        f"https://{host}/streamer/api/v3/streams/{url}",
+        headers={"Authorization": f"Bearer {token}"},
+    ) as response:
+        response_data = await read_json(response)
+        return response_data
 
 
 async def get_token_for_host(host):
@@ -560,15 +707,11 @@ async def get_TV_services_from_1c(login: str) -> List[Service1C] | None:
     """Получение TV услуг из 1С."""
     url = f"http://server1c.freedom1.ru/UNF_CRM_WS/hs/Grafana/anydata?query=external_services&login={login}"
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                response.raise_for_status()
-                data = await response.json()
-                if data:
-                    services = [Service1C(**service) for service in data]
-                    return services
-                else:
-                    return None
+        session = get_http_client(ONE_C)
+        async with session.get(url) as response:
+            response.raise_for_status()
+            services = await read_model(response, Optional[List[Service1C]])
+            return services or None
     except Exception as e:
         logger.error(f"Ошибка получения TV услуг из 1С: {e}")
         return None
@@ -586,20 +729,20 @@ async def get_tv24_data(login: str, token: str) -> list[ServiceOp] | None:
             return "Неактивный"
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                response.raise_for_status()  # Проверка на ошибки HTTP-запроса
-                data = await response.json()
-                if data:
-                    data = [
-                        ServiceOp(
-                            id=service["packet"]["id"],
-                            name=service["packet"]["name"],
-                            status=get_status(service["end_at"]),
-                        )
-                        for service in data
-                    ]
-                return data
+        session = get_http_client(TV24)
+        async with session.get(url) as response:
+            response.raise_for_status()  # Проверка на ошибки HTTP-запроса
+            data = await read_json(response)
+            if data:
+                data = [
+                    ServiceOp(
+                        id=service["packet"]["id"],
+                        name=service["packet"]["name"],
+                        status=get_status(service["end_at"]),
+                    )
+                    for service in data
+                ]
+            return data
     except Exception as e:
         logger.error(f"Ошибка получения данных TV24: {e}")
         return None
@@ -609,15 +752,15 @@ async def get_parental_code(userId: int, token: str) -> str | None:
     """Получение родительского кода пользователя."""
     url = f"https://api.24h.tv/v2/users/{userId}?token={token}"
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                response.raise_for_status()
-                data = await response.json()
-                return (
-                    data.get("parental_code", "")
-                    if data.get("parental_status") == "set"
-                    else None
-                )
+        session = get_http_client(TV24)
+        async with session.get(url) as response:
+            response.raise_for_status()
+            data = await read_json(response)
+            return (
+                data.get("parental_code", "")
+                if data.get("parental_status") == "set"
+                else None
+            )
     except Exception as e:
         logger.error(f"Ошибка получения родительского кода: {e}")
         return None
@@ -627,17 +770,17 @@ async def get_smotreshka_data(login: str) -> list[ServiceOp] | None:
     """Получение данных Smotreshka."""
     url = f"http://server1c.freedom1.ru/UNF_CRM_WS/hs/mwapi/getLfstrmPackets?login={login}"
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                response.raise_for_status()
-                data = await response.json()
-                data = [
-                    ServiceOp(
-                        id=int(service["id"]), name=service["name"], status="Активный"
-                    )
-                    for service in data
-                ]
-                return data
+        session = get_http_client(ONE_C)
+        async with session.get(url) as response:
+            response.raise_for_status()
+            data = await read_json(response)
+            data = [
+                ServiceOp(
+                    id=int(service["id"]), name=service["name"], status="Активный"
+                )
+                for service in data
+            ]
+            return data
     except Exception as e:
         logger.error(f"Ошибка получения данных Smotreshka: {e}")
         return None
@@ -649,21 +792,21 @@ async def get_tvip_data(userId: str, service_name: str) -> list[ServiceOp] | Non
     url = f"https://my.tvip.media/api/provider/account_subscriptions?account={userId}&limit=25&start=0"
     headers = {"Authorization": f"Basic {config.TVIP_TOKEN}", "Accept": "*/*"}
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, headers=headers) as response:
-                response.raise_for_status()  # Проверка на ошибки HTTP-запроса
-                data = await response.json()
-                if data:
-                    data = [
-                        ServiceOp(
-                            id=service["tarif"],
-                            name=service_name,
-                            status="Активный" if not service["stop"] else "Неактивный",
-                        )
-                        for service in data["data"]
-                        if not service["stop"]
-                    ]
-                return data
+        session = get_http_client(TVIP)
+        async with session.get(url, headers=headers) as response:
+            response.raise_for_status()  # Проверка на ошибки HTTP-запроса
+            data = await read_json(response)
+            if data:
+                data = [
+                    ServiceOp(
+                        id=service["tarif"],
+                        name=service_name,
+                        status="Активный" if not service["stop"] else "Неактивный",
+                    )
+                    for service in data["data"]
+                    if not service["stop"]
+                ]
+            return data
     except Exception:
         return None
 
@@ -682,9 +825,9 @@ async def camera_update_1c(camera_id: int, camera_data: CameraDataToChange):
         "CamType": camera_data.CamType,
     }
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, headers=headers, json=data) as response:
-                return await response.json()
+        session = get_http_client(ONE_C)
+        async with session.post(url, headers=headers, json=data) as response:
+            return await read_json(response)
     except Exception as e:
         return e
 
@@ -692,7 +835,8 @@ async def camera_update_1c(camera_id: int, camera_data: CameraDataToChange):
 async def get_redis_key_data(login: str, redis) -> dict:
     """Получение данных ключа из Redis."""
     try:
-        value = await redis.json().get(f"login:{login}")
+        key = f"login:{login}"
+        value = await login_cache.get_or_load(key, lambda: redis_json(redis).get(key))
         if not value:
             raise HTTPException(status_code=404, detail="Пользователь не найден")
         return value
@@ -704,7 +848,7 @@ async def get_redis_key_data(login: str, redis) -> dict:
 
 async def get_schema_from_redis(redis) -> Result:
     """Получение схемы подсекций из Redis."""
-    schema = await redis.json().get("scheme:content")
+    schema = await redis_json(redis).get("scheme:content")
 
     if not schema:
         raise HTTPException(status_code=404, detail="Схема подсекций не найдена")
@@ -712,208 +856,16 @@ async def get_schema_from_redis(redis) -> Result:
     return schema
 
 
-async def get_logins_by_flatId_redis(flat_id: int, redis: RedisDependency):
-    """Получение логинов по flatId из Redis."""
-    query = f"@flatId:[{flat_id} {flat_id}]"
-    search_result: Result = await redis.ft("idx:client").search(query)
-    if not search_result:
-        raise HTTPException(status_code=404, detail="Логины не найдены по flatId")
-    return search_result.docs
-
-
-async def get_number_from_rbt(house_sub_id, rbt):
-    """Получение номера из RBT по house_sub_id."""
-    async with rbt.transaction():
-        query = """
-        SELECT id
-        FROM "houses_subscribers_mobile"
-        WHERE "house_subscriber_id" = $1
-        """
-        result = await rbt.fetch(query, house_sub_id)
-
-    return result
-
-
-async def get_number_rbt(flat_and_house_id: dict, rbt) -> List[RBT_phone]:
-    """Получение номера RBT по flat_and_house_id."""
-    async with rbt.transaction():
-        query = """
-        SELECT fs.role, sm.id, sm.subscriber_name, sm.subscriber_patronymic
-        FROM houses_flats_subscribers fs
-        JOIN houses_subscribers_mobile sm
-        ON fs.house_subscriber_id = sm.house_subscriber_id
-        WHERE fs.house_flat_id = $1 and fs.house_subscriber_id =  $2
-        """
-        result = await rbt.fetch(
-            query, flat_and_house_id["flat_id"], flat_and_house_id["house_id"]
-        )
-
-    return [
-        RBT_phone(
-            house_subscriber_id=flat_and_house_id["house_id"],
-            flat_id=flat_and_house_id["flat_id"],
-            role=row["role"],
-            name=row["subscriber_name"],
-            phone=row["id"],
-            patronymic=row["subscriber_patronymic"],
-        )
-        for row in result
-    ]
-
-
-async def get_numbers_rbt(flat_id: int, rbt) -> List[RBT_phone]:
-    """Получение списка номеров RBT по flat_id."""
-    async with rbt.transaction():
-        query = """
-        SELECT fs.house_subscriber_id, fs.role, sm.id, sm.subscriber_name, sm.subscriber_patronymic
-        FROM houses_flats_subscribers fs
-        JOIN houses_subscribers_mobile sm
-        ON fs.house_subscriber_id = sm.house_subscriber_id
-        WHERE fs.house_flat_id = $1
-        """
-        result = await rbt.fetch(query, flat_id)
-
-        subs_list = [
-            RBT_phone(
-                house_subscriber_id=row["house_subscriber_id"],
-                flat_id=flat_id,
-                role=row["role"],
-                name=row["subscriber_name"],
-                phone=row["id"],
-                patronymic=row["subscriber_patronymic"],
-            )
-            for row in result
-        ]
-
-    return subs_list
-
-
-async def get_flats(house_id: int, rbt):
-    """Получение квартир по house_id."""
-    async with rbt.transaction():
-        query = """
-        SELECT house_flat_id, house_subscriber_id
-        FROM "houses_flats_subscribers"
-        WHERE "house_subscriber_id" = $1
-        """
-        result = await rbt.fetch(query, house_id)
-
-        flats_list = [
-            {"flat_id": row["house_flat_id"], "house_id": row["house_subscriber_id"]}
-            for row in result
-        ]
-
-    return flats_list
-
-
-async def get_flat_from_RBT_by_flatId(flatId: int, rbt):
-    """Получение данных квартиры из RBT по flatId."""
-    async with rbt.transaction():
-        query = """
-        SELECT flat
-        FROM "houses_flats"
-        WHERE "house_flat_id" = $1
-        """
-        result = await rbt.fetch(query, flatId)
-
-    return result
-
-
-async def change_RBT_role(
-    house_id: int, flat_id: int, role: int, rbt
-) -> StatusResponse:
-    """Изменение роли в RBT."""
-    query = """
-        UPDATE houses_flats_subscribers
-        SET role = $1
-        WHERE house_subscriber_id = $2 AND house_flat_id = $3
-        RETURNING house_subscriber_id
-    """
-    try:
-        async with rbt.transaction():
-            result = await rbt.fetchval(query, role, house_id, flat_id)
-
-            if result is None:
-                raise HTTPException(status_code=404, detail="Запись не найдена")
-            return StatusResponse(
-                status="success",
-            )
-
-    except HTTPException as http_exc:
-        raise http_exc
-
-    except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"Произошла ошибка при изменении роли: {str(e)}"
-        ) from e
-
-
-async def delete_from_houses_flats_subscribers(
-    house_id: int, flat_id: int, rbt
-) -> StatusResponse:
-    """Удаление записи из houses_flats_subscribers."""
-    query = """
-            DELETE FROM houses_flats_subscribers
-            WHERE house_subscriber_id = $1 AND house_flat_id = $2
-            RETURNING house_subscriber_id
-    """
-    try:
-        async with rbt.transaction():
-            result = await rbt.fetchval(query, house_id, flat_id)
-            if result is None:
-                raise HTTPException(status_code=404, detail="Запись не найдена")
-            return StatusResponse(
-                status="deleted",
-            )
-
-    except HTTPException as http_exc:
-        raise http_exc
-
-    except Exception as e:
-        raise HTTPException(
-            status_code=500, detail=f"Произошла ошибка при удалении записи: {str(e)}"
-        ) from e
-
-
-async def get_house_id_by_uuid2(uuid2: str, rbt):
-    """Получение house_id по uuid2."""
-    async with rbt.transaction():
-        query = """
-        SELECT house_subscriber_id
-        FROM "houses_subscribers_mobile"
-        WHERE "auth_token" = $1 
-        LIMIT 1
-        """
-        result = await rbt.fetchval(query, uuid2)
-
-    return result
-
-
-async def get_flat_from_RBT_by_house_id_and_flat(flat: str, house_id: int, rbt):
-    """Получение flat_id по адресу квартиры и house_id."""
-    async with rbt.transaction():
-        query = """
-        SELECT house_flat_id
-        FROM "houses_flats"
-        WHERE "flat" = $1 AND "address_house_id" = $2
-        LIMIT 1
-        """
-        result = await rbt.fetchval(query, flat, house_id)
-
-    return result
-
+# Поля логина, которые нужны для договоров квартиры
+FLAT_LOGIN_FIELDS = (
+    "primePhone", "login", "flat", "flatId", "houseId", "name", "address", "contract", "servicecats", "UUID2",
+)
 
-async def create_new_flat(flat: str, address_house_id: int, rbt):
-    """Создание новой квартиры."""
-    async with rbt.transaction():
-        query = """
-        INSERT INTO "houses_flats" (address_house_id, flat)
-        VALUES ($1, $2)
-        RETURNING house_flat_id
-        """
-        result = await rbt.fetchval(query, address_house_id, flat)
 
-    return result
+async def get_logins_by_flatId_redis(flat_id: int, redis: RedisDependency) -> List[dict]:
+    """Получение данных всех логинов квартиры по flatId из Redis."""
+    query = f"@flatId:[{flat_id} {flat_id}]"
+    return await search_json_documents(redis, "idx:client", query, FLAT_LOGIN_FIELDS)
 
 
 async def change_flat_in_1C(new_flatId: str, uuid2: str):
@@ -922,10 +874,10 @@ async def change_flat_in_1C(new_flatId: str, uuid2: str):
     payload = {"UUID2": uuid2, "flatId": new_flatId}
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=payload) as response:
-                response.raise_for_status()
-                return await response.json()
+        session = get_http_client(ONE_C)
+        async with session.post(url, json=payload) as response:
+            response.raise_for_status()
+            return await read_json(response)
 
     except aiohttp.ClientError as e:
         logger.error(f"Ошибка клиента Aiohttp: {e}")
@@ -935,67 +887,33 @@ async def change_flat_in_1C(new_flatId: str, uuid2: str):
         return None
 
 
-async def get_house_subscriber_ids_to_relocate_by_phones(phones: List[str], rbt):
-    """Получение house_subscriber_id для переезда по списку телефонов."""
-    async with rbt.transaction():
-        query = """
-        SELECT house_subscriber_id
-        FROM houses_subscribers_mobile
-        WHERE id = ANY($1);
-        """
-        result = await rbt.fetch(query, phones)
-    return result
-
-
-async def change_flat_id_in_RBT(house_ids: List[int], new_flat_id: int, rbt):
-    """Изменение flat_id в RBT для списка домов."""
-    async with rbt.transaction():
-        query = """
-        UPDATE "houses_flats_subscribers"
-        SET house_flat_id = $1
-        WHERE house_subscriber_id = ANY($2)
-        """
-        await rbt.execute(query, new_flat_id, house_ids)
-    return {"status": "success"}
-
-
-async def get_houses_flats_subscribers_by_flat_id(flat_id: int, rbt):
-    """Получение количества подписчиков по flat_id."""
-    async with rbt.transaction():
-        query = """
-        SELECT COUNT(*)
-        FROM "houses_flats"
-        WHERE "house_flat_id" = $1
-        """
-        result = await rbt.fetchval(query, flat_id)
-    return result
-
-
-async def get_logins_from_redis(flat_house_ids: List[Dict], redis):
+# Поля логина, которые нужны для договоров телефонов
+PHONE_LOGIN_FIELDS = ("login", "flatId", "address", "contract")
+
+
+async def get_logins_from_redis(flat_house_ids: List[Dict], redis) -> List[dict]:
     """Получение логинов из Redis по списку flat_house_ids."""
     unique_list = []
     for flat_house_id in flat_house_ids:
         flat_id = flat_house_id["flat_id"]
         if flat_id not in unique_list:
             unique_list.append(flat_id)
+    if not unique_list:
+        return []
     search_query = " | ".join(
         [f"@flatId:[{flat_id} {flat_id}]" for flat_id in unique_list]
     )
-    result = await redis.ft("idx:client").search(search_query)
-
-    logins = []
-    for doc in result.docs:
-        logins.append(doc)
-
-    return logins
+    return await search_json_documents(redis, "idx:client", search_query, PHONE_LOGIN_FIELDS)
 
 
-async def get_login_from_redis_by_flat_id(flat_id: int, redis):
+async def get_login_from_redis_by_flat_id(flat_id: int, redis) -> List[dict]:
     """Получение логина из Redis по flat_id."""
     search_query = f"@flatId:[{flat_id} {flat_id}]"
-    result = await redis.ft("idx:client").search(search_query)
+    return await search_json_documents(redis, "idx:client", search_query)
 
-    return result.docs
+
+# Поля логина, которые нужны RedisLoginSearch
+SEARCH_LOGIN_FIELDS = ("login", "name", "contract", "address", "time_to")
 
 
 async def search_logins(search_login: str, redis) -> List[RedisLoginSearch]:
@@ -1011,10 +929,16 @@ async def search_logins(search_login: str, redis) -> List[RedisLoginSearch]:
         capitalize_search += f"{login.capitalize()} "
 
     search_query = f"{default_search} | {lower_search} | {capitalize_search}"
-    result = await redis.ft("idx:searchLogin").search(search_query)
+    result = await search(
+        redis,
+        "idx:searchLogin",
+        search_query,
+        limit=config.SEARCH_LOGINS_LIMIT,
+        return_fields=SEARCH_LOGIN_FIELDS,
+    )
     logins_list = []
     for doc in result.docs:
-        data = json.loads(doc.json)
+        data = doc.data
         if "loginserv" not in doc.id:
             logins_list.append(
                 RedisLoginSearch(
@@ -1029,70 +953,56 @@ async def search_logins(search_login: str, redis) -> List[RedisLoginSearch]:
     return logins_list
 
 
-def log_to_clickhouse(
-    client,
-    user_name: str,
-    login: str,
-    page: str,
-    action: str,
-    success: bool,
-    message: str,
-    url: str,
-    payload: Dict,
-    user_id: int,
-):
-    """Логирование действий в ClickHouse."""
-    # Используем UTC+5 (Екатеринбург)
-    timezone = pytz.timezone("Asia/YekATERINBURG")  # Для Екатеринбурга UTC+5
-    timestamp = datetime.datetime.now(timezone)  # Текущее время с часовым поясом
-
-    payload_json = json.dumps(payload)
-
-    # Экранируем строки для безопасности
-    user_name = user_name.replace("'", "''")
-    login = login.replace("'", "''")
-    page = page.replace("'", "''")
-    action = action.replace("'", "''")
-    message = message.replace("'", "''")
-    url = url.replace("'", "''")
-    payload_json = payload_json.replace("'", "''")
-
-    # Формируем SQL-запрос для вставки данных
-    query = f"""
-    INSERT INTO Diagnostic_APP.actions_logs (user_name, login, page, action, status, message, date, url, payload, user_id)
-    VALUES ('{user_name}', '{login}', '{page}', '{action}', {1 if success else 0}, '{message}', '{timestamp}', '{url}', '{payload_json}', '{user_id}')
-    """
+# Часовой пояс Екатеринбурга (UTC+5)
+ACTIONS_TIMEZONE = pytz.timezone("Asia/Yekaterinburg")
+
+ACTION_COLUMNS = "user_name, date, login, page, action, status"
+
+UNIX_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
 
-    try:
-        client.command(query)
-    except Exception as e:
-        logger.error(f"Ошибка при записи в ClickHouse: {e}")
 
+def _as_utc(value: datetime.datetime) -> datetime.datetime:
+    # clickhouse_connect отдаёт столбец DateTime64(6, 'UTC') без tzinfo,
+    # а astimezone и timestamp() считают такое время локальным
+    return value.replace(tzinfo=datetime.timezone.utc) if value.tzinfo is None else value
 
-async def get_last_actions_from_clickhouse(clickhouse_client) -> List[Action]:
-    """Получение последних действий из ClickHouse."""
-    query = "SELECT user_name, date, login, page, action, status FROM Diagnostic_APP.actions_logs ORDER BY date DESC LIMIT 20"
-    target_timezone = pytz.timezone(
-        "Asia/YekATERINBURG"
-    )  # Часовой пояс Екатеринбурга (UTC+5)
+
+def _unix_micros(value: datetime.datetime) -> int:
+    return (_as_utc(value) - UNIX_EPOCH) // datetime.timedelta(microseconds=1)
+
+
+def _action_from_row(row) -> Action:
+    return Action(
+        name=row[0],
+        date=_as_utc(row[1]).astimezone(ACTIONS_TIMEZONE),  # Переводим из UTC в Екатеринбург
+        login=row[2],
+        page=row[3],
+        action=row[4],
+        status=row[5],
+    )
+
+
+async def get_last_actions_from_clickhouse(
+    clickhouse_client, since: Optional[datetime.datetime] = None, limit: int = 20
+) -> List[Action]:
+    """Получение последних действий из ClickHouse.
+
+    При указании since возвращаются только действия не раньше этого момента.
+    """
+    where = ""
+    parameters = {"limit": limit}
+    if since is not None:
+        # Время передаётся в микросекундах unix-времени: без часового пояса
+        # сервера и без потери точности Float64 на границе since
+        where = "WHERE date >= fromUnixTimestamp64Micro({since:Int64}, 'UTC')"
+        parameters["since"] = _unix_micros(since)
+    query = f"SELECT {ACTION_COLUMNS} FROM {ACTIONS_LOGS_TABLE} {where} ORDER BY date DESC LIMIT {{limit:UInt32}}"
 
     try:
-        # Выполняем запрос через метод query
-        result = clickhouse_client.query(query)
-
-        actions = [
-            Action(
-                name=row[0],
-                date=row[1].astimezone(
-                    target_timezone
-                ),  # Переводим из UTC в Екатеринбург
-                login=row[2],
-                page=row[3],
-                action=row[4],
-                status=row[5],
-            )
-            for row in result.result_set
-        ]
+        result = await clickhouse_client.query(query, parameters=parameters)
+        actions = [_action_from_row(row) for row in result.result_set]
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500, detail="Ошибка получения последних изменений: " + str(e)
@@ -1101,170 +1011,175 @@ async def get_last_actions_from_clickhouse(clickhouse_client) -> List[Action]:
     return actions
 
 
-async def get_1c_intercom_services(login: str) -> List[IntercomService]:
-    """Получение интерком услуг из 1С."""
-    url = f"http://server1c.freedom1.ru/UNF_CRM_WS/hs/Grafana/anydata?query=intercom&login={login}"
+# Порядок действий с одинаковой датой внутри страницы истории по логину
+ACTION_TIEBREAK = "cityHash64(user_name, page, action, url, payload)"
 
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                try:
-                    response.raise_for_status()
-                    data = await response.json()
-                    if not data:
-                        raise HTTPException(
-                            status_code=404, detail="No intercom services found"
-                        )
-                    if not isinstance(data, list):
-                        raise HTTPException(
-                            status_code=422, detail="Expected list in response data"
-                        )
 
-                    result = []
-                    for service in data:
-                        try:
-                            validated_service = IntercomService(
-                                service=service.get("service"),
-                                category=service.get("category"),
-                                timeto=service.get("timeto"),
-                            )
-                            result.append(validated_service)
-                        except ValueError as ve:
-                            raise HTTPException(
-                                status_code=422,
-                                detail=f"Invalid service data: {str(ve)}",
-                            ) from ve
-
-                    if not result:
-                        raise HTTPException(
-                            status_code=404, detail="No valid services found"
-                        )
+def encode_actions_cursor(date_us: int, tiebreak: int) -> str:
+    """Курсор следующей страницы истории действий."""
+    return base64.urlsafe_b64encode(f"{date_us}:{tiebreak}".encode()).decode().rstrip("=")
 
-                    return result
 
-                except ValueError as ve:
-                    raise HTTPException(
-                        status_code=422, detail=f"Invalid JSON data: {str(ve)}"
-                    ) from ve
+def decode_actions_cursor(cursor: str) -> Tuple[int, int]:
+    """Дата (мкс) и хэш последнего действия предыдущей страницы."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        date_us, tiebreak = base64.urlsafe_b64decode(padded).decode().split(":")
+        return int(date_us), int(tiebreak)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail="Некорректный курсор") from e
+
+
+async def get_login_actions_from_clickhouse(
+    clickhouse_client, login: str, cursor: Optional[str], limit: int
+) -> Tuple[List[Action], Optional[str]]:
+    """Получение действий по логину, начиная с самых новых.
+
+    Постраничная выдача по (date, хэш действия): действия с одинаковой датой
+    на границе страниц не пропускаются. Возвращает действия и курсор
+    следующей страницы, None на последней странице. Запрос читает проекцию
+    by_login диапазоном по ключу.
+    """
+    where = "WHERE login = {login:String}"
+    parameters = {"login": login, "limit": limit}
+    if cursor is not None:
+        date_us, tiebreak = decode_actions_cursor(cursor)
+        # Условие по date отдельно - для диапазона по ключу проекции
+        where += (
+            " AND date <= fromUnixTimestamp64Micro({date_us:Int64}, 'UTC')"
+            f" AND (toUnixTimestamp64Micro(date), {ACTION_TIEBREAK}) < ({{date_us:Int64}}, {{tiebreak:UInt64}})"
+        )
+        parameters["date_us"] = date_us
+        parameters["tiebreak"] = tiebreak
+    query = f"""
+        SELECT {ACTION_COLUMNS}, toUnixTimestamp64Micro(date), {ACTION_TIEBREAK}
+        FROM {ACTIONS_LOGS_TABLE} {where}
+        ORDER BY date DESC, {ACTION_TIEBREAK} DESC
+        LIMIT {{limit:UInt32}}
+    """
 
-    except aiohttp.ClientError as ce:
-        raise HTTPException(
-            status_code=422, detail=f"1C service unavailable: {str(ce)}"
-        ) from ce
+    try:
+        result = await clickhouse_client.query(query, parameters=parameters)
+        rows = result.result_set
+        actions = [_action_from_row(row) for row in rows]
+        next_cursor = encode_actions_cursor(rows[-1][6], rows[-1][7]) if len(rows) == limit else None
+        return actions, next_cursor
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
-            status_code=500, detail=f"Internal server error: {str(e)}"
+            status_code=500, detail="Ошибка получения действий по логину: " + str(e)
         ) from e
 
 
-async def get_RBT_aps_settings(flat_id: int, rbt):
-    """Получение настроек RBT по flat_id."""
-    try:
-        async with rbt.transaction():
-            query = """
-            SELECT house_flat_id,
-                   address_house_id,
-                   manual_block, 
-                   auto_block,
-                   open_code,
-                   white_rabbit,
-                   admin_block
-            FROM "houses_flats"
-            WHERE "house_flat_id" = $1
-            """
-            record = await rbt.fetchrow(
-                query, flat_id
-            )  # Используем fetchrow для одной записи
-
-            if record:
-                # Правильное преобразование asyncpg Record в словарь
-                data = dict(record)
-                return RBTApsSettings.model_validate(data)
+async def get_login_action_counts_from_clickhouse(clickhouse_client, login: str) -> List[ActionCount]:
+    """Получение количества действий по страницам и действиям для логина.
 
-            return None
+    Запрос читает агрегирующую проекцию login_action_counts.
+    """
+    query = f"""
+        SELECT page, action, count(), countIf(status)
+        FROM {ACTIONS_LOGS_TABLE}
+        WHERE login = {{login:String}}
+        GROUP BY page, action
+        ORDER BY page, action
+    """
 
+    try:
+        result = await clickhouse_client.query(query, parameters={"login": login})
+        return [
+            ActionCount(page=page, action=action, count=count, success=success)
+            for page, action, count, success in result.result_set
+        ]
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
-            status_code=500, detail=f"Error fetching data from RBT: {str(e)}"
+            status_code=500, detail="Ошибка получения количества действий: " + str(e)
         ) from e
 
 
-async def update_manual_block(flat_id: int, value: bool, rbt) -> bool:
-    """Обновление значения manual_block для указанной квартиры."""
+async def get_1c_intercom_services(login: str) -> List[IntercomService]:
+    """Получение интерком услуг из 1С."""
+    url = f"http://server1c.freedom1.ru/UNF_CRM_WS/hs/Grafana/anydata?query=intercom&login={login}"
+
     try:
-        async with rbt.transaction():
-            # Сначала проверяем текущее значение
-            current = await rbt.fetchval(
-                "SELECT manual_block FROM houses_flats WHERE house_flat_id = $1",
-                flat_id,
-            )
+        session = get_http_client(ONE_C)
+        async with session.get(url) as response:
+            try:
+                response.raise_for_status()
+                data = await read_json(response)
+                if not data:
+                    raise HTTPException(
+                        status_code=404, detail="No intercom services found"
+                    )
+                if not isinstance(data, list):
+                    raise HTTPException(
+                        status_code=422, detail="Expected list in response data"
+                    )
 
-            if current is None:
-                raise HTTPException(status_code=404, detail="Квартира не найдена")
+                result = []
+                for service in data:
+                    try:
+                        validated_service = IntercomService(
+                            service=service.get("service"),
+                            category=service.get("category"),
+                            timeto=service.get("timeto"),
+                        )
+                        result.append(validated_service)
+                    except ValueError as ve:
+                        raise HTTPException(
+                            status_code=422,
+                            detail=f"Invalid service data: {str(ve)}",
+                        ) from ve
 
-            if current == value:
-                return False
+                if not result:
+                    raise HTTPException(
+                        status_code=404, detail="No valid services found"
+                    )
 
-            # Обновляем значение
-            await rbt.execute(
-                "UPDATE houses_flats SET manual_block = $1 WHERE house_flat_id = $2",
-                value,
-                flat_id,
-            )
+                return result
 
-            return True
+            except ValueError as ve:
+                raise HTTPException(
+                    status_code=422, detail=f"Invalid JSON data: {str(ve)}"
+                ) from ve
 
-    except HTTPException:
-        raise
+    except aiohttp.ClientError as ce:
+        raise HTTPException(
+            status_code=422, detail=f"1C service unavailable: {str(ce)}"
+        ) from ce
     except Exception as e:
         raise HTTPException(
-            status_code=500, detail=f"Ошибка при обновлении manual_block: {str(e)}"
+            status_code=500, detail=f"Internal server error: {str(e)}"
         ) from e
 
 
-async def get_RBT_token(flat_id: int, rbt) -> str:
-    """Получение токена RBT по flat_id."""
-    query = """
-        SELECT auth_token
-        FROM houses_subscribers_mobile hsm
-        INNER JOIN houses_flats_subscribers hfs
-            ON hsm.house_subscriber_id = hfs.house_subscriber_id 
-        WHERE house_flat_id = $1 
-            AND auth_token IS NOT NULL
-        ORDER BY role DESC
-        LIMIT 1
-    """
-    token = await rbt.fetchval(query, flat_id)
-    if not token:
-        raise ValueError(f"Токен для flat_id {flat_id} не найден")
-    return token
-
-
 async def get_milvus_data(query: str) -> Search2ResponseData:
     """Отправляет запрос в Milvus для получения ближайших статей по запросу
     и возвращает данные в формате Search2ResponseData"""
     url = f"{config.UTILS_URL}/v2/mlv_search"
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, params={"text": query}) as response:
+        session = get_http_client(UTILS)
+        async with session.get(url, params={"text": query}) as response:
+            try:
+                response.raise_for_status()
+                body = await read_body(response)
                 try:
-                    response.raise_for_status()
-                    response_data = await response.json()
-                    try:
-                        validated_data = Search2ResponseData(**response_data)
-                        return validated_data
-                    except ValueError as ve:
-                        raise HTTPException(
-                            status_code=422,
-                            detail=f"Invalid response format: {str(ve)}",
-                        ) from ve
-
+                    validated_data = validate_json(Search2ResponseData, body)
+                    return validated_data
                 except ValueError as ve:
                     raise HTTPException(
-                        status_code=422, detail=f"Invalid JSON data: {str(ve)}"
+                        status_code=422,
+                        detail=f"Invalid response format: {str(ve)}",
                     ) from ve
 
+            except ValueError as ve:
+                raise HTTPException(
+                    status_code=422, detail=f"Invalid JSON data: {str(ve)}"
+                ) from ve
+
     except aiohttp.ClientError as ce:
         raise HTTPException(
             status_code=422, detail=f"Milvus service unavailable: {str(ce)}"
@@ -1312,17 +1227,17 @@ async def get_ai_response(
     url = f"{config.UTILS_URL}/v1/ai"
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                url,
-                json=request_data.model_dump(),
-                headers={"Content-Type": "application/json"},
-            ) as response:
-                response.raise_for_status()
-                response_data = await response.json()
-                if "ai_response" not in response_data:
-                    raise ValueError("Missing 'ai_response' in API response")
-                return response_data["ai_response"]
+        session = get_http_client(UTILS)
+        async with session.post(
+            url,
+            json=request_data.model_dump(),
+            headers={"Content-Type": "application/json"},
+        ) as response:
+            response.raise_for_status()
+            response_data = await read_json(response)
+            if "ai_response" not in response_data:
+                raise ValueError("Missing 'ai_response' in API response")
+            return response_data["ai_response"]
 
     except aiohttp.ClientError as ce:
         raise HTTPException(
@@ -1367,20 +1282,18 @@ async def get_addresses_from_redis(query_address: str) -> RedisAddressModelRespo
     url = f"{config.UTILS_URL}/redis_addresses"
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                url,
-                params={"query_address": query_address},
-                timeout=aiohttp.ClientTimeout(total=10),
-            ) as response:
-                if response.status == 404:
-                    raise HTTPException(status_code=404, detail="Not found")
-                response.raise_for_status()
-                response_data = await response.json()
-
-                # Валидация ответа
-                validated_data = RedisAddressModelResponse(**response_data)
-                return validated_data
+        session = get_http_client(UTILS)
+        async with session.get(
+            url,
+            params={"query_address": query_address},
+            timeout=aiohttp.ClientTimeout(total=10),
+        ) as response:
+            if response.status == 404:
+                raise HTTPException(status_code=404, detail="Not found")
+            response.raise_for_status()
+            # Валидация ответа
+            validated_data = await read_model(response, RedisAddressModelResponse)
+            return validated_data
 
     except HTTPException:
         raise
@@ -1403,13 +1316,13 @@ async def get_tariffs_from_redis(territory_id: str) -> dict:
     url = f"{config.UTILS_URL}/redis_tariffs"
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                url, params={"territory_id": territory_id}
-            ) as response:
-                response.raise_for_status()
-                response_data = await response.json()
-                return response_data
+        session = get_http_client(UTILS)
+        async with session.get(
+            url, params={"territory_id": territory_id}
+        ) as response:
+            response.raise_for_status()
+            response_data = await read_json(response)
+            return response_data
 
     except aiohttp.ClientError as ce:
         raise HTTPException(
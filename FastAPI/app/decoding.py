@@ -0,0 +1,69 @@
+"""
+Разбор JSON из Redis и ответов внешних API.
+
+Документ Redis или тело ответа разбирается один раз через orjson. Когда
+нужна модель, разобранные данные валидирует закэшированный TypeAdapter:
+orjson и validate_python вместе быстрее, чем validate_json из байтов
+(замер: python -m app.decoding_benchmark).
+"""
+
+import functools
+from typing import Any, Type, TypeVar
+
+import orjson
+from pydantic import TypeAdapter
+
+T = TypeVar("T")
+
+loads = orjson.loads
+
+
+@functools.lru_cache(maxsize=None)
+def get_adapter(tp: Type[T]) -> TypeAdapter[T]:
+    """TypeAdapter для типа, создаётся один раз."""
+    return TypeAdapter(tp)
+
+
+def validate_json(tp: Type[T], data: bytes | str) -> T:
+    """Валидация JSON из байтов или строки в тип tp."""
+    return get_adapter(tp).validate_python(loads(data))
+
+
+async def read_body(response) -> bytes:
+    """Тело ответа aiohttp. Пустое тело считается null, как в response.json()."""
+    body = await response.read()
+    return body if body.strip() else b"null"
+
+
+async def read_json(response) -> Any:
+    """Тело ответа aiohttp, разобранное orjson."""
+    return loads(await read_body(response))
+
+
+async def read_model(response, tp: Type[T]) -> T:
+    """Тело ответа aiohttp, провалидированное в тип tp."""
+    return validate_json(tp, await read_body(response))
+
+
+def doc_json(doc) -> Any:
+    """JSON документа RediSearch. Разбирается при первом обращении и запоминается."""
+    try:
+        return doc._decoded_json
+    except AttributeError:
+        doc._decoded_json = loads(doc.json)
+        return doc._decoded_json
+
+
+class OrjsonDecoder:
+    """Декодер для команд RedisJSON."""
+
+    def decode(self, data: bytes | str) -> Any:
+        return loads(data)
+
+
+_redis_decoder = OrjsonDecoder()
+
+
+def redis_json(redis):
+    """Команды RedisJSON с разбором ответов через orjson."""
+    return redis.json(decoder=_redis_decoder)
@@ -0,0 +1,148 @@
+"""
+Замер разбора JSON и валидации моделей из app.decoding.
+
+Сравнивает на синтетических данных формы из crud:
+- json.loads (так разбирает тело aiohttp response.json()) и orjson loads;
+- валидацию моделей: Model(**item) по разобранному json.loads списку,
+  TypeAdapter.validate_python по результату orjson (decoding.validate_json)
+  и TypeAdapter.validate_json прямо из байтов.
+
+Запуск:
+    python -m app.decoding_benchmark [--items N] [--runs N]
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import timeit
+from typing import Any, Callable, List, Optional, Type
+
+import orjson
+
+from app.decoding import get_adapter, loads, validate_json
+from app.schemas import Camera1CModel, RedisLoginSearch, Service1C
+
+logger = logging.getLogger(__name__)
+
+
+def _cameras(items: int) -> bytes:
+    return orjson.dumps([
+        {
+            "id": i,
+            "name": f"Камера {i}",
+            "ipaddress": f"10.0.{i // 256 % 256}.{i % 256}",
+            "available": i % 7 != 0,
+            "host": "flussonic",
+            "URL": f"rtsp://10.0.0.1/cam{i}",
+            "archive": 7,
+            "service": "Видеонаблюдение",
+            "macaddress": "00:11:22:33:44:55",
+            "deleted": False,
+            "status": "Активна",
+            "type": "Личная",
+        }
+        for i in range(items)
+    ])
+
+
+def _services(items: int) -> bytes:
+    return orjson.dumps([
+        {
+            "service": f"Услуга {i}",
+            "status": "Активна",
+            "date": "2024-01-01T00:00:00",
+            "login": f"user{i}",
+            "password": "secret",
+            "operator": "24ТВ",
+            "userId": str(100000 + i),
+            "serviceId": str(i),
+            "type": i % 3,
+            "not_turnoff_if_not_used": False,
+            "ban_on_app": False,
+        }
+        for i in range(items)
+    ])
+
+
+def _logins(items: int) -> bytes:
+    return orjson.dumps([
+        {
+            "login": f"user{i}",
+            "contract": str(100000 + i),
+            "name": f"Иванов Иван Иванович {i}",
+            "address": f"ул. Ленина, д. {i % 500}, кв. {i % 300}",
+            "timeTo": 1700000000 + i,
+        }
+        for i in range(items)
+    ])
+
+
+def _login_document() -> bytes:
+    return orjson.dumps({
+        "login": "user1",
+        "flatId": 100,
+        "hostId": 5,
+        "addressCodes": [10, 11],
+        "contract": "100001",
+        "name": "Иванов Иван Иванович",
+        "address": "ул. Ленина, д. 1, кв. 1",
+        "servicecats": {
+            name: {"timeto": 1700000000, "services": [{"id": i, "name": f"{name} {i}"} for i in range(5)]}
+            for name in ("internet", "tv", "intercom", "camera")
+        },
+    })
+
+
+def _measure(func: Callable[[], Any], runs: int, number: int = 10) -> float:
+    """Медиана времени одного вызова по runs сериям из number вызовов, мкс."""
+    timings = timeit.repeat(func, number=number, repeat=runs)
+    return statistics.median(timings) / number * 1e6
+
+
+def _report(title: str, results: List[tuple]) -> None:
+    baseline = results[0][1]
+    for name, value in results:
+        logger.info("%-22s %-34s %10.1f мкс  x%.1f", title, name, value, baseline / value)
+
+
+def bench_decode(title: str, body: bytes, runs: int) -> None:
+    """json.loads тела ответа против orjson."""
+    _report(title, [
+        ("json.loads(body.decode())", _measure(lambda: json.loads(body.decode()), runs)),
+        ("orjson loads(body)", _measure(lambda: loads(body), runs)),
+    ])
+
+
+def bench_models(title: str, body: bytes, model: Type, runs: int) -> None:
+    """Валидация списка моделей: из dict, через orjson и из байтов."""
+    adapter = get_adapter(Optional[List[model]])
+    _report(title, [
+        ("json.loads + Model(**item)", _measure(lambda: [model(**item) for item in json.loads(body)], runs)),
+        ("decoding.validate_json(body)", _measure(lambda: validate_json(Optional[List[model]], body), runs)),
+        ("adapter.validate_json(body)", _measure(lambda: adapter.validate_json(body), runs)),
+    ])
+
+
+def benchmark(items: int, runs: int) -> None:
+    """Замер всех форм на items элементах списка."""
+    cameras, services, logins = _cameras(items), _services(items), _logins(items)
+    bench_decode("документ логина", _login_document(), runs)
+    bench_decode("камеры 1С", cameras, runs)
+    bench_models("камеры 1С", cameras, Camera1CModel, runs)
+    bench_models("услуги 1С", services, Service1C, runs)
+    bench_models("поиск логинов", logins, RedisLoginSearch, runs)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Замер разбора JSON и валидации моделей")
+    parser.add_argument("--items", type=int, default=200, help="элементов в списках")
+    parser.add_argument("--runs", type=int, default=200, help="серий по 10 вызовов в каждом замере")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    benchmark(args.items, args.runs)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,19 +3,16 @@
 """
 from typing import Annotated, Any, Optional, AsyncGenerator
 
-import datetime
-import clickhouse_connect
 import asyncpg
-from redis.asyncio import Redis, from_url
-from sqlalchemy import select
+from redis.asyncio import Redis
 from fastapi import Depends, Header, HTTPException
 
-from app.models import Session, Token, SessionRadius
-from app.config import (
-    TOKEN_TTL, REDIS_HOST, REDIS_PORT, REDIS_PASSWORD,
-    POSTGRES_HOST, POSTGRES_PORT, POSTGRES_DATABASE, POSTGRES_USER, POSTGRES_PASSWORD,
-    CLICKHOUSE_HOST, CLICKHOUSE_USER, CLICKHOUSE_PASSWORD
-)
+from app.auth_cache import get_principal
+from app.clickhouse_pool import ClickHouseReader, get_clickhouse_reader
+from app.models import Session, SessionRadius
+from app.schemas import Principal
+from app.redis_pool import get_redis_client
+from app.rbt_pool import acquire_rbt_connection, release_rbt_connection
 
 
 async def get_session():
@@ -36,27 +33,23 @@ async def get_session_redius():
 SessionRediusDependency = Annotated[Session, Depends(get_session_redius)]
 
 
-async def get_token(session: SessionDependency, x_token: Optional[str] = Header(None)) -> Token: # type: ignore
-    """Получение токена из заголовка."""
+async def get_token(x_token: Optional[str] = Header(None)) -> Principal:
+    """Получение пользователя по токену из заголовка."""
     if x_token is None:
         raise HTTPException(status_code=401, detail="Invalid token")
-    token_query = select(Token).where(
-        Token.token == x_token,
-        Token.creation_time >= datetime.datetime.now() - datetime.timedelta(seconds=int(TOKEN_TTL))
-    )
-    token = await session.scalar(token_query)
-    if token is None:
+    principal = await get_principal(x_token)
+    if principal is None:
         raise HTTPException(status_code=401, detail="Invalid token")
     else:
-        return token
+        return principal
 
 
-TokenDependency = Annotated[Token, Depends(get_token)]
+TokenDependency = Annotated[Principal, Depends(get_token)]
 
 
 async def get_redis_connection() -> AsyncGenerator[Redis, None]:
-    """Получение подключения к Redis."""
-    connection = await from_url(f"redis://{REDIS_HOST}:{REDIS_PORT}", password=REDIS_PASSWORD)
+    """Получение клиента Redis поверх общего пула соединений."""
+    connection = get_redis_client()
     try:
         yield connection
     finally:
@@ -68,34 +61,20 @@ RedisDependency = Annotated[Any, Depends(get_redis_connection)]
 
 
 async def get_rbt_connection() -> AsyncGenerator[asyncpg.Connection, None]:
-    """Получение подключения к PostgreSQL."""
-    connection = await asyncpg.connect(
-        host=POSTGRES_HOST,
-        port=POSTGRES_PORT,
-        database=POSTGRES_DATABASE,
-        user=POSTGRES_USER,
-        password=POSTGRES_PASSWORD,
-    )
+    """Получение подключения к PostgreSQL из пула RBT."""
+    connection = await acquire_rbt_connection()
     try:
         yield connection
     finally:
-        await connection.close()
+        await release_rbt_connection(connection)
 
 
 RBTDependency = Annotated[Any, Depends(get_rbt_connection)]
 
 
-async def get_clickhouse_connections():
-    """Получение подключения к ClickHouse."""
-    clickhouse_client = clickhouse_connect.get_client(
-        host=CLICKHOUSE_HOST or "localhost",
-        username=CLICKHOUSE_USER or 'default',
-        password=CLICKHOUSE_PASSWORD or ''
-    )
-    try:
-        yield clickhouse_client
-    finally:
-        clickhouse_client.close()
+async def get_clickhouse_connections() -> ClickHouseReader:
+    """Получение общего клиента ClickHouse."""
+    return get_clickhouse_reader()
 
 
-ClickhouseDependency = Annotated[Any, Depends(get_clickhouse_connections)]
+ClickhouseDependency = Annotated[ClickHouseReader, Depends(get_clickhouse_connections)]
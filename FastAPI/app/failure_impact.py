@@ -0,0 +1,138 @@
+"""
+Логины, затронутые аварией.
+
+Хосты и коды адресов документа failure:{id} переводятся в логины поиском
+по idx:client (hostId, addressCodes). Ключи логинов читаются курсором
+FT.AGGREGATE страница за страницей, данные каждой страницы - одним
+запросом, поэтому ответ не собирается в памяти целиком.
+
+Найденные ключи логинов кэшируются на время жизни аварии: запись
+используется, пока у документа аварии те же хосты и адреса. Изменённая
+авария ищется заново, запись удалённой аварии вытесняется по LRU или
+AFFECTED_LOGINS_CACHE_TTL. Общий размер кэша ограничен
+AFFECTED_LOGINS_CACHE_MAX_LOGINS ключами; аварии, затронувшие больше
+логинов, не кэшируются.
+"""
+
+import logging
+import time
+from collections import OrderedDict
+from typing import AsyncIterator, List, Optional, Sequence, Tuple
+
+from app import config
+from app.decoding import redis_json
+from app.failure_index import failure_codes, failure_index
+from app.redis_schema import CLIENT_INDEX, FAILURE_INDEX
+from app.redis_search import iter_search_keys
+
+logger = logging.getLogger(__name__)
+
+AFFECTED_LOGIN_FIELDS = ("login", "name", "contract", "address", "primePhone", "flatId", "hostId", "addressCodes")
+
+# Хосты и коды адресов аварии
+Signature = Tuple[Tuple[int, ...], Tuple[int, ...]]
+
+
+def affected_query(hosts: Sequence[int], addresses: Sequence[int]) -> Optional[str]:
+    """Запрос к idx:client по хостам и кодам адресов аварии."""
+    clauses = [f"@hostId:[{host} {host}]" for host in hosts]
+    clauses.extend(f"@addressCodes:[{address} {address}]" for address in addresses)
+    return " | ".join(clauses) or None
+
+
+class AffectedLoginsCache:
+    """LRU-кэш ключей логинов, затронутых аварией."""
+
+    def __init__(self, max_logins: int, ttl: float):
+        self.max_logins = max_logins
+        self.ttl = ttl
+        self._items: "OrderedDict[str, Tuple[Signature, float, Tuple[str, ...]]]" = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, failure_key: str, signature: Signature) -> Optional[Tuple[str, ...]]:
+        """Ключи логинов аварии, если авария не менялась."""
+        item = self._items.get(failure_key)
+        if item is None or item[0] != signature or item[1] <= time.monotonic():
+            if item is not None:
+                self.discard(failure_key)
+            self.misses += 1
+            return None
+        self._items.move_to_end(failure_key)
+        self.hits += 1
+        return item[2]
+
+    def put(self, failure_key: str, signature: Signature, keys: Sequence[str]) -> None:
+        """Сохранение ключей логинов аварии."""
+        if len(keys) > self.max_logins:
+            return
+        self.discard(failure_key)
+        self._items[failure_key] = (signature, time.monotonic() + self.ttl, tuple(keys))
+        self._size += len(keys)
+        while self._size > self.max_logins:
+            _, (_, _, evicted) = self._items.popitem(last=False)
+            self._size -= len(evicted)
+
+    def discard(self, failure_key: str) -> None:
+        """Удаление записи аварии."""
+        item = self._items.pop(failure_key, None)
+        if item is not None:
+            self._size -= len(item[2])
+
+    def get_stats(self) -> dict:
+        """Статистика кэша для мониторинга."""
+        return {
+            "failures": len(self._items),
+            "logins": self._size,
+            "max_logins": self.max_logins,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+affected_logins_cache = AffectedLoginsCache(
+    max_logins=config.AFFECTED_LOGINS_CACHE_MAX_LOGINS,
+    ttl=config.AFFECTED_LOGINS_CACHE_TTL,
+)
+
+
+async def get_failure(failure_id: str, redis) -> Optional[list]:
+    """Документ аварии по id из индекса аварий или Redis, None если его нет."""
+    key = FAILURE_INDEX.prefixes[0] + failure_id
+    if failure_index.ready:
+        failures = failure_index.get(key)
+        if failures is not None:
+            return failures
+    # Индекс отстаёт от Redis до следующей перезагрузки - новая авария ищется в Redis
+    failures = await redis_json(redis).get(key)
+    if failures is None:
+        return None
+    return failures if isinstance(failures, list) else [failures]
+
+
+async def iter_affected_keys(failure_id: str, failures: list, redis) -> AsyncIterator[Sequence[str]]:
+    """Ключи логинов, затронутых аварией, страницами по REDIS_SEARCH_PAGE_SIZE."""
+    failure_key = FAILURE_INDEX.prefixes[0] + failure_id
+    signature = failure_codes(failures)
+    page_size = config.REDIS_SEARCH_PAGE_SIZE
+
+    cached = affected_logins_cache.get(failure_key, signature)
+    if cached is not None:
+        for offset in range(0, len(cached), page_size):
+            yield cached[offset:offset + page_size]
+        return
+
+    query = affected_query(*signature)
+    if query is None:
+        return
+    # Ключи копятся для кэша, пока их не больше, чем помещается в кэш
+    collected: Optional[List[str]] = []
+    async for keys in iter_search_keys(redis, CLIENT_INDEX.alias, query, page_size=page_size):
+        if collected is not None:
+            collected.extend(keys)
+            if len(collected) > affected_logins_cache.max_logins:
+                collected = None
+        yield keys
+    if collected is not None:
+        affected_logins_cache.put(failure_key, signature, collected)
@@ -0,0 +1,262 @@
+"""
+Индекс активных аварий в памяти процесса.
+
+Во время массовой аварии /v1/failure запрашивают для каждого звонящего
+абонента, и каждый запрос искал аварии в RediSearch. Здесь фоновая задача
+загружает все документы failure:* и строит словари hostId -> аварии и
+код адреса -> аварии, после чего поиск аварий по логину - обращение к
+словарю.
+
+Индекс перезагружается целиком каждые FAILURE_INDEX_REFRESH_INTERVAL секунд
+и после keyspace-уведомлений по ключам failure:* (события за
+FAILURE_INDEX_DEBOUNCE секунд объединяются в одну перезагрузку). Без
+уведомлений остаётся перезагрузка по интервалу.
+
+version увеличивается при каждом изменении содержимого индекса, age -
+секунды с последней успешной загрузки. Индекс старше FAILURE_INDEX_MAX_AGE
+не используется, crud ищет аварии в Redis.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from app import config
+from app.decoding import redis_json
+from app.keyspace import check_keyspace_notifications, listen_keyspace
+from app.redis_pool import get_redis_client
+from app.redis_schema import FAILURE_INDEX
+from app.redis_search import iter_search_keys
+
+logger = logging.getLogger(__name__)
+
+
+class FailureLookup(NamedTuple):
+    """Аварии по логину и версия индекса, по которому они найдены."""
+
+    failures: Optional[List[dict]]
+    index_version: Optional[int] = None
+    index_age: Optional[float] = None
+
+
+def _codes(value) -> List[int]:
+    # host и address в документе - число, иногда строка или список
+    values = value if isinstance(value, list) else [value]
+    codes = []
+    for item in values:
+        try:
+            codes.append(int(item))
+        except (TypeError, ValueError):
+            continue
+    return codes
+
+
+def failure_codes(failures: list) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    """Хосты и коды адресов документа аварий."""
+    hosts = set()
+    addresses = set()
+    for failure in failures:
+        if isinstance(failure, dict):
+            hosts.update(_codes(failure.get("host")))
+            addresses.update(_codes(failure.get("address")))
+    return tuple(sorted(hosts)), tuple(sorted(addresses))
+
+
+def _build(documents: Dict[str, list]) -> Tuple[Dict[int, Tuple[str, ...]], Dict[int, Tuple[str, ...]]]:
+    by_host: Dict[int, List[str]] = {}
+    by_address: Dict[int, List[str]] = {}
+    for key, failures in documents.items():
+        hosts, addresses = failure_codes(failures)
+        for host in hosts:
+            by_host.setdefault(host, []).append(key)
+        for address in addresses:
+            by_address.setdefault(address, []).append(key)
+    return (
+        {host: tuple(keys) for host, keys in by_host.items()},
+        {address: tuple(keys) for address, keys in by_address.items()},
+    )
+
+
+class FailureIndex:
+    """Словари активных аварий по хосту и коду адреса."""
+
+    def __init__(self, refresh_interval: float, debounce: float, max_age: float, reconnect_delay: float):
+        self.refresh_interval = refresh_interval
+        self.debounce = debounce
+        self.max_age = max_age
+        self.reconnect_delay = reconnect_delay
+        # Документы и словари заменяются одним присваиванием после загрузки
+        self._state: Tuple[Dict[str, list], Dict[int, Tuple[str, ...]], Dict[int, Tuple[str, ...]]] = ({}, {}, {})
+        self.version = 0
+        self._loaded_at: Optional[float] = None
+        self._listening = False
+        self._wake = asyncio.Event()
+        self._stop = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+        self.refreshes = 0
+        self.errors = 0
+        self.events = 0
+
+    @property
+    def age(self) -> Optional[float]:
+        """Секунды с последней успешной загрузки, None до первой загрузки."""
+        if self._loaded_at is None:
+            return None
+        return time.monotonic() - self._loaded_at
+
+    @property
+    def ready(self) -> bool:
+        """Индекс загружен и не устарел."""
+        age = self.age
+        return age is not None and age <= self.max_age
+
+    def lookup(self, host_id: Optional[int], address_codes: Optional[Sequence[int]]) -> List[list]:
+        """Документы аварий по хосту и кодам адресов.
+
+        Документы общие для всех запросов и не должны изменяться вызывающим кодом.
+        """
+        documents, by_host, by_address = self._state
+        keys: List[str] = []
+        if host_id:
+            keys.extend(by_host.get(host_id, ()))
+        for address in address_codes or ():
+            keys.extend(by_address.get(address, ()))
+        return [documents[key] for key in dict.fromkeys(keys)]
+
+    def get(self, key: str) -> Optional[list]:
+        """Документ аварий по ключу failure:*, None если его нет в индексе."""
+        return self._state[0].get(key)
+
+    async def refresh(self) -> None:
+        """Загрузка всех аварий из Redis.
+
+        Ключи читаются курсором FT.AGGREGATE (без ограничения MAXSEARCHRESULTS
+        и сдвига страниц при изменениях), документы - JSON.MGET по странице
+        ключей. При ошибке индекс остаётся прежним и не считается свежим.
+        """
+        redis = get_redis_client()
+        try:
+            documents: Dict[str, list] = {}
+            json_commands = redis_json(redis)
+            async for keys in iter_search_keys(redis, FAILURE_INDEX.alias, "*"):
+                values = await json_commands.mget(keys, "$")
+                for key, value in zip(keys, values):
+                    # Ключ удалён между чтением ключей и документов
+                    if not value or value[0] is None:
+                        continue
+                    documents[key] = value[0] if isinstance(value[0], list) else [value[0]]
+        finally:
+            await redis.aclose()
+
+        if documents != self._state[0]:
+            self._state = (documents, *_build(documents))
+            self.version += 1
+        self._loaded_at = time.monotonic()
+        self.refreshes += 1
+
+    def _on_key(self, key: str) -> None:
+        self.events += 1
+        self._wake.set()
+
+    def _on_subscribed(self) -> None:
+        # Изменения до подписки могли быть пропущены
+        self._listening = True
+        self._wake.set()
+        logger.info("Индекс аварий подписан на keyspace-уведомления")
+
+    async def _listen(self) -> None:
+        redis = get_redis_client()
+        if not await check_keyspace_notifications(redis):
+            logger.warning("Индекс аварий обновляется только по интервалу")
+            await asyncio.wait_for(self._stop.wait(), timeout=self.refresh_interval)
+            return
+        prefix = FAILURE_INDEX.prefixes[0]
+        await listen_keyspace(redis, prefix + "*", self._on_key, self._stop, self._on_subscribed)
+
+    async def _run_listener(self) -> None:
+        while not self._stop.is_set():
+            try:
+                await self._listen()
+            except asyncio.TimeoutError:
+                pass
+            except Exception as e:
+                logger.error("Ошибка подписки индекса аварий: %s", e)
+            finally:
+                self._listening = False
+            if not self._stop.is_set():
+                try:
+                    await asyncio.wait_for(self._stop.wait(), timeout=self.reconnect_delay)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _run_refresh(self) -> None:
+        while not self._stop.is_set():
+            self._wake.clear()
+            try:
+                await self.refresh()
+            except Exception as e:
+                self.errors += 1
+                logger.error("Ошибка загрузки индекса аварий: %s", e)
+
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.refresh_interval)
+            except asyncio.TimeoutError:
+                continue
+            # Изменения массовой аварии приходят пачкой - ждём, пока она закончится
+            try:
+                await asyncio.wait_for(self._stop.wait(), timeout=self.debounce)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        """Запуск загрузки индекса и подписки на уведомления."""
+        if not self._tasks:
+            self._stop.clear()
+            self._tasks = [
+                asyncio.create_task(self._run_refresh(), name="failure_index_refresh"),
+                asyncio.create_task(self._run_listener(), name="failure_index_listener"),
+            ]
+
+    async def stop(self) -> None:
+        """Остановка фоновых задач индекса."""
+        if self._tasks:
+            self._stop.set()
+            self._wake.set()
+            await asyncio.gather(*self._tasks)
+            self._tasks = []
+
+    def get_stats(self) -> dict:
+        """Статистика индекса для мониторинга."""
+        documents, by_host, by_address = self._state
+        return {
+            "ready": self.ready,
+            "listening": self._listening,
+            "version": self.version,
+            "age": self.age,
+            "documents": len(documents),
+            "hosts": len(by_host),
+            "addresses": len(by_address),
+            "refreshes": self.refreshes,
+            "errors": self.errors,
+            "events": self.events,
+        }
+
+
+failure_index = FailureIndex(
+    refresh_interval=config.FAILURE_INDEX_REFRESH_INTERVAL,
+    debounce=config.FAILURE_INDEX_DEBOUNCE,
+    max_age=config.FAILURE_INDEX_MAX_AGE,
+    reconnect_delay=config.FAILURE_INDEX_RECONNECT_DELAY,
+)
+
+
+async def start_failure_index() -> None:
+    """Запуск индекса активных аварий."""
+    if config.FAILURE_INDEX_ENABLED:
+        failure_index.start()
+
+
+async def stop_failure_index() -> None:
+    """Остановка индекса активных аварий."""
+    await failure_index.stop()
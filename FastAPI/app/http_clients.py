@@ -0,0 +1,73 @@
+"""
+Общие HTTP-клиенты для внешних сервисов.
+
+Для каждого внешнего сервиса создаётся одна долгоживущая сессия aiohttp
+с пулом keep-alive соединений, кэшем DNS и таймаутами по умолчанию.
+Сессии открываются и закрываются в lifespan приложения.
+"""
+
+import logging
+from typing import Dict
+
+import aiohttp
+
+from app import config
+
+logger = logging.getLogger(__name__)
+
+# Внешние сервисы
+ONE_C = "1c"
+FLUSSONIC = "flussonic"
+TV24 = "tv24"
+TVIP = "tvip"
+RBT = "rbt"
+UTILS = "utils"
+TV_FIX = "tv_fix"
+
+UPSTREAMS = (ONE_C, FLUSSONIC, TV24, TVIP, RBT, UTILS, TV_FIX)
+
+_clients: Dict[str, aiohttp.ClientSession] = {}
+
+
+def _create_client(name: str) -> aiohttp.ClientSession:
+    """Создание сессии aiohttp для внешнего сервиса."""
+    connector = aiohttp.TCPConnector(
+        limit=config.HTTP_POOL_LIMIT,
+        limit_per_host=config.HTTP_POOL_LIMIT_PER_HOST,
+        keepalive_timeout=config.HTTP_KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=config.HTTP_DNS_CACHE_TTL,
+        enable_cleanup_closed=True,
+    )
+    timeout = aiohttp.ClientTimeout(
+        total=config.EXTERNAL_API_TIMEOUT,
+        connect=config.EXTERNAL_API_CONNECT_TIMEOUT,
+    )
+    logger.info("HTTP-клиент %s создан", name)
+    return aiohttp.ClientSession(connector=connector, timeout=timeout)
+
+
+async def start_http_clients() -> None:
+    """Открытие сессий для всех внешних сервисов."""
+    for name in UPSTREAMS:
+        get_http_client(name)
+
+
+def get_http_client(name: str) -> aiohttp.ClientSession:
+    """Получение общей сессии aiohttp для внешнего сервиса."""
+    if name not in UPSTREAMS:
+        raise ValueError(f"Неизвестный внешний сервис: {name}")
+
+    client = _clients.get(name)
+    if client is None or client.closed:
+        client = _clients[name] = _create_client(name)
+    return client
+
+
+async def close_http_clients() -> None:
+    """Закрытие всех сессий aiohttp."""
+    for name, client in list(_clients.items()):
+        try:
+            await client.close()
+        except Exception as e:
+            logger.error("Ошибка закрытия HTTP-клиента %s: %s", name, e)
+    _clients.clear()
@@ -0,0 +1,114 @@
+"""
+Подписка на keyspace-уведомления Redis.
+
+Используется кэшами, которые должны сбрасываться при изменении ключей в
+Redis (login_cache, failure_index). Для работы в Redis должны быть
+включены уведомления, например notify-keyspace-events "KA"; если задан
+REDIS_NOTIFY_KEYSPACE_EVENTS, настройка выставляется при подписке.
+
+Если CONFIG запрещён (управляемый Redis), доставка уведомлений
+проверяется пробной записью: JSON.SET и DEL отдельного ключа должны прийти
+событиями за KEYSPACE_PROBE_TIMEOUT секунд. Без подтверждения кэши не
+используются.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from typing import Callable, Optional
+
+from app import config
+
+logger = logging.getLogger(__name__)
+
+# Ключ пробной записи - вне префиксов, на которые подписаны кэши
+PROBE_KEY_PREFIX = "diagnostics:keyspace_probe:"
+
+
+def keyspace_enabled(flags: str) -> bool:
+    """Достаточно ли флагов notify-keyspace-events для отслеживания ключей."""
+    # K - события keyspace; A включает g (del, rename), x, e и d (команды модулей, JSON.*)
+    return "K" in flags and ("A" in flags or all(flag in flags for flag in "gxed"))
+
+
+def _channel_prefix(redis) -> str:
+    db = redis.connection_pool.connection_kwargs.get("db", 0)
+    return f"__keyspace@{db}__:"
+
+
+async def probe_keyspace_notifications(redis) -> bool:
+    """Проверка доставки уведомлений пробной записью отдельного ключа."""
+    key = f"{PROBE_KEY_PREFIX}{uuid.uuid4().hex}"
+    expected = {"json.set", "del"}
+    async with redis.pubsub() as pubsub:
+        await pubsub.subscribe(_channel_prefix(redis) + key)
+        try:
+            await redis.execute_command("JSON.SET", key, "$", "1")
+        finally:
+            await redis.delete(key)
+
+        deadline = time.monotonic() + config.KEYSPACE_PROBE_TIMEOUT
+        while expected:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=remaining)
+            if message is None:
+                continue
+            event = message["data"]
+            expected.discard(event.decode() if isinstance(event, bytes) else event)
+    if expected:
+        logger.warning("Keyspace-уведомления Redis не приходят: нет событий %s", ", ".join(sorted(expected)))
+        return False
+    return True
+
+
+async def check_keyspace_notifications(redis) -> bool:
+    """Проверка, что Redis отправляет keyspace-уведомления."""
+    try:
+        if config.REDIS_NOTIFY_KEYSPACE_EVENTS:
+            await redis.config_set("notify-keyspace-events", config.REDIS_NOTIFY_KEYSPACE_EVENTS)
+        values = await redis.config_get("notify-keyspace-events")
+        flags = next(iter(values.values()), "")
+    except Exception as e:
+        # CONFIG может быть запрещён у управляемого Redis - проверяем доставку напрямую
+        logger.warning("Не удалось прочитать notify-keyspace-events: %s", e)
+        try:
+            return await probe_keyspace_notifications(redis)
+        except Exception as e:
+            logger.warning("Не удалось проверить keyspace-уведомления пробной записью: %s", e)
+            return False
+    if isinstance(flags, bytes):
+        flags = flags.decode()
+    if not keyspace_enabled(flags):
+        logger.warning("Keyspace-уведомления Redis выключены (notify-keyspace-events=%r)", flags)
+        return False
+    return True
+
+
+async def listen_keyspace(
+    redis,
+    pattern: str,
+    on_key: Callable[[str], None],
+    stop: asyncio.Event,
+    on_subscribed: Optional[Callable[[], None]] = None,
+) -> None:
+    """Вызов on_key для каждого события по ключам, подходящим под pattern, до stop.
+
+    on_subscribed вызывается после подписки: всё, что изменилось до неё,
+    могло быть пропущено.
+    """
+    channel_prefix = _channel_prefix(redis)
+    async with redis.pubsub() as pubsub:
+        await pubsub.psubscribe(channel_prefix + pattern)
+        if on_subscribed is not None:
+            on_subscribed()
+        while not stop.is_set():
+            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            if message is None:
+                continue
+            channel = message["channel"]
+            if isinstance(channel, bytes):
+                channel = channel.decode()
+            on_key(channel[len(channel_prefix):])
@@ -3,7 +3,17 @@
 """
 import logging
 from contextlib import asynccontextmanager
-from app.models import Base, engine
+from app.models import Base, engine, create_missing_indexes
+from app.http_clients import start_http_clients, close_http_clients
+from app.redis_pool import start_redis_pool, close_redis_pool
+from app.rbt_pool import start_rbt_pool, close_rbt_pool
+from app.auth import shutdown_executor
+from app.actions_feed import start_actions_feed, stop_actions_feed
+from app.login_cache import start_login_cache, stop_login_cache
+from app.failure_index import start_failure_index, stop_failure_index
+from app.clickhouse_pool import start_clickhouse_reader, close_clickhouse_reader
+from app.clickhouse_writer import start_action_log_writer, stop_action_log_writer
+from app.tasks import start_background_tasks, stop_background_tasks
 from fastapi import FastAPI
 
 logger = logging.getLogger(__name__)
@@ -12,5 +22,27 @@ async def lifespan(app: FastAPI):
     logger.info('START')
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
-    yield
-    logger.info('STOP')
+        await conn.run_sync(create_missing_indexes)
+    await start_http_clients()
+    await start_redis_pool()
+    await start_login_cache()
+    await start_failure_index()
+    await start_rbt_pool()
+    await start_clickhouse_reader()
+    await start_action_log_writer()
+    await start_actions_feed()
+    start_background_tasks()
+    try:
+        yield
+    finally:
+        await stop_background_tasks()
+        await stop_actions_feed()
+        await stop_action_log_writer()
+        await stop_failure_index()
+        await stop_login_cache()
+        await close_http_clients()
+        await close_redis_pool()
+        await close_rbt_pool()
+        await close_clickhouse_reader()
+        shutdown_executor()
+        logger.info('STOP')
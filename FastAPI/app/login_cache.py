@@ -0,0 +1,209 @@
+"""
+Кэш документов login:* из Redis.
+
+Вкладки одного абонента (/v1/network, /v1/cameras, /v1/failure, ...) читают
+один и тот же документ login:{login}. Кэш хранит последние документы в
+памяти процесса, размер ограничен, вытеснение - LRU.
+
+Согласованность обеспечивают keyspace-уведомления Redis: фоновая задача
+подписана на __keyspace@<db>__:login:* и удаляет запись при любом событии
+по ключу (json.set, del, expired, ...). Пока подписка не активна, кэш не
+используется и очищается, поэтому устаревший документ не отдаётся. Для
+работы в Redis должны быть включены уведомления (см. app.keyspace).
+LOGIN_CACHE_TTL ограничивает время жизни записи на случай потерянного
+уведомления.
+
+Документы хранятся сериализованными orjson: каждое чтение получает свою
+копию, и изменение результата вызывающим кодом не портит кэш.
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import orjson
+
+from app import config
+from app.decoding import loads
+from app.keyspace import check_keyspace_notifications, listen_keyspace
+from app.redis_pool import get_redis_client
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "login:"
+
+# Отсутствие записи в кэше (None - допустимое значение документа)
+MISSING = object()
+
+
+class LoginCache:
+    """LRU-кэш документов login:* со сбросом по keyspace-уведомлениям."""
+
+    def __init__(self, max_size: int, ttl: float, reconnect_delay: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.reconnect_delay = reconnect_delay
+        self._items: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        # Ключ -> метка загрузки; сброс ключа во время загрузки отменяет запись в кэш
+        self._loading: Dict[str, object] = {}
+        self._listening = False
+        self._stop = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    @property
+    def active(self) -> bool:
+        """Кэш используется только при активной подписке на уведомления."""
+        return self._listening
+
+    def get(self, key: str) -> Any:
+        """Документ из кэша или MISSING."""
+        if not self._listening:
+            return MISSING
+        item = self._items.get(key)
+        if item is None:
+            self.misses += 1
+            return MISSING
+
+        deadline, data = item
+        if deadline <= time.monotonic():
+            del self._items[key]
+            self.misses += 1
+            return MISSING
+
+        self._items.move_to_end(key)
+        self.hits += 1
+        return loads(data)
+
+    def begin_load(self, key: str) -> object:
+        """Метка загрузки ключа из Redis."""
+        marker = object()
+        self._loading[key] = marker
+        return marker
+
+    def finish_load(self, key: str, marker: object, value: Any) -> None:
+        """Сохранение загруженного документа, если ключ не менялся во время загрузки."""
+        if self._loading.get(key) is not marker:
+            return
+        del self._loading[key]
+        # Отсутствующие ключи не кэшируются: создание ключа даёт уведомление, но
+        # отрицательный результат проще не хранить
+        if value is None or not self._listening:
+            return
+
+        self._items[key] = (time.monotonic() + self.ttl, orjson.dumps(value))
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+            self.evictions += 1
+
+    def cancel_load(self, key: str, marker: object) -> None:
+        """Отмена загрузки после ошибки чтения из Redis."""
+        if self._loading.get(key) is marker:
+            del self._loading[key]
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Документ из кэша или результат loader."""
+        value = self.get(key)
+        if value is not MISSING:
+            return value
+
+        marker = self.begin_load(key)
+        try:
+            value = await loader()
+        except BaseException:
+            self.cancel_load(key, marker)
+            raise
+        self.finish_load(key, marker, value)
+        return value
+
+    def invalidate(self, key: str) -> None:
+        """Сброс записи по ключу."""
+        self._loading.pop(key, None)
+        if self._items.pop(key, None) is not None:
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        """Полная очистка кэша."""
+        self._items.clear()
+        self._loading.clear()
+
+    def _on_subscribed(self) -> None:
+        # Всё, что изменилось до подписки, могло быть пропущено
+        self.clear()
+        self._listening = True
+        logger.info("Кэш логинов подписан на keyspace-уведомления")
+
+    async def _listen(self) -> None:
+        redis = get_redis_client()
+        if not await check_keyspace_notifications(redis):
+            logger.warning("Кэш логинов не используется без keyspace-уведомлений")
+            # Настройка сервера сама не изменится, повторная проверка - после паузы
+            await asyncio.wait_for(self._stop.wait(), timeout=config.LOGIN_CACHE_RECHECK_INTERVAL)
+            return
+        await listen_keyspace(redis, KEY_PREFIX + "*", self.invalidate, self._stop, self._on_subscribed)
+
+    async def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                await self._listen()
+            except asyncio.TimeoutError:
+                pass
+            except Exception as e:
+                logger.error("Ошибка подписки кэша логинов: %s", e)
+            finally:
+                self._listening = False
+                self.clear()
+            if not self._stop.is_set():
+                try:
+                    await asyncio.wait_for(self._stop.wait(), timeout=self.reconnect_delay)
+                except asyncio.TimeoutError:
+                    pass
+
+    def start(self) -> None:
+        """Запуск подписки на уведомления."""
+        if self._task is None:
+            self._stop.clear()
+            self._task = asyncio.create_task(self._run(), name="login_cache")
+
+    async def stop(self) -> None:
+        """Остановка подписки и очистка кэша."""
+        if self._task is not None:
+            self._stop.set()
+            await self._task
+            self._task = None
+
+    def get_stats(self) -> dict:
+        """Статистика кэша для мониторинга."""
+        return {
+            "active": self._listening,
+            "size": len(self._items),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+        }
+
+
+login_cache = LoginCache(
+    max_size=config.LOGIN_CACHE_MAX_SIZE,
+    ttl=config.LOGIN_CACHE_TTL,
+    reconnect_delay=config.LOGIN_CACHE_RECONNECT_DELAY,
+)
+
+
+async def start_login_cache() -> None:
+    """Запуск кэша документов логинов."""
+    if config.LOGIN_CACHE_ENABLED:
+        login_cache.start()
+
+
+async def stop_login_cache() -> None:
+    """Остановка кэша документов логинов."""
+    await login_cache.stop()
@@ -14,7 +14,10 @@ from app.routes.App_routes import router as app_router
 from app.routes.payment_routes import router as pay_router
 from app.routes.intercom_router import router as intercom_router
 from app.routes.frida_routes import router as frida_router
+from app.routes.monitoring_routes import router as monitoring_router
+from app.routes.stats_routes import router as stats_router
 
+from app.audit import AuditMiddleware
 from app.lifespan import lifespan
 
 from fastapi import FastAPI
@@ -44,7 +47,9 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
+app.add_middleware(AuditMiddleware)
 
 app.include_router(user_router)
 app.include_router(auth_router)
@@ -57,6 +62,8 @@ app.include_router(app_router)
 app.include_router(pay_router)
 app.include_router(intercom_router)
 app.include_router(frida_router)
+app.include_router(monitoring_router)
+app.include_router(stats_router)
 
 if __name__ == "__main__":
     uvicorn.run("app.main:app", port=8000, reload=True)
@@ -37,9 +37,10 @@ class User(Base):
     lastname: Mapped[str] = mapped_column(String(100), nullable=False)
     middlename: Mapped[str] = mapped_column(String(100), nullable=False)
     password: Mapped[str] = mapped_column(String(72), nullable=False)
-    tokens: Mapped[list['Token']] = relationship('Token', lazy='joined', back_populates='user')
+    # Связи не загружаются по умолчанию: запросы явно указывают нужные через selectinload
+    tokens: Mapped[list['Token']] = relationship('Token', lazy='raise', back_populates='user')
     role_id: Mapped[int] = mapped_column(Integer, ForeignKey('role.id'))
-    role: Mapped['Role'] = relationship('Role', lazy='joined', back_populates='users')
+    role: Mapped['Role'] = relationship('Role', lazy='raise', back_populates='users')
     frida_logs: Mapped[list['FridaLogs']] = relationship('FridaLogs', back_populates='user')
 
 
@@ -48,10 +49,12 @@ class Token(Base):
     __tablename__ = 'token'
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    token: Mapped[UUID] = mapped_column(CHAR(36), default=lambda: str(uuid.uuid4()), nullable=False)
-    creation_time: Mapped[datetime.datetime] = mapped_column(DateTime, server_default=now())
+    token: Mapped[UUID] = mapped_column(
+        CHAR(36), default=lambda: str(uuid.uuid4()), nullable=False, unique=True, index=True
+    )
+    creation_time: Mapped[datetime.datetime] = mapped_column(DateTime, server_default=now(), index=True)
     user_id: Mapped[int] = mapped_column(Integer, ForeignKey('user.id'))
-    user: Mapped[User] = relationship('User', lazy='joined', back_populates='tokens')
+    user: Mapped[User] = relationship('User', lazy='raise', back_populates='tokens')
 
 
 class Role(Base):
@@ -60,7 +63,7 @@ class Role(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     name: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
-    users: Mapped[list[User]] = relationship('User', lazy='joined', back_populates='role')
+    users: Mapped[list[User]] = relationship('User', lazy='raise', back_populates='role')
 
 
 class FridaLogs(Base):
@@ -87,6 +90,17 @@ class LogHash(Base):
     log: Mapped['FridaLogs'] = relationship('FridaLogs', back_populates='hashes')
 
 
+def create_missing_indexes(connection) -> None:
+    """Создание индексов, добавленных в модели после создания таблиц.
+
+    create_all не трогает существующие таблицы, поэтому новые индексы
+    создаются отдельно (если индекса с таким именем ещё нет).
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+
 # Типы для работы с ORM
 ORM_OBJECT = Union[User, Token, Role, FridaLogs, LogHash]
 ORM_CLS = Union[type(User), type(Token), type(Role), type(FridaLogs), type(LogHash)]
\ No newline at end of file
@@ -0,0 +1,357 @@
+"""
+Операции с базой данных RBT (PostgreSQL).
+
+Чтение выполняется одиночными запросами без явных транзакций: каждый SELECT
+идёт одним обращением к базе, без BEGIN/COMMIT. Тексты запросов вынесены
+в именованные константы модуля, поэтому подготовленные выражения
+переиспользуются через кэш выражений соединения (statement_cache_size
+пула RBT). Транзакции открываются только в операциях записи.
+"""
+
+from typing import Dict, List, Optional
+
+from fastapi import HTTPException
+
+from app.schemas import RBT_phone, RBTApsSettings, StatusResponse
+
+# Запросы на чтение
+SUBSCRIBER_MOBILE_IDS_SQL = """
+    SELECT id
+    FROM "houses_subscribers_mobile"
+    WHERE "house_subscriber_id" = $1
+"""
+
+FLAT_SUBSCRIBER_PHONES_SQL = """
+    SELECT fs.role, sm.id, sm.subscriber_name, sm.subscriber_patronymic
+    FROM houses_flats_subscribers fs
+    JOIN houses_subscribers_mobile sm
+    ON fs.house_subscriber_id = sm.house_subscriber_id
+    WHERE fs.house_flat_id = $1 and fs.house_subscriber_id =  $2
+"""
+
+FLAT_PHONES_SQL = """
+    SELECT fs.house_subscriber_id, fs.role, sm.id, sm.subscriber_name, sm.subscriber_patronymic
+    FROM houses_flats_subscribers fs
+    JOIN houses_subscribers_mobile sm
+    ON fs.house_subscriber_id = sm.house_subscriber_id
+    WHERE fs.house_flat_id = $1
+"""
+
+SUBSCRIBER_FLATS_SQL = """
+    SELECT house_flat_id, house_subscriber_id
+    FROM "houses_flats_subscribers"
+    WHERE "house_subscriber_id" = $1
+"""
+
+SUBSCRIBERS_FLATS_SQL = """
+    SELECT house_flat_id, house_subscriber_id
+    FROM "houses_flats_subscribers"
+    WHERE "house_subscriber_id" = ANY($1)
+"""
+
+FLATS_BY_IDS_SQL = """
+    SELECT house_flat_id, flat
+    FROM "houses_flats"
+    WHERE "house_flat_id" = ANY($1)
+"""
+
+FLAT_BY_ID_SQL = """
+    SELECT flat
+    FROM "houses_flats"
+    WHERE "house_flat_id" = $1
+"""
+
+HOUSE_ID_BY_UUID2_SQL = """
+    SELECT house_subscriber_id
+    FROM "houses_subscribers_mobile"
+    WHERE "auth_token" = $1
+    LIMIT 1
+"""
+
+FLAT_ID_BY_HOUSE_AND_FLAT_SQL = """
+    SELECT house_flat_id
+    FROM "houses_flats"
+    WHERE "flat" = $1 AND "address_house_id" = $2
+    LIMIT 1
+"""
+
+SUBSCRIBER_IDS_BY_PHONES_SQL = """
+    SELECT house_subscriber_id
+    FROM houses_subscribers_mobile
+    WHERE id = ANY($1)
+"""
+
+FLAT_COUNT_SQL = """
+    SELECT COUNT(*)
+    FROM "houses_flats"
+    WHERE "house_flat_id" = $1
+"""
+
+APS_SETTINGS_SQL = """
+    SELECT house_flat_id,
+           address_house_id,
+           manual_block,
+           auto_block,
+           open_code,
+           white_rabbit,
+           admin_block
+    FROM "houses_flats"
+    WHERE "house_flat_id" = $1
+"""
+
+RBT_TOKEN_SQL = """
+    SELECT auth_token
+    FROM houses_subscribers_mobile hsm
+    INNER JOIN houses_flats_subscribers hfs
+        ON hsm.house_subscriber_id = hfs.house_subscriber_id
+    WHERE house_flat_id = $1
+        AND auth_token IS NOT NULL
+    ORDER BY role DESC
+    LIMIT 1
+"""
+
+MANUAL_BLOCK_SQL = "SELECT manual_block FROM houses_flats WHERE house_flat_id = $1"
+
+# Запросы на запись
+CHANGE_ROLE_SQL = """
+    UPDATE houses_flats_subscribers
+    SET role = $1
+    WHERE house_subscriber_id = $2 AND house_flat_id = $3
+    RETURNING house_subscriber_id
+"""
+
+DELETE_FLAT_SUBSCRIBER_SQL = """
+    DELETE FROM houses_flats_subscribers
+    WHERE house_subscriber_id = $1 AND house_flat_id = $2
+    RETURNING house_subscriber_id
+"""
+
+CREATE_FLAT_SQL = """
+    INSERT INTO "houses_flats" (address_house_id, flat)
+    VALUES ($1, $2)
+    RETURNING house_flat_id
+"""
+
+CHANGE_FLAT_ID_SQL = """
+    UPDATE "houses_flats_subscribers"
+    SET house_flat_id = $1
+    WHERE house_subscriber_id = ANY($2)
+"""
+
+UPDATE_MANUAL_BLOCK_SQL = "UPDATE houses_flats SET manual_block = $1 WHERE house_flat_id = $2"
+
+
+async def get_number_from_rbt(house_sub_id, rbt):
+    """Получение номера из RBT по house_sub_id."""
+    return await rbt.fetch(SUBSCRIBER_MOBILE_IDS_SQL, house_sub_id)
+
+
+async def get_number_rbt(flat_and_house_id: dict, rbt) -> List[RBT_phone]:
+    """Получение номера RBT по flat_and_house_id."""
+    result = await rbt.fetch(
+        FLAT_SUBSCRIBER_PHONES_SQL,
+        flat_and_house_id["flat_id"],
+        flat_and_house_id["house_id"],
+    )
+
+    return [
+        RBT_phone(
+            house_subscriber_id=flat_and_house_id["house_id"],
+            flat_id=flat_and_house_id["flat_id"],
+            role=row["role"],
+            name=row["subscriber_name"],
+            phone=row["id"],
+            patronymic=row["subscriber_patronymic"],
+        )
+        for row in result
+    ]
+
+
+async def get_numbers_rbt(flat_id: int, rbt) -> List[RBT_phone]:
+    """Получение списка номеров RBT по flat_id."""
+    result = await rbt.fetch(FLAT_PHONES_SQL, flat_id)
+
+    return [
+        RBT_phone(
+            house_subscriber_id=row["house_subscriber_id"],
+            flat_id=flat_id,
+            role=row["role"],
+            name=row["subscriber_name"],
+            phone=row["id"],
+            patronymic=row["subscriber_patronymic"],
+        )
+        for row in result
+    ]
+
+
+async def get_flats(house_id: int, rbt):
+    """Получение квартир по house_id."""
+    result = await rbt.fetch(SUBSCRIBER_FLATS_SQL, house_id)
+
+    return [
+        {"flat_id": row["house_flat_id"], "house_id": row["house_subscriber_id"]}
+        for row in result
+    ]
+
+
+async def get_flats_by_subscriber_ids(house_ids: List[int], rbt) -> List[Dict]:
+    """Получение квартир сразу для нескольких house_id."""
+    if not house_ids:
+        return []
+
+    result = await rbt.fetch(SUBSCRIBERS_FLATS_SQL, house_ids)
+
+    return [
+        {"flat_id": row["house_flat_id"], "house_id": row["house_subscriber_id"]}
+        for row in result
+    ]
+
+
+async def get_flats_by_ids(flat_ids: List[int], rbt) -> Dict[int, Optional[str]]:
+    """Получение номеров квартир по списку flatId.
+
+    В результат попадают только квартиры, которые есть в RBT.
+    """
+    if not flat_ids:
+        return {}
+
+    result = await rbt.fetch(FLATS_BY_IDS_SQL, flat_ids)
+
+    return {row["house_flat_id"]: row["flat"] for row in result}
+
+
+async def get_flat_from_RBT_by_flatId(flatId: int, rbt):
+    """Получение данных квартиры из RBT по flatId."""
+    return await rbt.fetch(FLAT_BY_ID_SQL, flatId)
+
+
+async def get_house_id_by_uuid2(uuid2: str, rbt):
+    """Получение house_id по uuid2."""
+    return await rbt.fetchval(HOUSE_ID_BY_UUID2_SQL, uuid2)
+
+
+async def get_flat_from_RBT_by_house_id_and_flat(flat: str, house_id: int, rbt):
+    """Получение flat_id по адресу квартиры и house_id."""
+    return await rbt.fetchval(FLAT_ID_BY_HOUSE_AND_FLAT_SQL, flat, house_id)
+
+
+async def get_house_subscriber_ids_to_relocate_by_phones(phones: List[str], rbt):
+    """Получение house_subscriber_id для переезда по списку телефонов."""
+    return await rbt.fetch(SUBSCRIBER_IDS_BY_PHONES_SQL, phones)
+
+
+async def get_houses_flats_subscribers_by_flat_id(flat_id: int, rbt):
+    """Получение количества подписчиков по flat_id."""
+    return await rbt.fetchval(FLAT_COUNT_SQL, flat_id)
+
+
+async def get_RBT_aps_settings(flat_id: int, rbt):
+    """Получение настроек RBT по flat_id."""
+    try:
+        record = await rbt.fetchrow(APS_SETTINGS_SQL, flat_id)
+
+        if record:
+            # Правильное преобразование asyncpg Record в словарь
+            data = dict(record)
+            return RBTApsSettings.model_validate(data)
+
+        return None
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Error fetching data from RBT: {str(e)}"
+        ) from e
+
+
+async def get_RBT_token(flat_id: int, rbt) -> str:
+    """Получение токена RBT по flat_id."""
+    token = await rbt.fetchval(RBT_TOKEN_SQL, flat_id)
+    if not token:
+        raise ValueError(f"Токен для flat_id {flat_id} не найден")
+    return token
+
+
+async def change_RBT_role(
+    house_id: int, flat_id: int, role: int, rbt
+) -> StatusResponse:
+    """Изменение роли в RBT."""
+    try:
+        async with rbt.transaction():
+            result = await rbt.fetchval(CHANGE_ROLE_SQL, role, house_id, flat_id)
+
+            if result is None:
+                raise HTTPException(status_code=404, detail="Запись не найдена")
+            return StatusResponse(
+                status="success",
+            )
+
+    except HTTPException as http_exc:
+        raise http_exc
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Произошла ошибка при изменении роли: {str(e)}"
+        ) from e
+
+
+async def delete_from_houses_flats_subscribers(
+    house_id: int, flat_id: int, rbt
+) -> StatusResponse:
+    """Удаление записи из houses_flats_subscribers."""
+    try:
+        async with rbt.transaction():
+            result = await rbt.fetchval(DELETE_FLAT_SUBSCRIBER_SQL, house_id, flat_id)
+            if result is None:
+                raise HTTPException(status_code=404, detail="Запись не найдена")
+            return StatusResponse(
+                status="deleted",
+            )
+
+    except HTTPException as http_exc:
+        raise http_exc
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Произошла ошибка при удалении записи: {str(e)}"
+        ) from e
+
+
+async def create_new_flat(flat: str, address_house_id: int, rbt):
+    """Создание новой квартиры."""
+    async with rbt.transaction():
+        result = await rbt.fetchval(CREATE_FLAT_SQL, address_house_id, flat)
+
+    return result
+
+
+async def change_flat_id_in_RBT(house_ids: List[int], new_flat_id: int, rbt):
+    """Изменение flat_id в RBT для списка домов."""
+    async with rbt.transaction():
+        await rbt.execute(CHANGE_FLAT_ID_SQL, new_flat_id, house_ids)
+    return {"status": "success"}
+
+
+async def update_manual_block(flat_id: int, value: bool, rbt) -> bool:
+    """Обновление значения manual_block для указанной квартиры."""
+    try:
+        async with rbt.transaction():
+            # Сначала проверяем текущее значение
+            current = await rbt.fetchval(MANUAL_BLOCK_SQL, flat_id)
+
+            if current is None:
+                raise HTTPException(status_code=404, detail="Квартира не найдена")
+
+            if current == value:
+                return False
+
+            # Обновляем значение
+            await rbt.execute(UPDATE_MANUAL_BLOCK_SQL, value, flat_id)
+
+            return True
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500, detail=f"Ошибка при обновлении manual_block: {str(e)}"
+        ) from e
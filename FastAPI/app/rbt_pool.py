@@ -0,0 +1,112 @@
+"""
+Пул подключений к PostgreSQL RBT.
+
+Пул asyncpg создаётся в lifespan приложения. Соединения берутся из пула
+на время запроса и возвращаются обратно, подготовленные выражения
+кэшируются на уровне соединения. Время ожидания соединения замеряется
+для подбора размера пула.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+import asyncpg
+
+from app import config
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[asyncpg.Pool] = None
+_pool_lock = asyncio.Lock()
+
+_acquire_stats = {
+    "acquires": 0,
+    "timeouts": 0,
+    "wait_total": 0.0,
+    "wait_max": 0.0,
+}
+
+
+async def get_rbt_pool() -> asyncpg.Pool:
+    """Получение общего пула подключений к RBT."""
+    global _pool
+    if _pool is None:
+        async with _pool_lock:
+            if _pool is None:
+                _pool = await asyncpg.create_pool(
+                    host=config.POSTGRES_HOST,
+                    port=config.POSTGRES_PORT,
+                    database=config.POSTGRES_DATABASE,
+                    user=config.POSTGRES_USER,
+                    password=config.POSTGRES_PASSWORD,
+                    min_size=config.RBT_POOL_MIN_SIZE,
+                    max_size=config.RBT_POOL_MAX_SIZE,
+                    max_inactive_connection_lifetime=config.RBT_POOL_MAX_INACTIVE_LIFETIME,
+                    statement_cache_size=config.RBT_STATEMENT_CACHE_SIZE,
+                )
+                logger.info(
+                    "Пул RBT создан (min_size=%s, max_size=%s)",
+                    config.RBT_POOL_MIN_SIZE,
+                    config.RBT_POOL_MAX_SIZE,
+                )
+    return _pool
+
+
+async def acquire_rbt_connection() -> asyncpg.Connection:
+    """Получение соединения из пула с замером времени ожидания."""
+    pool = await get_rbt_pool()
+    started = time.perf_counter()
+    try:
+        connection = await pool.acquire(timeout=config.RBT_POOL_ACQUIRE_TIMEOUT)
+    except asyncio.TimeoutError:
+        _acquire_stats["timeouts"] += 1
+        raise
+    waited = time.perf_counter() - started
+
+    _acquire_stats["acquires"] += 1
+    _acquire_stats["wait_total"] += waited
+    _acquire_stats["wait_max"] = max(_acquire_stats["wait_max"], waited)
+    return connection
+
+
+async def release_rbt_connection(connection: asyncpg.Connection) -> None:
+    """Возврат соединения в пул."""
+    pool = await get_rbt_pool()
+    await pool.release(connection)
+
+
+async def start_rbt_pool() -> None:
+    """Создание пула подключений к RBT."""
+    try:
+        await get_rbt_pool()
+    except Exception as e:
+        # RBT недоступен при старте - пул будет создан при первом запросе
+        logger.error("Не удалось создать пул RBT: %s", e)
+
+
+async def close_rbt_pool() -> None:
+    """Закрытие пула подключений к RBT."""
+    global _pool
+    if _pool is not None:
+        try:
+            await _pool.close()
+        except Exception as e:
+            logger.error("Ошибка закрытия пула RBT: %s", e)
+        _pool = None
+
+
+def get_rbt_pool_stats() -> dict:
+    """Статистика пула RBT для мониторинга."""
+    acquires = _acquire_stats["acquires"]
+    return {
+        "min_size": config.RBT_POOL_MIN_SIZE,
+        "max_size": config.RBT_POOL_MAX_SIZE,
+        "size": _pool.get_size() if _pool is not None else 0,
+        "idle": _pool.get_idle_size() if _pool is not None else 0,
+        "acquires": acquires,
+        "timeouts": _acquire_stats["timeouts"],
+        "wait_avg_ms": _acquire_stats["wait_total"] / acquires * 1000 if acquires else 0.0,
+        "wait_max_ms": _acquire_stats["wait_max"] * 1000,
+    }
@@ -0,0 +1,232 @@
+"""
+Создание и перестроение индексов RediSearch.
+
+Для каждого индекса из redis_schema создаёт физический индекс текущей
+схемы, ждёт окончания индексации, переключает на него псевдоним и удаляет
+предыдущий индекс без документов. Повторный запуск ничего не меняет.
+
+Запуск:
+    python -m app.redis_migrate [--replace-legacy] [--dry-run]
+    python -m app.redis_migrate --benchmark [--docs N] [--runs N]
+
+--replace-legacy удаляет индекс, созданный раньше под именем псевдонима
+(idx:client и т.п.), и ставит на его место псевдоним. Между удалением и
+созданием псевдонима поиск по этому индексу недоступен, дальше перестроения
+идут без простоя.
+
+--benchmark создаёт индексы той же схемы по синтетическим документам с
+префиксом bench:, замеряет формы запросов из crud и удаляет индексы вместе
+с документами.
+"""
+
+import argparse
+import logging
+import statistics
+import time
+from typing import List, Optional
+
+import redis
+from redis.exceptions import ResponseError
+
+from app import config
+from app.redis_schema import (
+    CAMERA_INDEX,
+    CLIENT_INDEX,
+    FAILURE_INDEX,
+    SEARCH_INDEXES,
+    SEARCH_LOGIN_INDEX,
+    SearchIndex,
+)
+from app.redis_search import build_query
+
+logger = logging.getLogger(__name__)
+
+INDEXING_TIMEOUT = 600
+BENCH_PREFIX = "bench:"
+
+
+def get_client() -> redis.Redis:
+    """Клиент Redis для миграции."""
+    return redis.Redis(
+        host=config.REDIS_HOST or "localhost",
+        port=config.REDIS_PORT,
+        password=config.REDIS_PASSWORD,
+        decode_responses=True,
+    )
+
+
+def index_info(client: redis.Redis, name: str) -> Optional[dict]:
+    """FT.INFO индекса или псевдонима, None если его нет."""
+    try:
+        return client.ft(name).info()
+    except ResponseError as e:
+        if "unknown index" in str(e).lower() or "no such index" in str(e).lower():
+            return None
+        raise
+
+
+def wait_indexed(client: redis.Redis, name: str, timeout: float = INDEXING_TIMEOUT) -> None:
+    """Ожидание окончания индексации существующих документов."""
+    deadline = time.monotonic() + timeout
+    while True:
+        info = index_info(client, name)
+        if info is not None and str(info.get("indexing", "0")) == "0":
+            return
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"Индексация {name} не закончилась за {timeout} с")
+        time.sleep(1)
+
+
+def _run(client: Optional[redis.Redis], args: List[str], dry_run: bool) -> None:
+    logger.info("%s", " ".join(args))
+    if not dry_run:
+        client.execute_command(*args)
+
+
+def apply_index(
+    client: Optional[redis.Redis], index: SearchIndex, replace_legacy: bool = False, dry_run: bool = False
+) -> None:
+    """Создание индекса текущей схемы и переключение на него псевдонима."""
+    if dry_run:
+        _run(client, index.create_args(), dry_run)
+        _run(client, ["FT.ALIASUPDATE", index.alias, index.name], dry_run)
+        return
+
+    current = index_info(client, index.alias)
+    current_name = current["index_name"] if current else None
+    if current_name == index.name:
+        logger.info("%s -> %s актуален", index.alias, index.name)
+        return
+
+    # Индекс с именем псевдонима создан до появления схемы в приложении
+    legacy = current_name == index.alias
+    if legacy and not replace_legacy:
+        logger.error("%s - индекс, а не псевдоним; запустите с --replace-legacy", index.alias)
+        return
+
+    if index_info(client, index.name) is None:
+        _run(client, index.create_args(), dry_run)
+    wait_indexed(client, index.name)
+
+    if legacy:
+        _run(client, ["FT.DROPINDEX", index.alias], dry_run)
+        _run(client, ["FT.ALIASADD", index.alias, index.name], dry_run)
+    else:
+        _run(client, ["FT.ALIASUPDATE", index.alias, index.name], dry_run)
+        if current_name is not None:
+            _run(client, ["FT.DROPINDEX", current_name], dry_run)
+
+
+def migrate(client: Optional[redis.Redis], replace_legacy: bool = False, dry_run: bool = False) -> None:
+    """Применение всех индексов."""
+    for index in SEARCH_INDEXES:
+        apply_index(client, index, replace_legacy=replace_legacy, dry_run=dry_run)
+
+
+def _bench_name(index: SearchIndex) -> str:
+    return BENCH_PREFIX + index.alias
+
+
+def _fill_bench_data(client: redis.Redis, docs: int) -> None:
+    pipe = client.pipeline(transaction=False)
+    for i in range(docs):
+        pipe.json().set(f"{BENCH_PREFIX}login:user{i}", "$", {
+            "login": f"user{i}",
+            "flatId": i // 3,
+            "hostId": i % 1000,
+            "addressCodes": [i % 500],
+            "contract": str(100000 + i),
+            "name": f"Иванов Иван {i}",
+            "address": f"ул. Ленина, д. {i % 500}, кв. {i % 300}",
+            "servicecats": {"internet": {"timeto": 1700000000 + i}},
+        })
+        if i % 10 == 0:
+            pipe.json().set(f"{BENCH_PREFIX}camera:{i}", "$", {
+                "Id": i,
+                "Name": f"Камера {i}",
+                "CamType": "Личная" if i % 20 else "Общая",
+                "flatIds": [i // 3, i // 3 + 1],
+                "houseIds": [i % 500],
+                "IP": "10.0.0.1",
+                "Host": "flussonic",
+            })
+        if i % 100 == 0:
+            pipe.json().set(f"{BENCH_PREFIX}failure:{i}", "$", [
+                {"host": i, "address": i % 500, "reason": "Авария"},
+            ])
+        if len(pipe) >= 1000:
+            pipe.execute()
+    pipe.execute()
+
+
+def benchmark(client: redis.Redis, docs: int, runs: int) -> None:
+    """Замер форм запросов из crud на синтетических данных."""
+    indexes = (CLIENT_INDEX, CAMERA_INDEX, FAILURE_INDEX, SEARCH_LOGIN_INDEX)
+    for index in indexes:
+        bench_prefixes = tuple(BENCH_PREFIX + prefix for prefix in index.prefixes)
+        client.execute_command(*index.create_args(_bench_name(index), bench_prefixes))
+    try:
+        _fill_bench_data(client, docs)
+        for index in indexes:
+            wait_indexed(client, _bench_name(index))
+
+        flat_ids = " | ".join(f"@flatId:[{flat_id} {flat_id}]" for flat_id in range(100, 110))
+        shapes = [
+            ("логины квартиры", CLIENT_INDEX, build_query("@flatId:[100 100]", 0, 1000, no_content=True)),
+            ("логины 10 квартир", CLIENT_INDEX, build_query(flat_ids, 0, 1000, no_content=True)),
+            ("камеры квартиры", CAMERA_INDEX, build_query(
+                "@CamType:{Личная} @flatIds:[100 100]", 0, 1000, no_content=True)),
+            ("камеры дома", CAMERA_INDEX, build_query(
+                "@CamType:{Личная} (@houseIds:[100 100])", 0, 1000, no_content=True)),
+            ("авария по host", FAILURE_INDEX, build_query("@host:[100 100]", 0, 1)),
+            ("авария по address", FAILURE_INDEX, build_query("@address:[100 100]", 0, 1)),
+            ("логины под аварией", CLIENT_INDEX, build_query(
+                "@hostId:[100 100] | @addressCodes:[100 100]", 0, 1000, no_content=True)),
+            ("поиск логина", SEARCH_LOGIN_INDEX, build_query(
+                "user100 | USER100 | User100", 0, config.SEARCH_LOGINS_LIMIT,
+                return_fields=("login", "name", "contract", "address"))),
+        ]
+        for title, index, query in shapes:
+            timings = []
+            for _ in range(runs):
+                started = time.perf_counter()
+                result = client.ft(_bench_name(index)).search(query)
+                timings.append((time.perf_counter() - started) * 1000)
+            timings.sort()
+            logger.info(
+                "%-20s найдено %6s  p50 %7.3f мс  p95 %7.3f мс",
+                title, result.total, statistics.median(timings), timings[int(len(timings) * 0.95) - 1],
+            )
+    finally:
+        for index in indexes:
+            try:
+                client.execute_command("FT.DROPINDEX", _bench_name(index), "DD")
+            except ResponseError as e:
+                logger.error("Ошибка удаления %s: %s", _bench_name(index), e)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Индексы RediSearch")
+    parser.add_argument("--replace-legacy", action="store_true", help="заменить индексы без псевдонимов")
+    parser.add_argument("--dry-run", action="store_true", help="только вывести команды")
+    parser.add_argument("--benchmark", action="store_true", help="замерить запросы на синтетических данных")
+    parser.add_argument("--docs", type=int, default=100000, help="количество логинов для замера")
+    parser.add_argument("--runs", type=int, default=200, help="повторов каждого запроса")
+    args = parser.parse_args()
+    if args.benchmark and args.dry_run:
+        parser.error("--benchmark нельзя запустить с --dry-run")
+
+    logging.basicConfig(level=logging.INFO)
+    client = None if args.dry_run else get_client()
+    try:
+        if args.benchmark:
+            benchmark(client, args.docs, args.runs)
+        else:
+            migrate(client, replace_legacy=args.replace_legacy, dry_run=args.dry_run)
+    finally:
+        if client is not None:
+            client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Общий пул подключений к Redis.
+
+Пул создаётся один раз в lifespan приложения, клиенты Redis для запросов
+берут соединения из него. Статистика пула доступна для мониторинга.
+"""
+
+import asyncio
+import logging
+from typing import Optional
+
+from redis.asyncio import BlockingConnectionPool, Redis
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app import config
+
+logger = logging.getLogger(__name__)
+
+
+class InstrumentedConnectionPool(BlockingConnectionPool):
+    """Блокирующий пул соединений Redis со счётчиками ожиданий."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.waits = 0
+        self.timeouts = 0
+
+    async def get_connection(self, command_name, *keys, **options):
+        if not self.can_get_connection():
+            self.waits += 1
+        try:
+            return await super().get_connection(command_name, *keys, **options)
+        except RedisConnectionError as err:
+            if isinstance(err.__cause__, asyncio.TimeoutError):
+                self.timeouts += 1
+            raise
+
+    def stats(self) -> dict:
+        """Текущее состояние пула."""
+        return {
+            "max_size": self.max_connections,
+            "in_use": len(self._in_use_connections),
+            "idle": len(self._available_connections),
+            "waits": self.waits,
+            "timeouts": self.timeouts,
+        }
+
+
+_pool: Optional[InstrumentedConnectionPool] = None
+
+
+def get_redis_pool() -> InstrumentedConnectionPool:
+    """Получение общего пула подключений к Redis."""
+    global _pool
+    if _pool is None:
+        _pool = InstrumentedConnectionPool(
+            host=config.REDIS_HOST or "localhost",
+            port=config.REDIS_PORT,
+            password=config.REDIS_PASSWORD,
+            max_connections=config.REDIS_POOL_MAX_SIZE,
+            timeout=config.REDIS_POOL_TIMEOUT,
+            health_check_interval=config.REDIS_HEALTH_CHECK_INTERVAL,
+            socket_timeout=config.REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=config.REDIS_SOCKET_CONNECT_TIMEOUT,
+            socket_keepalive=True,
+        )
+        logger.info("Пул Redis создан (max_size=%s)", config.REDIS_POOL_MAX_SIZE)
+    return _pool
+
+
+def get_redis_client() -> Redis:
+    """Клиент Redis поверх общего пула."""
+    return Redis(connection_pool=get_redis_pool())
+
+
+async def start_redis_pool() -> None:
+    """Создание пула подключений к Redis."""
+    get_redis_pool()
+
+
+async def close_redis_pool() -> None:
+    """Закрытие всех соединений пула Redis."""
+    global _pool
+    if _pool is not None:
+        try:
+            await _pool.aclose()
+        except Exception as e:
+            logger.error("Ошибка закрытия пула Redis: %s", e)
+        _pool = None
+
+
+def get_redis_pool_stats() -> dict:
+    """Статистика пула Redis для мониторинга."""
+    if _pool is None:
+        return {"max_size": config.REDIS_POOL_MAX_SIZE, "in_use": 0, "idle": 0, "waits": 0, "timeouts": 0}
+    return _pool.stats()
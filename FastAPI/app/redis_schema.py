@@ -0,0 +1,87 @@
+"""
+Индексы RediSearch, по которым ищет приложение.
+
+Каждый индекс строится по JSON-документам и содержит только поля, которые
+участвуют в условиях запросов из crud. Поля, которые запросы только
+возвращают, не индексируются: RETURN и JSON.GET читают их из документа.
+Типы совпадают с синтаксисом запросов: @flatId:[x x] - NUMERIC,
+@CamType:{...} - TAG, поиск логинов по словам - TEXT.
+
+Приложение обращается к индексам по псевдонимам (idx:client, ...).
+Физический индекс называется <псевдоним>:<хэш схемы>, поэтому изменение
+схемы создаёт новый индекс рядом со старым. Псевдоним переключается на
+новый индекс после окончания индексации, старый удаляется без документов -
+поиск не прерывается. Применяется командой python -m app.redis_migrate.
+"""
+
+import hashlib
+from typing import List, NamedTuple, Optional, Tuple
+
+
+class SearchIndex(NamedTuple):
+    """Определение индекса RediSearch по JSON-документам."""
+
+    alias: str
+    prefixes: Tuple[str, ...]
+    schema: Tuple[Tuple[str, ...], ...]
+
+    @property
+    def name(self) -> str:
+        """Имя физического индекса для текущей схемы."""
+        digest = hashlib.sha1(repr((self.prefixes, self.schema)).encode()).hexdigest()[:8]
+        return f"{self.alias}:{digest}"
+
+    def create_args(self, name: Optional[str] = None, prefixes: Optional[Tuple[str, ...]] = None) -> List[str]:
+        """Аргументы FT.CREATE."""
+        prefixes = prefixes or self.prefixes
+        args = ["FT.CREATE", name or self.name, "ON", "JSON", "PREFIX", str(len(prefixes)), *prefixes, "SCHEMA"]
+        for field in self.schema:
+            args.extend(field)
+        return args
+
+
+# Логины: get_logins_by_flatId_redis, get_logins_from_redis, логины под аварией
+CLIENT_INDEX = SearchIndex(
+    alias="idx:client",
+    prefixes=("login:",),
+    schema=(
+        ("$.flatId", "AS", "flatId", "NUMERIC"),
+        ("$.hostId", "AS", "hostId", "NUMERIC"),
+        ("$.addressCodes[*]", "AS", "addressCodes", "NUMERIC"),
+    ),
+)
+
+# Камеры: get_cameras_from_redis
+CAMERA_INDEX = SearchIndex(
+    alias="idx:camera",
+    prefixes=("camera:",),
+    schema=(
+        ("$.CamType", "AS", "CamType", "TAG"),
+        ("$.flatIds[*]", "AS", "flatIds", "NUMERIC"),
+        ("$.houseIds[*]", "AS", "houseIds", "NUMERIC"),
+    ),
+)
+
+# Аварии: find_failure_by_login. Документ - список аварий
+FAILURE_INDEX = SearchIndex(
+    alias="idx:failure",
+    prefixes=("failure:",),
+    schema=(
+        ("$[*].host", "AS", "host", "NUMERIC"),
+        ("$[*].address", "AS", "address", "NUMERIC"),
+    ),
+)
+
+# Поиск логинов по словам: search_logins
+SEARCH_LOGIN_INDEX = SearchIndex(
+    alias="idx:searchLogin",
+    prefixes=("login:",),
+    schema=(
+        ("$.login", "AS", "login", "TEXT", "NOSTEM", "WEIGHT", "2"),
+        ("$.contract", "AS", "contract", "TEXT", "NOSTEM", "WEIGHT", "2"),
+        ("$.name", "AS", "name", "TEXT"),
+        ("$.address", "AS", "address", "TEXT"),
+    ),
+)
+
+SEARCH_INDEXES = (CLIENT_INDEX, CAMERA_INDEX, FAILURE_INDEX, SEARCH_LOGIN_INDEX)
@@ -0,0 +1,144 @@
+"""
+Поиск по индексам RediSearch.
+
+Запрос без параметров возвращает не больше 10 документов целиком. Здесь
+search - одна страница с явным LIMIT и при необходимости RETURN: для
+запросов, которым нужны первые N результатов по релевантности. SORTBY не
+используется, поэтому поля индексов не объявляются SORTABLE.
+
+Весь результат читает iter_search_keys - ключи курсором FT.AGGREGATE,
+документы затем читаются по странице ключей (см. crud.search_json_documents).
+Страницы FT.SEARCH по смещению при добавлении или удалении документа во
+время обхода сдвигаются, давая пропуски и повторы, и обрываются на
+MAXSEARCHRESULTS. Курсор этих проблем не имеет.
+
+Поля из RETURN приходят от RediSearch строками. Массивы и объекты
+разбираются из JSON, скалярные значения остаются строками: числа и
+логические значения приводит к типу модель или вызывающий код.
+"""
+
+import logging
+from typing import Any, AsyncIterator, List, NamedTuple, Optional, Sequence
+
+from redis.commands.search.aggregation import AggregateRequest, Cursor
+from redis.commands.search.query import Query
+
+from app import config
+from app.decoding import doc_json, loads
+
+logger = logging.getLogger(__name__)
+
+
+class SearchDocument(NamedTuple):
+    """Документ из результата поиска."""
+
+    id: str
+    data: Any
+
+
+class SearchPage(NamedTuple):
+    """Страница результата поиска."""
+
+    total: int
+    docs: List[SearchDocument]
+
+
+def build_query(
+    query: str,
+    offset: int,
+    limit: int,
+    return_fields: Optional[Sequence[str]] = None,
+    no_content: bool = False,
+) -> Query:
+    """Запрос RediSearch с LIMIT, RETURN и NOCONTENT."""
+    search_query = Query(query).paging(offset, limit)
+    if no_content:
+        search_query.no_content()
+    elif return_fields:
+        for field in return_fields:
+            search_query.return_field(f"$.{field}", as_field=field)
+    return search_query
+
+
+def _decode_field(value: Any) -> Any:
+    if isinstance(value, str) and value[:1] in ("[", "{"):
+        try:
+            return loads(value)
+        except ValueError:
+            pass
+    return value
+
+
+def _to_document(doc, return_fields: Optional[Sequence[str]], no_content: bool) -> SearchDocument:
+    if no_content:
+        return SearchDocument(doc.id, None)
+    if not return_fields:
+        return SearchDocument(doc.id, doc_json(doc))
+    # Отсутствующие в документе поля не попадают в ответ
+    fields = vars(doc)
+    return SearchDocument(
+        doc.id,
+        {field: _decode_field(fields[field]) for field in return_fields if field in fields},
+    )
+
+
+async def search(
+    redis,
+    index: str,
+    query: str,
+    *,
+    offset: int = 0,
+    limit: int = config.REDIS_SEARCH_PAGE_SIZE,
+    return_fields: Optional[Sequence[str]] = None,
+    no_content: bool = False,
+) -> SearchPage:
+    """Одна страница результата поиска.
+
+    Без return_fields data документа - весь разобранный JSON, иначе dict
+    только с перечисленными полями верхнего уровня. С no_content data - None.
+    """
+    result = await redis.ft(index).search(
+        build_query(query, offset, limit, return_fields, no_content)
+    )
+    return SearchPage(
+        result.total, [_to_document(doc, return_fields, no_content) for doc in result.docs]
+    )
+
+
+def _decode(value: Any) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+async def iter_search_keys(
+    redis,
+    index: str,
+    query: str,
+    *,
+    page_size: int = config.REDIS_SEARCH_PAGE_SIZE,
+) -> AsyncIterator[List[str]]:
+    """Ключи всех документов результата поиска, страницами до page_size ключей."""
+    request = AggregateRequest(query).load("@__key").cursor(count=page_size)
+    result = await redis.ft(index).aggregate(request)
+    cursor: Optional[Cursor] = result.cursor
+    try:
+        while True:
+            keys = []
+            for row in result.rows:
+                # Строка ответа - [имя поля, значение, ...]
+                fields = dict(zip(map(_decode, row[::2]), row[1::2]))
+                if "__key" in fields:
+                    keys.append(_decode(fields["__key"]))
+            if keys:
+                yield keys
+            if not cursor or not cursor.cid:
+                cursor = None
+                return
+            result = await redis.ft(index).aggregate(cursor)
+            cursor = result.cursor
+    finally:
+        # Курсор, брошенный до конца результата, занимает память Redis до MAXIDLE
+        if cursor and cursor.cid:
+            try:
+                await redis.execute_command("FT.CURSOR", "DEL", index, cursor.cid)
+            except Exception as e:
+                logger.warning("Не удалось удалить курсор %s по %s: %s", cursor.cid, index, e)
@@ -2,24 +2,26 @@
 Маршруты для работы с приложением.
 """
 
-import json
+import asyncio
 import time
-from typing import Dict, Optional
+from typing import Dict, Literal, Optional
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
 
+from app.audit import set_audit_details
 from app.crud import (
     get_redis_key_data,
     get_logins_by_flatId_redis,
-    get_flat_from_RBT_by_flatId,
-    get_houses_flats_subscribers_by_flat_id,
-    get_numbers_rbt,
-    get_flats,
     get_logins_from_redis,
+    change_flat_in_1C,
+)
+from app.rbt_crud import (
+    get_flats_by_ids,
+    get_flats_by_subscriber_ids,
+    get_numbers_rbt,
     change_RBT_role,
     delete_from_houses_flats_subscribers,
     create_new_flat,
-    change_flat_in_1C,
     get_house_subscriber_ids_to_relocate_by_phones,
     change_flat_id_in_RBT,
     get_flat_from_RBT_by_house_id_and_flat,
@@ -64,24 +66,33 @@ async def get_connection_data(
 
         address_in_the_app = redis_data.get("address", "Неизвестно")
 
-        logins_list = await get_logins_by_flatId_redis(flat_id, redis)
+        # Логины квартиры (Redis) и телефоны квартиры (RBT) не зависят друг от друга
+        logins_data, rbt_phones = await asyncio.gather(
+            get_logins_by_flatId_redis(flat_id, redis),
+            get_numbers_rbt(flat_id, rbt),
+        )
+
+        # Квартиры всех телефонов одним запросом
+        house_ids = list({rbt_phone.house_subscriber_id for rbt_phone in rbt_phones})
+        phones_flats = await get_flats_by_subscriber_ids(house_ids, rbt)
+
+        # Квартиры из RBT для всех логинов и договоры всех телефонов одним поиском
+        flat_ids = list({data.get("flatId") for data in logins_data if data.get("flatId")})
+        flats_from_RBT, phones_logins_data = await asyncio.gather(
+            get_flats_by_ids(flat_ids, rbt),
+            get_logins_from_redis(phones_flats, redis),
+        )
+
         contracts = []
-        for doc in logins_list:
+        for data in logins_data:
             try:
-                data = json.loads(doc.json)
                 flat = data.get("flat", "1")
                 flatId = data.get("flatId")
-                flat_from_RBT = await get_flat_from_RBT_by_flatId(flatId, rbt)
-                flat_from_RBT_value = (
-                    flat_from_RBT[0]["flat"] if flat_from_RBT[0]["flat"] is not None else False
-                )
-
-                house_flat_subscribers = await get_houses_flats_subscribers_by_flat_id(
-                    flatId, rbt
-                )
+                flat_from_RBT = flats_from_RBT.get(flatId)
+                flat_from_RBT_value = flat_from_RBT if flat_from_RBT is not None else False
                 is_relocatable = (
                     str(flat)
-                    if (str(flat) != flat_from_RBT_value) or house_flat_subscribers == 0
+                    if (str(flat) != flat_from_RBT_value) or flatId not in flats_from_RBT
                     else None
                 )
 
@@ -114,12 +125,15 @@ async def get_connection_data(
             except Exception as e:
                 raise HTTPException(status_code=500, detail=f"Ошибка обработки данных логина: {e}")
 
-        rbt_phones = await get_numbers_rbt(flat_id, rbt)
+        # Группировка договоров по телефонам
+        phone_flat_ids: Dict[int, set] = {}
+        for phone_flat in phones_flats:
+            phone_flat_ids.setdefault(phone_flat["house_id"], set()).add(phone_flat["flat_id"])
+
         phones = []
         for rbt_phone in rbt_phones:
             try:
-                flats = await get_flats(rbt_phone.house_subscriber_id, rbt)
-                redis_logins = await get_logins_from_redis(flats, redis)
+                flats = phone_flat_ids.get(rbt_phone.house_subscriber_id, set())
                 redis_contracts = [
                     RedisLogin(
                         house_id=rbt_phone.house_subscriber_id,
@@ -128,8 +142,8 @@ async def get_connection_data(
                         address=data.get("address", "Неизвестно"),
                         contract=data.get("contract", "Неизвестно"),
                     )
-                    for login in redis_logins
-                    for data in [json.loads(login.json)]
+                    for data in phones_logins_data
+                    if data.get("flatId") in flats
                 ]
 
                 phones.append(Phone(**rbt_phone.dict(), contracts=redis_contracts))
@@ -154,8 +168,10 @@ async def change_role_in_RBT(
     token: TokenDependency,
     request: ChangeRoleRequest,
     rbt: RBTDependency,
+    http_request: Request,
 ):
     """Эндпоинт для изменения роли пользователя в RBT"""
+    set_audit_details(http_request, **request.model_dump())
     try:
         return await change_RBT_role(
             request.house_id, request.flat_id, request.role, rbt
@@ -164,15 +180,32 @@ async def change_role_in_RBT(
         raise HTTPException(status_code=500, detail=f"Ошибка изменения роли: {e}") from e
 
 
+# Действия журнала для отвязки, как их записывал фронтенд
+UNLINK_ACTIONS = {
+    "phone": "Кнопка отвязать (Телефон на адресе)",
+    "contract": "Кнопка отвязать (Договор на телефоне)",
+}
+
+
 @router.delete(
     "/v1/app/houses_flats_subscribers/{house_id}/{flat_id}",
     response_model=StatusResponse,
     tags=["Приложение"],
 )
 async def delete_user_from_houses_flats_subscribers_RBT(
-    house_id: int, flat_id: int, rbt: RBTDependency, token: TokenDependency
+    house_id: int,
+    flat_id: int,
+    rbt: RBTDependency,
+    token: TokenDependency,
+    http_request: Request,
+    target: Optional[Literal["phone", "contract"]] = Query(None),
 ):
-    """Эндпоинт для удаления пользователя из houses_flats_subscribers в RBT"""
+    """Эндпоинт для удаления пользователя из houses_flats_subscribers в RBT.
+
+    target - что отвязывается, для журнала действий: телефон от адреса или
+    договор от телефона.
+    """
+    set_audit_details(http_request, UNLINK_ACTIONS.get(target), house_id=house_id, flat_id=flat_id)
     try:
         return await delete_from_houses_flats_subscribers(house_id, flat_id, rbt)
     except HTTPException:
@@ -183,9 +216,10 @@ async def delete_user_from_houses_flats_subscribers_RBT(
 
 @router.patch("/v1/app/relocate", response_model=StatusResponse, tags=["Приложение"])
 async def relocate_users(
-    request: RelocateRequest, rbt: RBTDependency, token: TokenDependency
+    request: RelocateRequest, rbt: RBTDependency, token: TokenDependency, http_request: Request
 ):
     """Эндпоинт для переселения пользователя в новую квартиру"""
+    set_audit_details(http_request, **request.model_dump())
     try:
         flat_id = await get_flat_from_RBT_by_house_id_and_flat(
             request.flat, request.address_house_id, rbt
@@ -4,7 +4,6 @@
 
 import asyncio
 import logging
-import aiohttp
 from fastapi import APIRouter, HTTPException, Query
 from typing import Dict, Optional
 from app import config
@@ -16,6 +15,7 @@ from app.crud import (
     get_tvip_data,
 )
 from app.depencies import TokenDependency
+from app.http_clients import TV_FIX, get_http_client
 from app.schemas import (
     # FailureDetail,
     Service1C,
@@ -403,19 +403,17 @@ async def call_correct_tv_api(login: str, operator: str, response_data) -> dict:
     headers = {"Content-Type": "application/json"}
 
     try:
-        async with aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=config.EXTERNAL_API_TIMEOUT)
-        ) as session:
-            async with session.post(url or '', json=payload, headers=headers) as response:
-                if response.status == 200:
-                    return {"status": "success", "message": "Синхронизация статусов запущена"}
-                else:
-                    error_text = await response.text()
-                    return {
-                        "status": "error",
-                        "message": f"Ошибка: {response.reason or 'Не удалось запустить синхронизацию'}",
-                        "error_details": error_text,
-                    }
+        session = get_http_client(TV_FIX)
+        async with session.post(url or '', json=payload, headers=headers) as response:
+            if response.status == 200:
+                return {"status": "success", "message": "Синхронизация статусов запущена"}
+            else:
+                error_text = await response.text()
+                return {
+                    "status": "error",
+                    "message": f"Ошибка: {response.reason or 'Не удалось запустить синхронизацию'}",
+                    "error_details": error_text,
+                }
     except asyncio.TimeoutError:
         return {"status": "error", "message": "Таймаут при обращении к API исправления ТВ"}
     except Exception as e:
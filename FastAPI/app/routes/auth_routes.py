@@ -3,9 +3,10 @@
 """
 
 from fastapi import APIRouter, HTTPException
-from sqlalchemy import select
+from sqlalchemy import delete, select
 
-from app.auth import verify_password, hash_password
+from app.auth import verify_password, hash_password, needs_rehash
+from app.auth_cache import principal_cache
 from app.crud import add_item
 from app.depencies import SessionDependency, TokenDependency
 from app.schemas import CreateUser, Login, LoginResponse, StatusResponse
@@ -26,6 +27,10 @@ async def login_user_v1(login_data: Login, session: SessionDependency):  # type:
         if not await verify_password(login_data.password, user_model.password):
             raise HTTPException(status_code=401, detail="Неверное имя или пароль")
 
+        # Перехэширование пароля, если изменилась стоимость bcrypt
+        if needs_rehash(user_model.password):
+            user_model.password = await hash_password(login_data.password)
+
         token = Token(user_id=user_model.id)
         token = await add_item(session, token)
         return {'token': token.token}  # type: ignore
@@ -42,6 +47,18 @@ async def login_user(token: TokenDependency):
         raise HTTPException(status_code=500, detail=f"Ошибка проверки токена: {str(e)}") from e
 
 
+@router.post('/v1/logout', response_model=StatusResponse, tags=["Авторизация"])
+async def logout_user(token: TokenDependency, session: SessionDependency):  # type: ignore
+    """Эндпоинт для выхода пользователя."""
+    try:
+        await session.execute(delete(Token).where(Token.token == token.token))
+        await session.commit()
+        principal_cache.invalidate_token(token.token)
+        return {'status': 'success'}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Ошибка при выходе: {str(e)}") from e
+
+
 @router.post('/v1/reg', response_model=StatusResponse, tags=["Авторизация"])
 async def create_user(user_data: CreateUser, session: SessionDependency):  # type: ignore
     """Эндпоинт для регистрации пользователя."""
@@ -5,8 +5,9 @@
 import asyncio
 from typing import Optional, Dict, Any
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
 
+from app.audit import set_audit_details
 from app.depencies import TokenDependency, RedisDependency
 from app.schemas import CameraDataToChange, StatusResponse
 from app.crud import (
@@ -102,8 +103,14 @@ async def camera_update(
     camera_id: int,
     camera_data: CameraDataToChange,
     token: TokenDependency,
+    request: Request,
+    login: Optional[str] = Query(None),
 ):
-    """Эндпоинт для обновления данных камеры"""
+    """Эндпоинт для обновления данных камеры.
+
+    login - абонент, со страницы которого изменяется камера, для журнала действий.
+    """
+    set_audit_details(request, **camera_data.model_dump())
     try:
         response_data = await camera_update_1c(camera_id, camera_data)
         if isinstance(response_data, dict):
@@ -1,14 +1,18 @@
+import asyncio
 from typing import Dict, List, Optional
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, WebSocket, WebSocketDisconnect, status
 
+from app import config
+from app.actions_feed import actions_feed
+from app.auth_cache import get_principal
+from app.clickhouse_writer import action_log_writer
 from app.crud import (
     add_item,
-    get_item,
+    get_login_action_counts_from_clickhouse,
+    get_login_actions_from_clickhouse,
     get_login_data,
     get_schema_from_redis,
-    get_last_actions_from_clickhouse,
-    log_to_clickhouse,
     search_logins,
 )
 from app.depencies import (
@@ -19,13 +23,14 @@ from app.depencies import (
 )
 from app.schemas import (
     Action,
+    ActionsPage,
     ItemId,
     CreateRole,
     LogData,
     SearchLogins,
     StatusResponse,
 )
-from app.models import User, Role
+from app.models import Role
 
 router = APIRouter()
 
@@ -34,9 +39,7 @@ router = APIRouter()
 async def create_role(role_data: CreateRole, session: SessionDependency, token: TokenDependency):  # type: ignore
     """Эндпоинт для создания новой роли"""
     try:
-        current_user_id = token.user_id
-        current_user = await get_item(session, User, current_user_id)
-        if current_user.role_id != 1:  # type: ignore
+        if token.role_id != 1:
             raise HTTPException(status_code=403, detail="Only admins can create roles")
         
         role = Role(**role_data.dict())
@@ -62,42 +65,23 @@ async def get_search_logins(
 
 
 @router.post('/v1/log', response_model=StatusResponse, tags=["Общие"])
-async def log(
-    session: SessionDependency, # type: ignore
-    clickhouse: ClickhouseDependency,
-    token: TokenDependency, 
-    data: LogData):
-    """Эндпоинт для логирования данных в ClickHouse"""
-    try:
-        current_user_id = token.user_id
-        current_user = await get_item(session, User, current_user_id)
-        
-        user_name = current_user.username # type: ignore
-        login = data.login
-        page = data.page
-        action = data.action
-        success = data.success
-        message = data.message
-        url = data.url
-        payload = data.payload
-        user_id = token.user_id
-
-        try:
-            log_to_clickhouse(
-                clickhouse,
-                user_name=user_name,
-                login=login,
-                page=page,
-                action=action,
-                success=success,
-                message=message,
-                url=url,
-                payload=payload,
-                user_id=user_id
-            )
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Ошибка при логировании в ClickHouse: {e}") from e
+async def log(token: TokenDependency, data: LogData):
+    """Эндпоинт для логирования данных в ClickHouse.
 
+    Запись ставится в буфер и сохраняется в ClickHouse в фоне.
+    """
+    try:
+        action_log_writer.enqueue(
+            user_name=token.username,
+            login=data.login,
+            page=data.page,
+            action=data.action,
+            success=data.success,
+            message=data.message,
+            url=data.url,
+            payload=data.payload,
+            user_id=token.user_id,
+        )
         return {"status": "success"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Ошибка обработки данных для логирования: {str(e)}") from e
@@ -123,10 +107,71 @@ async def get_setions_schema(redis: RedisDependency):
 
 
 @router.get('/v1/last_actioins', response_model=List[Action], tags=["Общие"])
-async def get_last_actions(clickhouse: ClickhouseDependency, token: TokenDependency):
+async def get_last_actions(token: TokenDependency):
     """Эндпоинт для получения последних действий из ClickHouse"""
     try:
-        last_actions = await get_last_actions_from_clickhouse(clickhouse)
-        return last_actions
+        return await actions_feed.get_actions()
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Ошибка получения последних действий: {str(e)}") from e
+
+
+@router.get('/v1/actions', response_model=ActionsPage, tags=["Общие"])
+async def get_actions_by_login(
+    clickhouse: ClickhouseDependency,
+    token: TokenDependency,
+    login: str = Query(..., min_length=1),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(config.ACTIONS_PAGE_SIZE, ge=1, le=config.ACTIONS_PAGE_MAX_SIZE),
+):
+    """Эндпоинт для получения истории действий по логину.
+
+    Следующая страница запрашивается с cursor из next_cursor. Количество
+    действий по страницам и действиям возвращается только на первой странице.
+    """
+    try:
+        if cursor is None:
+            (actions, next_cursor), counts = await asyncio.gather(
+                get_login_actions_from_clickhouse(clickhouse, login, None, limit),
+                get_login_action_counts_from_clickhouse(clickhouse, login),
+            )
+        else:
+            actions, next_cursor = await get_login_actions_from_clickhouse(clickhouse, login, cursor, limit)
+            counts = None
+
+        return ActionsPage(actions=actions, next_cursor=next_cursor, counts=counts)
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Ошибка получения последних действий: {str(e)}") from e
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Ошибка получения действий: {str(e)}") from e
+
+
+@router.websocket('/v1/ws/last_actions')
+async def last_actions_ws(websocket: WebSocket, token: Optional[str] = Query(None)):
+    """WebSocket с новыми действиями.
+
+    Браузер не может передать заголовок x-token, поэтому токен передаётся
+    параметром запроса. После подключения отправляются текущие последние
+    действия, затем - новые по мере появления.
+    """
+    principal = await get_principal(token) if token else None
+    if principal is None:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    await websocket.accept()
+    queue = actions_feed.subscribe()
+    try:
+        actions = await actions_feed.get_actions()
+        await websocket.send_json([action.model_dump(mode="json") for action in actions])
+        while True:
+            actions = await queue.get()
+            if actions is None:
+                await websocket.close(code=status.WS_1001_GOING_AWAY)
+                break
+            await websocket.send_json([action.model_dump(mode="json") for action in actions])
+    except WebSocketDisconnect:
+        pass
+    finally:
+        actions_feed.unsubscribe(queue)
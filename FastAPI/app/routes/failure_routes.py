@@ -2,14 +2,21 @@
 Маршруты для работы с авариями.
 """
 
+import logging
 from datetime import datetime
 from typing import Optional
 
+import orjson
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
 
-from app.crud import find_failure_by_login, get_login_data
+from app.crud import find_failures_by_login, get_json_documents
 from app.depencies import TokenDependency, RedisDependency
-from app.schemas import FailureDetail, LoginFailureData
+from app.failure_impact import AFFECTED_LOGIN_FIELDS, get_failure, iter_affected_keys
+from app.redis_pool import get_redis_client
+from app.schemas import FailureDetail
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -26,22 +33,19 @@ async def get_failure_by_login(
             raise HTTPException(status_code=400, detail='Логин не указан')
 
         try:
-            login_data = await get_login_data(login, redis)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Ошибка получения данных из Redis: {e}") from e
-
-        try:
-            login_data = LoginFailureData(**login_data)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Ошибка обработки данных логина: {e}") from e
-
-        try:
-            failures_list = await find_failure_by_login(redis, login_data)
+            lookup = await find_failures_by_login(login, redis)
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Ошибка поиска аварий: {e}") from e
 
-        if failures_list is None:
-            return FailureDetail(isFailure=False, failure=[])
+        if lookup.failures is None:
+            return FailureDetail(
+                isFailure=False,
+                failure=[],
+                index_version=lookup.index_version,
+                index_age=lookup.index_age,
+            )
 
         try:
             response = FailureDetail(
@@ -51,8 +55,10 @@ async def get_failure_by_login(
                         key: datetime.fromtimestamp(value).isoformat() if key in ['modified_date', 'createdDate'] else value
                         for key, value in failure.items()
                     }
-                    for failure in failures_list
-                ]
+                    for failure in lookup.failures
+                ],
+                index_version=lookup.index_version,
+                index_age=lookup.index_age,
             )
             return response
         except Exception as e:
@@ -62,3 +68,38 @@ async def get_failure_by_login(
         raise http_ex
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Ошибка обработки запроса: {e}") from e
+
+
+@router.get('/v1/failure/{failure_id}/affected', response_class=StreamingResponse, tags=["Аварии"])
+async def get_failure_affected(
+    failure_id: str,
+    redis: RedisDependency,
+    token: TokenDependency,
+) -> StreamingResponse:
+    """Эндпоинт для получения логинов, затронутых аварией.
+
+    Ответ - NDJSON, по одному логину в строке. Строки отправляются по мере
+    чтения страниц из Redis.
+    """
+    try:
+        failures = await get_failure(failure_id, redis)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Ошибка получения аварии: {e}") from e
+    if failures is None:
+        raise HTTPException(status_code=404, detail=f"Авария {failure_id} не найдена")
+
+    async def lines():
+        # Клиент из зависимости закрывается до отправки тела ответа
+        client = get_redis_client()
+        try:
+            async for keys in iter_affected_keys(failure_id, failures, client):
+                documents = await get_json_documents(keys, client, AFFECTED_LOGIN_FIELDS)
+                yield b"".join(orjson.dumps(doc) + b"\n" for doc in documents.values() if doc is not None)
+        except Exception as e:
+            # Статус уже отправлен: обрыв соединения сообщает клиенту о неполном ответе
+            logger.error("Ошибка выгрузки логинов аварии %s: %s", failure_id, e)
+            raise
+        finally:
+            await client.aclose()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
@@ -8,15 +8,17 @@ from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 import aiohttp
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request
 
+from app.audit import set_audit_details
 from app.crud import (
-    get_RBT_token,
     get_1c_intercom_services,
     get_redis_key_data,
-    get_RBT_aps_settings,
 )
+from app.rbt_crud import get_RBT_token, get_RBT_aps_settings
+from app.decoding import read_json
 from app.depencies import RBTDependency, RedisDependency, TokenDependency
+from app.http_clients import RBT, get_http_client
 from app.schemas import (
     CategoryStatus,
     FixManualBlockRequest,
@@ -95,7 +97,7 @@ async def fetch_passages(
         async with session.post(RBT_API_URL, json=payload, headers=headers) as response:
             if response.status == 200:
                 try:
-                    data = (await response.json())["data"]
+                    data = (await read_json(response))["data"]
                     event_types = {
                         1: "неотвеченный вызов",
                         2: "отвеченный вызов",
@@ -154,22 +156,22 @@ async def get_passages_for_flat(
     try:
         token = await get_token(flat_id, rbt)
         try:
-            async with aiohttp.ClientSession() as session:
-                tasks = [
-                    fetch_passages(
-                        session,
-                        flat_id,
-                        datetime.now(tz=GMT_PLUS_5) - timedelta(days=i),
-                        token,
-                    )
-                    for i in range(days)
-                ]
-                results = await asyncio.gather(*tasks, return_exceptions=True)
-                for result in results:
-                    if isinstance(result, list):
-                        passages.extend(result)
-                    else:
-                        logger.error(f"Ошибка в задаче для flat_id {flat_id}: {result}")
+            session = get_http_client(RBT)
+            tasks = [
+                fetch_passages(
+                    session,
+                    flat_id,
+                    datetime.now(tz=GMT_PLUS_5) - timedelta(days=i),
+                    token,
+                )
+                for i in range(days)
+            ]
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+            for result in results:
+                if isinstance(result, list):
+                    passages.extend(result)
+                else:
+                    logger.error(f"Ошибка в задаче для flat_id {flat_id}: {result}")
         except Exception as e:
             logger.error(f"Ошибка при создании сессии или выполнении задач для flat_id {flat_id}: {e}")
             raise HTTPException(
@@ -435,6 +437,7 @@ async def get_data_for_intercom_page(
 async def fix_manual_block(
     rbt: RBTDependency,
     request_data: FixManualBlockRequest,
+    request: Request,
 ):
     """
     Эндпоинт для исправления ручного отключения домофонии (manual_block).
@@ -444,6 +447,7 @@ async def fix_manual_block(
     - 400: если manual_block уже был 0
     - 404: если квартира не найдена
     """
+    set_audit_details(request, **request_data.model_dump())
     try:
         async with rbt.transaction():
             # Проверяем текущее значение
@@ -0,0 +1,86 @@
+"""
+Маршруты для мониторинга состояния приложения.
+
+Статистика раскрывает внутреннее устройство сервиса, поэтому, как и
+остальные маршруты, требует токен пользователя.
+"""
+
+from fastapi import APIRouter
+
+from app.actions_feed import actions_feed
+from app.clickhouse_pool import clickhouse_reader
+from app.clickhouse_writer import action_log_writer
+from app.depencies import TokenDependency
+from app.failure_impact import affected_logins_cache
+from app.failure_index import failure_index
+from app.login_cache import login_cache
+from app.redis_pool import get_redis_pool_stats
+from app.rbt_pool import get_rbt_pool_stats
+from app.schemas import (
+    ActionLogWriterStats,
+    ActionsFeedStats,
+    AffectedLoginsCacheStats,
+    ClickHouseReaderStats,
+    FailureIndexStats,
+    LoginCacheStats,
+    RBTPoolStats,
+    RedisPoolStats,
+    TokenPurgeStats,
+)
+from app.tasks import token_purge_stats
+
+router = APIRouter()
+
+
+@router.get('/v1/monitoring/redis', response_model=RedisPoolStats, tags=["Мониторинг"])
+async def get_redis_stats(token: TokenDependency):
+    """Эндпоинт для получения статистики пула Redis"""
+    return get_redis_pool_stats()
+
+
+@router.get('/v1/monitoring/rbt', response_model=RBTPoolStats, tags=["Мониторинг"])
+async def get_rbt_stats(token: TokenDependency):
+    """Эндпоинт для получения статистики пула RBT"""
+    return get_rbt_pool_stats()
+
+
+@router.get('/v1/monitoring/tokens', response_model=TokenPurgeStats, tags=["Мониторинг"])
+async def get_token_purge_stats(token: TokenDependency):
+    """Эндпоинт для получения статистики очистки токенов"""
+    return token_purge_stats
+
+
+@router.get('/v1/monitoring/clickhouse', response_model=ClickHouseReaderStats, tags=["Мониторинг"])
+async def get_clickhouse_stats(token: TokenDependency):
+    """Эндпоинт для получения статистики запросов к ClickHouse"""
+    return clickhouse_reader.get_stats()
+
+
+@router.get('/v1/monitoring/clickhouse_log', response_model=ActionLogWriterStats, tags=["Мониторинг"])
+async def get_action_log_stats(token: TokenDependency):
+    """Эндпоинт для получения статистики записи журнала действий"""
+    return action_log_writer.get_stats()
+
+
+@router.get('/v1/monitoring/actions_feed', response_model=ActionsFeedStats, tags=["Мониторинг"])
+async def get_actions_feed_stats(token: TokenDependency):
+    """Эндпоинт для получения состояния ленты последних действий"""
+    return actions_feed.get_stats()
+
+
+@router.get('/v1/monitoring/login_cache', response_model=LoginCacheStats, tags=["Мониторинг"])
+async def get_login_cache_stats(token: TokenDependency):
+    """Эндпоинт для получения статистики кэша документов логинов"""
+    return login_cache.get_stats()
+
+
+@router.get('/v1/monitoring/failure_index', response_model=FailureIndexStats, tags=["Мониторинг"])
+async def get_failure_index_stats(token: TokenDependency):
+    """Эндпоинт для получения статистики индекса активных аварий"""
+    return failure_index.get_stats()
+
+
+@router.get('/v1/monitoring/affected_logins_cache', response_model=AffectedLoginsCacheStats, tags=["Мониторинг"])
+async def get_affected_logins_cache_stats(token: TokenDependency):
+    """Эндпоинт для получения статистики кэша логинов, затронутых авариями"""
+    return affected_logins_cache.get_stats()
@@ -16,6 +16,7 @@ from app.schemas import (
     RecPaymnent,
 )
 from app.depencies import TokenDependency
+from app.http_clients import ONE_C, get_http_client
 import asyncio
 import aiohttp
 
@@ -40,42 +41,42 @@ async def get_payment_data(
                 detail="Login parameter is required"
             )
 
-        async with aiohttp.ClientSession() as session:
-            try:
-                tasks = [
-                    fetch_data(session, f'http://server1c.freedom1.ru/UNF_CRM_WS/hs/Grafana/anydata?query=allPayments3&login={login}', Payment),
-                    fetch_data(session, f'http://server1c.freedom1.ru/UNF_CRM_WS/hs/Grafana/anydata?query=canceledPayments&login={login}', FailurePay),
-                    fetch_data(session, f'http://server1c.freedom1.ru/UNF_CRM_WS/hs/Grafana/anydata?query=recurringPayment&login={login}', RecPaymnent),
-                    fetch_data(session, f'http://server1c.freedom1.ru/UNF_CRM_WS/hs/mwapi/getNotifications?login={login}', NotificationSMS),
-                ]
+        session = get_http_client(ONE_C)
+        try:
+            tasks = [
+                fetch_data(session, f'http://server1c.freedom1.ru/UNF_CRM_WS/hs/Grafana/anydata?query=allPayments3&login={login}', Payment),
+                fetch_data(session, f'http://server1c.freedom1.ru/UNF_CRM_WS/hs/Grafana/anydata?query=canceledPayments&login={login}', FailurePay),
+                fetch_data(session, f'http://server1c.freedom1.ru/UNF_CRM_WS/hs/Grafana/anydata?query=recurringPayment&login={login}', RecPaymnent),
+                fetch_data(session, f'http://server1c.freedom1.ru/UNF_CRM_WS/hs/mwapi/getNotifications?login={login}', NotificationSMS),
+            ]
                 
-                last_payments_models, canceled_payments_models, recurring_payment_model, notification_model = await asyncio.gather(*tasks)
+            last_payments_models, canceled_payments_models, recurring_payment_model, notification_model = await asyncio.gather(*tasks)
                 
-                return PaymentResponseModel(
-                    payments=last_payments_models, 
-                    canceled_payments=canceled_payments_models, 
-                    recurringPayment=recurring_payment_model[0] if isinstance(recurring_payment_model, list) and recurring_payment_model else None,
-                    notifications=notification_model if notification_model else None,
-                )
+            return PaymentResponseModel(
+                payments=last_payments_models, 
+                canceled_payments=canceled_payments_models, 
+                recurringPayment=recurring_payment_model[0] if isinstance(recurring_payment_model, list) and recurring_payment_model else None,
+                notifications=notification_model if notification_model else None,
+            )
                 
-            except aiohttp.ClientError as e:
-                logger.error("Failed to connect to 1C server: %s", str(e))
-                raise HTTPException(
-                    status_code=503,
-                    detail=f"Failed to connect to 1C server: {str(e)}"
-                ) from e
-            except asyncio.TimeoutError as e:
-                logger.error("Request to 1C server timed out: %s", str(e))
-                raise HTTPException(
-                    status_code=504,
-                    detail="Request to 1C server timed out"
-                ) from e
-            except Exception as e:
-                logger.error("Unexpected error occurred: %s", str(e))
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Unexpected error occurred: {str(e)}"
-                ) from e
+        except aiohttp.ClientError as e:
+            logger.error("Failed to connect to 1C server: %s", str(e))
+            raise HTTPException(
+                status_code=503,
+                detail=f"Failed to connect to 1C server: {str(e)}"
+            ) from e
+        except asyncio.TimeoutError as e:
+            logger.error("Request to 1C server timed out: %s", str(e))
+            raise HTTPException(
+                status_code=504,
+                detail="Request to 1C server timed out"
+            ) from e
+        except Exception as e:
+            logger.error("Unexpected error occurred: %s", str(e))
+            raise HTTPException(
+                status_code=500,
+                detail=f"Unexpected error occurred: {str(e)}"
+            ) from e
     except HTTPException:
         raise
     except Exception as e:
@@ -0,0 +1,62 @@
+"""
+Маршруты для статистики действий и времени ответа.
+"""
+
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
+
+from app import config
+from app.depencies import ClickhouseDependency, TokenDependency
+from app.schemas import ActionStats, LatencyStats
+from app.stats import get_action_stats, get_latency_stats, stats_cache, stats_window
+
+router = APIRouter()
+
+
+@router.get('/v1/stats/actions', response_model=ActionStats, tags=["Статистика"])
+async def get_actions_stats(
+    clickhouse: ClickhouseDependency,
+    token: TokenDependency,
+    date_from: Optional[datetime] = Query(None),
+    date_to: Optional[datetime] = Query(None),
+    page: Optional[str] = Query(None),
+    action: Optional[str] = Query(None),
+    user_name: Optional[str] = Query(None),
+    top: int = Query(config.STATS_TOP_LOGINS, ge=1, le=config.STATS_TOP_LOGINS_MAX),
+):
+    """Эндпоинт для получения количества действий, доли успешных и топа логинов.
+
+    Окно по умолчанию - последние сутки, границы округляются до часа.
+    """
+    start, end = stats_window(date_from, date_to)
+    try:
+        return await stats_cache.get_or_load(
+            ("actions", start, end, page, action, user_name, top),
+            lambda: get_action_stats(clickhouse, start, end, page, action, user_name, top),
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Ошибка получения статистики: {str(e)}") from e
+
+
+@router.get('/v1/stats/latency', response_model=LatencyStats, tags=["Статистика"])
+async def get_latency(
+    clickhouse: ClickhouseDependency,
+    token: TokenDependency,
+    date_from: Optional[datetime] = Query(None),
+    date_to: Optional[datetime] = Query(None),
+):
+    """Эндпоинт для получения p50/p95/p99 времени ответа по эндпоинтам"""
+    start, end = stats_window(date_from, date_to)
+    try:
+        return await stats_cache.get_or_load(
+            ("latency", start, end),
+            lambda: get_latency_stats(clickhouse, start, end),
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Ошибка получения статистики: {str(e)}") from e
@@ -8,11 +8,13 @@
 """
 
 import logging
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query, Response
 
+from app import config
 from app.auth import hash_password
+from app.auth_cache import principal_cache
 from app.crud import add_item, get_item
 from app.depencies import SessionDependency, TokenDependency
 from app.schemas import (
@@ -24,25 +26,56 @@ from app.schemas import (
     UserModel,
 )
 from sqlalchemy.orm import selectinload
-from app.models import User, Token
-from sqlalchemy import delete, select
+from app.models import Role, User, Token
+from sqlalchemy import delete, or_, select
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
 @router.get("/v1/users", response_model=List[UserModel], tags=["Пользователи"])
-async def get_users(session: SessionDependency, token: TokenDependency):  # type: ignore
-    """Эндпоинт для получения списка пользователей"""
-    query = select(User).options(selectinload(User.role))
-    result = await session.execute(query)
-    users = result.scalars().unique().all()
-
-    user_data = []
-    for user in users:
-        user_data.append(UserModel(id=user.id, username=user.username, role=user.role.name, firstname=user.firstname, lastname=user.lastname, middlename=user.middlename))
-
-    return user_data  
+async def get_users(
+    response: Response,
+    session: SessionDependency,  # type: ignore
+    token: TokenDependency,
+    after_id: Optional[int] = Query(None, ge=0),
+    limit: int = Query(config.USERS_PAGE_SIZE, ge=1, le=config.USERS_PAGE_MAX_SIZE),
+    role_id: Optional[int] = Query(None),
+    name: Optional[str] = Query(None, min_length=1),
+):
+    """Эндпоинт для получения списка пользователей.
+
+    Постраничная выдача по id: следующая страница запрашивается с
+    after_id из заголовка X-Next-Cursor. Заголовок отсутствует на последней
+    странице. name фильтрует по началу логина или фамилии.
+    """
+    query = (
+        select(User.id, User.username, User.firstname, User.lastname, User.middlename, Role.name)
+        .join(Role, User.role_id == Role.id)
+        .order_by(User.id)
+        .limit(limit + 1)
+    )
+    if after_id is not None:
+        query = query.where(User.id > after_id)
+    if role_id is not None:
+        query = query.where(User.role_id == role_id)
+    if name:
+        # Шаблон собирается целиком, чтобы MySQL мог использовать индекс по username
+        pattern = name.replace("/", "//").replace("%", "/%").replace("_", "/_") + "%"
+        query = query.where(or_(
+            User.username.like(pattern, escape="/"),
+            User.lastname.like(pattern, escape="/"),
+        ))
+
+    rows = (await session.execute(query)).all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = str(rows[-1].id)
+
+    return [
+        UserModel(id=user_id, username=username, role=role, firstname=firstname, lastname=lastname, middlename=middlename)
+        for user_id, username, firstname, lastname, middlename, role in rows
+    ]
 
 @router.post('/v1/user', response_model=ItemId, tags=["Пользователи"])
 async def create_user(
@@ -51,9 +84,7 @@ async def create_user(
         token: TokenDependency
 ):
     """Эндпоинт для создания нового пользователя"""
-    current_user_id = token.user_id
-    current_user = await get_item(session, User, current_user_id)
-    if current_user.role_id == 1:  # type: ignore
+    if token.role_id == 1:
         user = User(**user_data.dict())
     else:
         user_data.role_id = 2
@@ -70,9 +101,7 @@ async def get_user(
     token: TokenDependency
 ):
     """Эндпоинт для получения данных пользователя"""
-    current_user_id = token.user_id
-    current_user = await get_item(session, User, current_user_id)
-    user = await get_item(session, User, user_id)
+    user = await get_item(session, User, user_id, options=[selectinload(User.role)])
     isItself = token.user_id == user_id
 
     return ResponseUserData(id=user.id,
@@ -82,7 +111,7 @@ async def get_user(
                             firstname=user.firstname,  # type: ignore
                             lastname=user.lastname,  # type: ignore
                             middlename=user.middlename,  # type: ignore
-                            current_user_role=current_user.role.name)  # type: ignore
+                            current_user_role=token.role_name)
 
 @router.patch('/v1/user/{user_id}', response_model=ItemId, tags=["Пользователи"])
 async def update_user(
@@ -94,9 +123,8 @@ async def update_user(
     """Эндпоинт для обновления пользователя"""
     user_orm = await get_item(session, User, user_id)
     current_user_id = token.user_id
-    current_user = await get_item(session, User, current_user_id)
 
-    if current_user.role_id == 1:  # type: ignore
+    if token.role_id == 1:
         # если текущий пользователь - администратор, он может обновлять любую роль
         for field, value in user_data.dict(exclude_unset=True).items():
             setattr(user_orm, field, value)
@@ -112,6 +140,8 @@ async def update_user(
     if user_data.password:
         user_orm.password = await hash_password(user_orm.password)  # type: ignore
     user_orm = await add_item(session, user_orm)
+    # роль и имя пользователя могли измениться
+    principal_cache.invalidate_user(user_id)
 
     return {'id': user_orm.id}
 
@@ -119,9 +149,7 @@ async def update_user(
 async def delete_user(user_id: int, session: SessionDependency, token: TokenDependency):  # type: ignore
     """Эндпоинт для удаления пользователя"""
     try:
-        current_user_id = token.user_id
-        current_user = await get_item(session, User, current_user_id)
-        if current_user.role_id == 1 or token.user_id == user_id:  # type: ignore
+        if token.role_id == 1 or token.user_id == user_id:
             try:
                 user = await get_item(session, User, user_id)
                 await session.execute(
@@ -131,6 +159,7 @@ async def delete_user(user_id: int, session: SessionDependency, token: TokenDepe
                     delete(User).where(User.id == user.id)
                 )
                 await session.commit()
+                principal_cache.invalidate_user(user.id)
                 return {'status': 'deleted'}
             except Exception as e:
                 logger.error("Ошибка при удалении пользователя %s: %s", user_id, str(e))
@@ -6,7 +6,7 @@ from token import OP
 import uuid
 from typing import Any, Literal, Dict, List, Optional, Union
 from datetime import datetime
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 
 class ItemId(BaseModel):
@@ -68,6 +68,19 @@ class ResponseUserData(UserModel):
     current_user_role: str
 
 
+class Principal(BaseModel):
+    """Аутентифицированный пользователь, определённый по токену."""
+
+    model_config = ConfigDict(frozen=True)
+
+    token: str
+    user_id: int
+    username: str
+    role_id: int
+    role_name: str
+    expires_at: datetime
+
+
 class Login(BaseUser):
     """Схема входа пользователя."""
 
@@ -95,6 +108,9 @@ class FailureDetail(BaseModel):
 
     isFailure: bool
     failure: Optional[list] = None
+    # Версия и возраст (с) индекса аварий; None, если аварии искались в Redis
+    index_version: Optional[int] = None
+    index_age: Optional[float] = None
 
 
 class LoginFailureData(BaseModel):
@@ -451,6 +467,78 @@ class Action(BaseModel):
     status: bool
 
 
+class ActionCount(BaseModel):
+    """Количество действий по странице и действию"""
+
+    page: str
+    action: str
+    count: int
+    success: int
+
+
+class ActionsPage(BaseModel):
+    """Страница истории действий по логину"""
+
+    actions: List[Action]
+    # Непрозрачный курсор следующей страницы
+    next_cursor: Optional[str] = None
+    counts: Optional[List[ActionCount]] = None
+
+
+class PageActionStats(BaseModel):
+    """Количество действий по странице и действию за период"""
+
+    page: str
+    action: str
+    total: int
+    success: int
+    success_rate: float
+
+
+class UserActionStats(BaseModel):
+    """Количество действий пользователя за период"""
+
+    user_name: str
+    total: int
+    success: int
+    success_rate: float
+
+
+class LoginActionCount(BaseModel):
+    """Количество действий по логину за период"""
+
+    login: str
+    count: int
+
+
+class ActionStats(BaseModel):
+    """Статистика действий за период"""
+
+    date_from: datetime
+    date_to: datetime
+    by_page: List[PageActionStats]
+    by_user: List[UserActionStats]
+    top_logins: List[LoginActionCount]
+
+
+class EndpointLatency(BaseModel):
+    """Квантили времени ответа эндпоинта в миллисекундах"""
+
+    endpoint: str
+    requests: int
+    p50: float
+    p95: float
+    p99: float
+
+
+class LatencyStats(BaseModel):
+    """Время ответа эндпоинтов за период"""
+
+    date_from: datetime
+    date_to: datetime
+    endpoints: List[EndpointLatency]
+
+
 class Payment(BaseModel):
     """Данные платежа."""
 
@@ -710,6 +798,108 @@ class RedisAddressModelResponse(BaseModel):
     addresses: List[RedisAddressModel]
 
 
+class RedisPoolStats(BaseModel):
+    """Статистика пула подключений к Redis"""
+
+    max_size: int
+    in_use: int
+    idle: int
+    waits: int
+    timeouts: int
+
+
+class RBTPoolStats(BaseModel):
+    """Статистика пула подключений к RBT"""
+
+    min_size: int
+    max_size: int
+    size: int
+    idle: int
+    acquires: int
+    timeouts: int
+    wait_avg_ms: float
+    wait_max_ms: float
+
+
+class TokenPurgeStats(BaseModel):
+    """Статистика очистки просроченных токенов"""
+
+    runs: int
+    removed_last: int
+    removed_total: int
+    last_run: Optional[datetime] = None
+
+
+class ClickHouseReaderStats(BaseModel):
+    """Статистика запросов чтения из ClickHouse"""
+
+    max_concurrent: int
+    queries: int
+    errors: int
+    timeouts: int
+    in_flight: int
+    waits: int
+    time_avg_ms: float
+
+
+class ActionLogWriterStats(BaseModel):
+    """Статистика пакетной записи журнала действий в ClickHouse"""
+
+    enqueued: int
+    written: int
+    dropped: int
+    batches: int
+    failures: int
+    buffered: int
+    last_error: Optional[str] = None
+    last_flush: Optional[datetime] = None
+
+
+class ActionsFeedStats(BaseModel):
+    """Состояние ленты последних действий"""
+
+    size: int
+    subscribers: int
+    last_seen: Optional[datetime] = None
+
+
+class LoginCacheStats(BaseModel):
+    """Статистика кэша документов логинов"""
+
+    active: bool
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    invalidations: int
+    evictions: int
+
+
+class FailureIndexStats(BaseModel):
+    """Статистика индекса активных аварий"""
+
+    ready: bool
+    listening: bool
+    version: int
+    age: Optional[float] = None
+    documents: int
+    hosts: int
+    addresses: int
+    refreshes: int
+    errors: int
+    events: int
+
+
+class AffectedLoginsCacheStats(BaseModel):
+    """Статистика кэша логинов, затронутых авариями"""
+
+    failures: int
+    logins: int
+    max_logins: int
+    hits: int
+    misses: int
+
+
 class RedisTariffsResponse(BaseModel):
     """Схема ответа для запроса тарифов"""
 
@@ -0,0 +1,186 @@
+"""
+Статистика использования приложения.
+
+Запросы читают только почасовые агрегаты, которые материализованные
+представления заполняют при записи в actions_logs (см. clickhouse_schema),
+и никогда не обращаются к исходной таблице. Границы окна округляются до
+часа, результат кэшируется в памяти на STATS_CACHE_TTL секунд.
+"""
+
+import asyncio
+import datetime
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional, Tuple
+
+from fastapi import HTTPException
+
+from app import config
+from app.clickhouse_schema import (
+    ACTIONS_HOURLY_BY_LOGIN_TABLE,
+    ACTIONS_HOURLY_TABLE,
+    REQUEST_LATENCY_HOURLY_TABLE,
+)
+from app.schemas import (
+    ActionStats,
+    EndpointLatency,
+    LatencyStats,
+    LoginActionCount,
+    PageActionStats,
+    UserActionStats,
+)
+
+
+class TTLCache:
+    """Кэш результатов с ограниченным временем жизни и размером."""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._items: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Значение из кэша или результат loader, если записи нет или она устарела."""
+        item = self._items.get(key)
+        if item is not None and item[0] > time.monotonic():
+            return item[1]
+
+        value = await loader()
+        self._items[key] = (time.monotonic() + self.ttl, value)
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+        return value
+
+
+stats_cache = TTLCache(config.STATS_CACHE_MAX_SIZE, config.STATS_CACHE_TTL)
+
+
+def stats_window(
+    date_from: Optional[datetime.datetime], date_to: Optional[datetime.datetime]
+) -> Tuple[datetime.datetime, datetime.datetime]:
+    """Окно статистики в UTC с границами, округлёнными до часа.
+
+    По умолчанию - последние STATS_DEFAULT_WINDOW_HOURS часов.
+    """
+    def to_hour(value: datetime.datetime) -> datetime.datetime:
+        if value.tzinfo is None:
+            value = value.astimezone()
+        return value.astimezone(datetime.timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    end = to_hour(date_to or now)
+    start = to_hour(date_from or now - datetime.timedelta(hours=config.STATS_DEFAULT_WINDOW_HOURS))
+    if start > end:
+        raise HTTPException(status_code=400, detail="date_from должен быть раньше date_to")
+    return start, end
+
+
+def _success_rate(success: int, total: int) -> float:
+    return success / total if total else 0.0
+
+
+async def get_action_stats(
+    clickhouse_client,
+    start: datetime.datetime,
+    end: datetime.datetime,
+    page: Optional[str] = None,
+    action: Optional[str] = None,
+    user_name: Optional[str] = None,
+    top: int = 10,
+) -> ActionStats:
+    """Количество действий, доля успешных и топ логинов за окно [start, end].
+
+    Фильтры page, action и user_name применяются ко всем трём срезам.
+    """
+    parameters = {
+        "start": int(start.timestamp()),
+        "end": int(end.timestamp()),
+        "page": page or "",
+        "action": action or "",
+        "user_name": user_name or "",
+        "top": top,
+    }
+    window = "hour >= toDateTime({start:UInt32}, 'UTC') AND hour <= toDateTime({end:UInt32}, 'UTC')"
+    filters = (
+        "({page:String} = '' OR page = {page:String})"
+        " AND ({action:String} = '' OR action = {action:String})"
+        " AND ({user_name:String} = '' OR user_name = {user_name:String})"
+    )
+
+    by_page_query = f"""
+        SELECT page, action, sum(total), sum(success)
+        FROM {ACTIONS_HOURLY_TABLE}
+        WHERE {window} AND {filters}
+        GROUP BY page, action
+        ORDER BY sum(total) DESC
+    """
+    by_user_query = f"""
+        SELECT user_name, sum(total), sum(success)
+        FROM {ACTIONS_HOURLY_TABLE}
+        WHERE {window} AND {filters}
+        GROUP BY user_name
+        ORDER BY sum(total) DESC
+    """
+    top_logins_query = f"""
+        SELECT login, sum(total) AS count
+        FROM {ACTIONS_HOURLY_BY_LOGIN_TABLE}
+        WHERE {window} AND {filters}
+        GROUP BY login
+        ORDER BY count DESC
+        LIMIT {{top:UInt32}}
+    """
+
+    by_page, by_user, top_logins = await asyncio.gather(
+        clickhouse_client.query(by_page_query, parameters=parameters),
+        clickhouse_client.query(by_user_query, parameters=parameters),
+        clickhouse_client.query(top_logins_query, parameters=parameters),
+    )
+
+    return ActionStats(
+        date_from=start,
+        date_to=end,
+        by_page=[
+            PageActionStats(
+                page=row_page, action=row_action, total=total, success=success,
+                success_rate=_success_rate(success, total),
+            )
+            for row_page, row_action, total, success in by_page.result_set
+        ],
+        by_user=[
+            UserActionStats(
+                user_name=row_user, total=total, success=success,
+                success_rate=_success_rate(success, total),
+            )
+            for row_user, total, success in by_user.result_set
+        ],
+        top_logins=[
+            LoginActionCount(login=login, count=count)
+            for login, count in top_logins.result_set
+        ],
+    )
+
+
+async def get_latency_stats(
+    clickhouse_client, start: datetime.datetime, end: datetime.datetime
+) -> LatencyStats:
+    """Квантили времени ответа по эндпоинтам за окно [start, end]."""
+    query = f"""
+        SELECT endpoint, sum(requests), quantilesMerge(0.5, 0.95, 0.99)(latency)
+        FROM {REQUEST_LATENCY_HOURLY_TABLE}
+        WHERE hour >= toDateTime({{start:UInt32}}, 'UTC') AND hour <= toDateTime({{end:UInt32}}, 'UTC')
+        GROUP BY endpoint
+        ORDER BY endpoint
+    """
+    result = await clickhouse_client.query(
+        query, parameters={"start": int(start.timestamp()), "end": int(end.timestamp())}
+    )
+
+    return LatencyStats(
+        date_from=start,
+        date_to=end,
+        endpoints=[
+            EndpointLatency(endpoint=endpoint, requests=requests, p50=p50, p95=p95, p99=p99)
+            for endpoint, requests, (p50, p95, p99) in result.result_set
+        ],
+    )
@@ -0,0 +1,63 @@
+"""
+Фоновые задачи приложения.
+
+Задачи запускаются и останавливаются в lifespan приложения.
+"""
+
+import asyncio
+import datetime
+import logging
+from typing import List
+
+from app import config
+from app.crud import purge_expired_tokens
+from app.models import Session
+
+logger = logging.getLogger(__name__)
+
+_tasks: List[asyncio.Task] = []
+
+token_purge_stats = {
+    "runs": 0,
+    "removed_last": 0,
+    "removed_total": 0,
+    "last_run": None,
+}
+
+
+async def purge_tokens_once() -> int:
+    """Однократная очистка просроченных токенов."""
+    async with Session() as session:
+        removed = await purge_expired_tokens(session, config.TOKEN_PURGE_BATCH_SIZE)
+
+    token_purge_stats["runs"] += 1
+    token_purge_stats["removed_last"] = removed
+    token_purge_stats["removed_total"] += removed
+    token_purge_stats["last_run"] = datetime.datetime.now()
+    logger.info("Удалено просроченных токенов: %s", removed)
+    return removed
+
+
+async def token_purge_loop() -> None:
+    """Периодическая очистка просроченных токенов."""
+    while True:
+        try:
+            await purge_tokens_once()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("Ошибка очистки просроченных токенов: %s", e)
+        await asyncio.sleep(config.TOKEN_PURGE_INTERVAL)
+
+
+def start_background_tasks() -> None:
+    """Запуск фоновых задач."""
+    _tasks.append(asyncio.create_task(token_purge_loop(), name="token_purge"))
+
+
+async def stop_background_tasks() -> None:
+    """Остановка фоновых задач."""
+    for task in _tasks:
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+    _tasks.clear()
@@ -0,0 +1,14 @@
+"""
+Общие настройки тестов.
+
+Модули приложения читают настройки при импорте, поэтому переменные
+окружения задаются до импорта app. Внешние сервисы в тестах не нужны:
+Redis и ClickHouse заменяются заглушками, MySQL - SQLite.
+"""
+
+import os
+
+os.environ.setdefault("MYSQL_PORT", "3306")
+os.environ.setdefault("RADIUS_MYSQL_PORT", "3306")
+os.environ.setdefault("LOGIN_CACHE_ENABLED", "false")
+os.environ.setdefault("FAILURE_INDEX_ENABLED", "false")
@@ -0,0 +1,40 @@
+"""
+Последние действия из ClickHouse: crud.get_last_actions_from_clickhouse.
+"""
+
+import asyncio
+import datetime
+
+from app import crud
+
+# clickhouse_connect отдаёт DateTime64(6, 'UTC') без tzinfo
+NAIVE_UTC = datetime.datetime(2024, 1, 1, 12, 0, 0, 123456)
+
+
+class Result:
+    def __init__(self, rows):
+        self.result_set = rows
+
+
+class FakeClickhouse:
+    def __init__(self, rows):
+        self.rows = rows
+        self.parameters = []
+
+    async def query(self, query, parameters=None):
+        self.parameters.append(parameters)
+        return Result(self.rows)
+
+
+def test_naive_dates_are_read_as_utc():
+    client = FakeClickhouse([("ivanov", NAIVE_UTC, "user", "main", "open", True)])
+    action, = asyncio.run(crud.get_last_actions_from_clickhouse(client))
+    assert action.date == NAIVE_UTC.replace(tzinfo=datetime.timezone.utc)
+    assert action.date.utcoffset() == datetime.timedelta(hours=5)
+
+
+def test_since_is_passed_as_exact_unix_micros():
+    client = FakeClickhouse([])
+    since = crud._action_from_row(("ivanov", NAIVE_UTC, "user", "main", "open", True)).date
+    asyncio.run(crud.get_last_actions_from_clickhouse(client, since=since))
+    assert client.parameters[0]["since"] == 1704110400123456
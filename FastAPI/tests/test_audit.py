@@ -0,0 +1,48 @@
+"""
+Аудит действий: app.audit.AuditMiddleware и set_audit_details.
+"""
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app import audit
+from app.audit import AuditMiddleware, set_audit_details
+
+
+def make_client(monkeypatch, routes):
+    records = []
+    monkeypatch.setattr(audit.action_log_writer, "enqueue", lambda **row: records.append(row))
+    monkeypatch.setattr(audit.config, "AUDIT_ENABLED", True)
+    monkeypatch.setattr(audit, "AUDITED_ROUTES", routes)
+
+    app = FastAPI()
+
+    @app.delete("/unlink/{house_id}")
+    async def unlink(house_id: int, request: Request, target: str = None):
+        set_audit_details(request, {"phone": "Отвязка телефона"}.get(target), house_id=house_id)
+        return {"status": "success"}
+
+    @app.get("/view")
+    async def view():
+        return {}
+
+    app.add_middleware(AuditMiddleware)
+    return TestClient(app), records
+
+
+def test_details_and_action_from_endpoint(monkeypatch):
+    client, records = make_client(monkeypatch, {("DELETE", "/unlink/{house_id}"): ("Приложение", "Отвязка")})
+    assert client.delete("/unlink/5", params={"login": "user", "target": "phone"}).status_code == 200
+    client.delete("/unlink/6", params={"login": "user"})
+
+    assert [row["action"] for row in records] == ["Отвязка телефона", "Отвязка"]
+    assert records[0]["login"] == "user"
+    assert records[0]["payload"]["details"] == {"house_id": 5}
+    assert records[0]["success"]
+
+
+def test_route_without_details(monkeypatch):
+    client, records = make_client(monkeypatch, {("GET", "/view"): ("Страница", "Просмотр")})
+    client.get("/view", params={"login": "user"})
+    assert records[0]["action"] == "Просмотр"
+    assert records[0]["payload"]["details"] == {}
@@ -0,0 +1,105 @@
+"""
+Количество SQL-запросов при проверке токена и чтении пользователя.
+
+Вместо MySQL - SQLite в памяти, нужен пакет aiosqlite.
+"""
+
+import asyncio
+import datetime
+
+import pytest
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy import event
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app import auth_cache
+from app.crud import get_item
+from app.models import Base, Role, Token, User
+from app.routes.user_routes import get_user
+
+TOKEN = "3f1c2a8e-0000-4000-8000-000000000001"
+
+
+class Database:
+    """SQLite в памяти со счётчиком выполненных запросов."""
+
+    def __init__(self):
+        self.engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+        self.Session = async_sessionmaker(bind=self.engine, expire_on_commit=False)
+        self.statements = []
+        event.listen(self.engine.sync_engine, "before_cursor_execute", self._record)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    async def setup(self):
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with self.Session() as session:
+            session.add(Role(id=1, name="admin"))
+            session.add(User(
+                id=1, username="ivanov", firstname="Иван", lastname="Иванов",
+                middlename="Иванович", password="x", role_id=1,
+            ))
+            session.add(Token(token=TOKEN, user_id=1, creation_time=datetime.datetime.now()))
+            await session.commit()
+        self.statements.clear()
+
+
+@pytest.fixture
+def database(monkeypatch):
+    db = Database()
+    asyncio.run(db.setup())
+    monkeypatch.setattr(auth_cache, "Session", db.Session)
+    auth_cache.principal_cache.clear()
+    yield db
+    auth_cache.principal_cache.clear()
+    asyncio.run(db.engine.dispose())
+
+
+def test_auth_check_is_one_bounded_query(database):
+    principal = asyncio.run(auth_cache.get_principal(TOKEN))
+    assert principal.username == "ivanov"
+    assert principal.role_name == "admin"
+    assert len(database.statements) == 1
+    assert "LIMIT" in database.statements[0]
+
+    # Повторная проверка того же токена - из кэша, без запросов
+    assert asyncio.run(auth_cache.get_principal(TOKEN)) == principal
+    assert len(database.statements) == 1
+
+
+def test_unknown_token_is_one_query(database):
+    assert asyncio.run(auth_cache.get_principal("unknown")) is None
+    assert len(database.statements) == 1
+
+
+def test_get_user_loads_role_with_one_extra_query(database):
+    principal = asyncio.run(auth_cache.get_principal(TOKEN))
+    database.statements.clear()
+
+    async def request():
+        async with database.Session() as session:
+            return await get_user(1, session, principal)
+
+    response = asyncio.run(request())
+    assert response.role == "admin"
+    assert response.isItself
+    # Пользователь и его роль (selectinload)
+    assert len(database.statements) == 2
+
+
+def test_relationships_are_not_lazy_loaded(database):
+    async def request():
+        async with database.Session() as session:
+            user = await get_item(session, User, 1)
+            with pytest.raises(InvalidRequestError):
+                user.role
+            with pytest.raises(InvalidRequestError):
+                user.tokens
+
+    asyncio.run(request())
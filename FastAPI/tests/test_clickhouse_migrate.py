@@ -0,0 +1,82 @@
+"""
+Миграция ClickHouse: граница между представлениями и заполнением агрегатов.
+"""
+
+import re
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app import clickhouse_migrate, config
+from app.clickhouse_migrate import migrate
+from app.clickhouse_schema import ACTIONS_HOURLY_TABLE, AGGREGATE_SELECTS
+
+CUTOFF = re.compile(r"date (>=|<) toDateTime64\('([^']+)', 6, 'UTC'\)")
+
+
+class Result:
+    def __init__(self, rows):
+        self.result_rows = rows
+
+
+class FakeClient:
+    def __init__(self, views=()):
+        self.views = views
+        self.commands = []
+
+    def query(self, sql, parameters=None):
+        return Result([(name,) for name in self.views])
+
+    def command(self, sql):
+        self.commands.append(" ".join(sql.split()))
+
+
+@pytest.fixture(autouse=True)
+def waits(monkeypatch):
+    moments = []
+    monkeypatch.setattr(clickhouse_migrate, "_wait_until", moments.append)
+    return moments
+
+
+def statements(client, prefix):
+    return [command for command in client.commands if command.startswith(prefix)]
+
+
+def test_views_and_backfill_split_at_one_cutoff(waits):
+    started = datetime.now(timezone.utc)
+    client = FakeClient()
+    migrate(client, backfill=True)
+
+    views = statements(client, "CREATE MATERIALIZED VIEW")
+    backfills = statements(client, "INSERT INTO")
+    assert len(views) == len(backfills) == len(AGGREGATE_SELECTS)
+    # Представления создаются до заполнения
+    assert client.commands.index(backfills[0]) > client.commands.index(views[-1])
+
+    view_bounds = {CUTOFF.search(view).groups() for view in views}
+    backfill_bounds = {CUTOFF.search(backfill).groups() for backfill in backfills}
+    (_, cutoff), = view_bounds
+    assert view_bounds == {(">=", cutoff)}
+    assert backfill_bounds == {("<", cutoff)}
+
+    # Граница позже буферизации записи, заполнение ждёт записи строк до неё
+    lag = timedelta(seconds=config.CLICKHOUSE_LOG_MAX_LAG)
+    cutoff = datetime.strptime(cutoff, "%Y-%m-%d %H:%M:%S.%f").replace(tzinfo=timezone.utc)
+    assert cutoff >= started + lag
+    assert waits == [cutoff + lag]
+
+
+def test_backfill_skips_views_created_earlier(waits):
+    client = FakeClient(views=[ACTIONS_HOURLY_TABLE.split(".")[1] + "_mv"])
+    migrate(client, backfill=True)
+
+    backfilled = {command.split()[2] for command in statements(client, "INSERT INTO")}
+    assert backfilled == set(AGGREGATE_SELECTS) - {ACTIONS_HOURLY_TABLE}
+
+
+def test_no_wait_when_every_view_exists(waits):
+    client = FakeClient(views=[table.split(".")[1] + "_mv" for table in AGGREGATE_SELECTS])
+    migrate(client, backfill=True)
+
+    assert statements(client, "INSERT INTO") == []
+    assert waits == []
@@ -0,0 +1,88 @@
+"""
+Индекс активных аварий: app.failure_index.FailureIndex.
+"""
+
+import asyncio
+
+import pytest
+
+from app import failure_index as module
+from app.failure_index import FailureIndex
+
+PAGES = [["failure:1", "failure:2"], ["failure:3"]]
+DOCUMENTS = {
+    "failure:1": [{"host": 5, "address": 10, "reason": "a"}],
+    "failure:2": [{"host": "6", "address": [11, 12], "reason": "b"}],
+}
+
+
+class FakeJson:
+    def __init__(self, redis):
+        self.redis = redis
+
+    async def mget(self, keys, path):
+        assert path == "$"
+        if self.redis.fail_on in keys:
+            raise ConnectionError("Redis недоступен")
+        return [[DOCUMENTS[key]] if key in DOCUMENTS else None for key in keys]
+
+
+class FakeRedis:
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.closed = False
+
+    def json(self, decoder=None):
+        return FakeJson(self)
+
+    async def aclose(self):
+        self.closed = True
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    client = FakeRedis()
+
+    async def iter_search_keys(redis, index, query):
+        assert index == "idx:failure"
+        for page in PAGES:
+            yield page
+
+    monkeypatch.setattr(module, "get_redis_client", lambda: client)
+    monkeypatch.setattr(module, "iter_search_keys", iter_search_keys)
+    return client
+
+
+def make_index():
+    return FailureIndex(refresh_interval=30, debounce=0.5, max_age=120, reconnect_delay=5)
+
+
+def test_refresh_reads_all_pages(redis):
+    index = make_index()
+    asyncio.run(index.refresh())
+    assert index.ready
+    assert index.version == 1
+    assert redis.closed
+    # failure:3 удалён между чтением ключей и документов
+    assert index.get("failure:3") is None
+    assert index.lookup(5, []) == [DOCUMENTS["failure:1"]]
+    assert index.lookup(None, [12, 10]) == [DOCUMENTS["failure:2"], DOCUMENTS["failure:1"]]
+    assert index.lookup(6, [11]) == [DOCUMENTS["failure:2"]]
+
+
+def test_unchanged_refresh_keeps_version(redis):
+    index = make_index()
+    asyncio.run(index.refresh())
+    asyncio.run(index.refresh())
+    assert index.version == 1
+    assert index.refreshes == 2
+
+
+def test_failed_refresh_is_not_fresh(redis):
+    redis.fail_on = "failure:3"
+    index = make_index()
+    with pytest.raises(ConnectionError):
+        asyncio.run(index.refresh())
+    assert not index.ready
+    assert index.version == 0
+    assert index.lookup(5, [10]) == []
@@ -0,0 +1,123 @@
+"""
+Поиск аварий по логину: crud.find_failures_by_login.
+"""
+
+import asyncio
+import time
+
+import orjson
+import pytest
+from fastapi import HTTPException
+
+from app import crud
+from app.failure_index import _build, failure_index
+
+
+class FakeSearch:
+    """Заглушка redis.ft(index) с ответом FT.SEARCH."""
+
+    def __init__(self, redis):
+        self.redis = redis
+
+    async def search(self, query):
+        self.redis.queries.append(query.query_string())
+        return self.redis.search_result
+
+
+class FakeJson:
+    """Заглушка redis.json() с ответами JSON.GET из словаря документов."""
+
+    def __init__(self, redis):
+        self.redis = redis
+
+    async def get(self, key, *paths):
+        self.redis.json_gets.append((key, paths))
+        document = self.redis.documents.get(key)
+        if document is None:
+            return None
+        return {path: [document[path[2:]]] for path in paths if path[2:] in document}
+
+
+class FakeRedis:
+    def __init__(self, documents, search_result=None):
+        self.documents = documents
+        self.search_result = search_result
+        self.queries = []
+        self.json_gets = []
+
+    def json(self, decoder=None):
+        return FakeJson(self)
+
+    def ft(self, index):
+        assert index == crud.FAILURE_INDEX
+        return FakeSearch(self)
+
+
+class Doc:
+    def __init__(self, id, failures):
+        self.id = id
+        self.json = orjson.dumps(failures).decode()
+
+
+class Result:
+    def __init__(self, docs):
+        self.total = len(docs)
+        self.docs = docs
+
+
+@pytest.fixture(autouse=True)
+def no_failure_index():
+    failure_index._loaded_at = None
+    failure_index._state = ({}, {}, {})
+    yield
+    failure_index._loaded_at = None
+    failure_index._state = ({}, {}, {})
+
+
+def test_missing_login_is_404():
+    redis = FakeRedis({})
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(crud.find_failures_by_login("nobody", redis))
+    assert error.value.status_code == 404
+    assert redis.queries == []
+
+
+def test_login_without_host_and_addresses_has_no_failures():
+    redis = FakeRedis({"login:user": {"hostId": None}})
+    lookup = asyncio.run(crud.find_failures_by_login("user", redis))
+    assert lookup.failures is None
+    assert redis.queries == []
+
+
+def test_no_failures_found():
+    redis = FakeRedis({"login:user": {"hostId": 5, "addressCodes": [10]}}, Result([]))
+    lookup = asyncio.run(crud.find_failures_by_login("user", redis))
+    assert lookup.failures is None
+    assert redis.queries == ["@host:[5 5] | @address:[10 10]"]
+
+
+def test_failures_are_merged_from_documents():
+    redis = FakeRedis(
+        {"login:user": {"hostId": 5, "addressCodes": [10, 11]}},
+        Result([
+            Doc("failure:1", [{"host": 5, "reason": "a"}]),
+            Doc("failure:2", [{"address": 11, "reason": "b"}, {"address": 12, "reason": "c"}]),
+        ]),
+    )
+    lookup = asyncio.run(crud.find_failures_by_login("user", redis))
+    assert [failure["reason"] for failure in lookup.failures] == ["a", "b", "c"]
+    assert lookup.index_version is None
+    assert redis.json_gets == [("login:user", ("$.hostId", "$.addressCodes"))]
+
+
+def test_loaded_index_is_used_instead_of_search():
+    documents = {"failure:1": [{"host": 5, "address": 10, "reason": "a"}]}
+    failure_index._state = (documents, *_build(documents))
+    failure_index._loaded_at = time.monotonic()
+    failure_index.version = 3
+
+    redis = FakeRedis({"login:user": {"hostId": 7, "addressCodes": [10]}})
+    lookup = asyncio.run(crud.find_failures_by_login("user", redis))
+    assert lookup.failures == documents["failure:1"]
+    assert lookup.index_version == 3
+    assert redis.queries == []
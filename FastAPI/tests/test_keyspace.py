@@ -0,0 +1,88 @@
+"""
+Проверка keyspace-уведомлений: app.keyspace.check_keyspace_notifications.
+"""
+
+import asyncio
+
+import pytest
+from redis.exceptions import ResponseError
+
+from app import config, keyspace
+
+
+class FakePubSub:
+    def __init__(self, redis):
+        self.redis = redis
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def subscribe(self, channel):
+        self.redis.channel = channel
+
+    async def get_message(self, ignore_subscribe_messages, timeout):
+        if self.redis.events:
+            return {"channel": self.redis.channel, "data": self.redis.events.pop(0)}
+        await asyncio.sleep(timeout)
+        return None
+
+
+class FakeConnectionPool:
+    connection_kwargs = {"db": 0}
+
+
+class FakeRedis:
+    connection_pool = FakeConnectionPool()
+
+    def __init__(self, flags=None, delivered=()):
+        self.flags = flags
+        self.delivered = list(delivered)
+        self.events = []
+        self.deleted = []
+
+    async def config_get(self, name):
+        if self.flags is None:
+            raise ResponseError("unknown command 'CONFIG'")
+        return {name: self.flags}
+
+    def pubsub(self):
+        return FakePubSub(self)
+
+    async def execute_command(self, *args):
+        assert args[0] == "JSON.SET"
+        assert args[1].startswith(keyspace.PROBE_KEY_PREFIX)
+        self.events.extend(event for event in self.delivered if event == b"json.set")
+
+    async def delete(self, key):
+        self.deleted.append(key)
+        self.events.extend(event for event in self.delivered if event == b"del")
+
+
+@pytest.fixture(autouse=True)
+def short_probe(monkeypatch):
+    monkeypatch.setattr(config, "KEYSPACE_PROBE_TIMEOUT", 0.05)
+    monkeypatch.setattr(config, "REDIS_NOTIFY_KEYSPACE_EVENTS", None)
+
+
+def test_flags_from_config():
+    assert asyncio.run(keyspace.check_keyspace_notifications(FakeRedis("KA")))
+    assert not asyncio.run(keyspace.check_keyspace_notifications(FakeRedis("")))
+
+
+def test_forbidden_config_without_events_disables_caches():
+    redis = FakeRedis()
+    assert not asyncio.run(keyspace.check_keyspace_notifications(redis))
+    assert len(redis.deleted) == 1
+
+
+def test_forbidden_config_with_delivered_events():
+    redis = FakeRedis(delivered=(b"json.set", b"del"))
+    assert asyncio.run(keyspace.check_keyspace_notifications(redis))
+
+
+def test_forbidden_config_with_partial_events():
+    redis = FakeRedis(delivered=(b"json.set",))
+    assert not asyncio.run(keyspace.check_keyspace_notifications(redis))
@@ -0,0 +1,23 @@
+"""
+Маршруты мониторинга: доступ только с токеном.
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.routes import monitoring_routes
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(monitoring_routes.router)
+    return TestClient(app)
+
+
+def test_every_monitoring_route_requires_token(client):
+    paths = [route.path for route in monitoring_routes.router.routes]
+    assert paths
+    for path in paths:
+        assert client.get(path).status_code == 401, path
@@ -0,0 +1,47 @@
+"""
+Поиск по индексам RediSearch в crud: все страницы результата и отбор камер.
+"""
+
+import asyncio
+
+from app import crud
+
+PAGES = [["login:a", "login:b"], ["login:c"]]
+
+
+def test_documents_are_read_from_every_cursor_page(monkeypatch):
+    requested = []
+
+    async def iter_search_keys(redis, index, query):
+        assert (index, query) == ("idx:client", "@flatId:[100 100]")
+        for page in PAGES:
+            yield page
+
+    async def get_json_documents(keys, redis, fields=None):
+        requested.append((keys, fields))
+        # login:b удалён между поиском и чтением
+        return {key: None if key == "login:b" else {"login": key[6:]} for key in keys}
+
+    monkeypatch.setattr(crud, "iter_search_keys", iter_search_keys)
+    monkeypatch.setattr(crud, "get_json_documents", get_json_documents)
+
+    documents = asyncio.run(crud.get_logins_by_flatId_redis(100, None))
+    assert documents == [{"login": "a"}, {"login": "c"}]
+    assert requested == [(page, crud.FLAT_LOGIN_FIELDS) for page in PAGES]
+
+
+def test_cameras_without_flat_are_filtered_by_house_in_the_index(monkeypatch):
+    queries = []
+
+    async def search_json_documents(redis, index, query, fields=None):
+        queries.append((index, query))
+        return [{"Id": 1, "Name": "Подъезд", "Host": "h", "IP": "10.0.0.1", "houseIds": [7]}]
+
+    monkeypatch.setattr(crud, "search_json_documents", search_json_documents)
+
+    cameras = asyncio.run(crud.get_cameras_from_redis("user", None, {"flatId": 0, "houseId": 7}))
+    assert [camera.id for camera in cameras] == [1]
+    assert queries == [("idx:camera", "@CamType:{Личная} (@houseIds:[7 7])")]
+
+    assert asyncio.run(crud.get_cameras_from_redis("user", None, {"flatId": 0})) == []
+    assert len(queries) == 1
@@ -0,0 +1,32 @@
+"""
+Статистика действий: app.stats.get_action_stats.
+"""
+
+import asyncio
+import datetime
+
+from app.stats import get_action_stats
+
+
+class Result:
+    result_set = []
+
+
+class FakeClickhouse:
+    def __init__(self):
+        self.queries = []
+
+    async def query(self, query, parameters=None):
+        self.queries.append(" ".join(query.split()))
+        return Result()
+
+
+def test_every_filter_applies_to_every_slice():
+    client = FakeClickhouse()
+    end = datetime.datetime(2024, 1, 2, tzinfo=datetime.timezone.utc)
+    asyncio.run(get_action_stats(client, end - datetime.timedelta(days=1), end, page="cameras", user_name="ivanov"))
+
+    assert len(client.queries) == 3
+    for query in client.queries:
+        for condition in ("page = {page:String}", "action = {action:String}", "user_name = {user_name:String}"):
+            assert condition in query
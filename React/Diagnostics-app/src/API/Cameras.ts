@@ -137,7 +137,7 @@ const GetNetwork = async (login: string): Promise<ResponseData | ErrorResponse>
     }
 };
 
-export const ChangeCameraData = async (data: CameraDataToChange) => {
+export const ChangeCameraData = async (data: CameraDataToChange, login?: string | null) => {
     const token = localStorage.getItem('token');
     
     if (!token) {
@@ -157,7 +157,9 @@ export const ChangeCameraData = async (data: CameraDataToChange) => {
             {
                 headers: {
                     'x-token': token
-                }
+                },
+                // Действие записывается в журнал на сервере
+                params: login ? { login } : undefined
             }
         );
 
@@ -27,16 +27,23 @@ export interface User {
 
 export type UserDataToChange = Partial<User>;
 
-const UsersList = async (): Promise<User[] | string> => {
+export interface UsersPage {
+    users: User[];
+    // Курсор следующей страницы, отсутствует на последней
+    nextCursor?: string;
+}
+
+const UsersList = async (afterId?: string): Promise<UsersPage | string> => {
 
     try {
         const token = localStorage.getItem("token");
         const response = await api.get("/v1/users", {
             headers: {
                 'x-token': `${token}`
-            }
+            },
+            params: afterId ? { after_id: afterId } : {}
         });
-        return response.data;
+        return { users: response.data, nextCursor: response.headers["x-next-cursor"] };
     } catch (err) {
         const error = err as AxiosError<ApiError>;
         if (error.status === 401) {
@@ -43,7 +43,7 @@ const CameraModal: React.FC<ModalProps> = ({
     };
 
     try {
-      const response = await ChangeCameraData(dataToSave);
+      const response = await ChangeCameraData(dataToSave, login);
       setIsEditing(false);
 
       if (response.success) {
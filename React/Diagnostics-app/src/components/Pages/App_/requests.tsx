@@ -102,27 +102,11 @@ export const handleUserDelete = async (
       headers: {
         "x-token": `${token}`,
       },
+      // Действие записывается в журнал на сервере
+      params: { login, target: isPhoneDelete ? "phone" : "contract" },
     });
 
     if (response.status !== 200) {
-      // Логирование ошибки
-      await LogData({
-        login,
-        page: `Приложение`,
-        action: isPhoneDelete
-          ? "Кнопка отвязать (Телефон на адресе)"
-          : "Кнопка отвязать (Договор на телефоне)",
-        success: false,
-        url: url,
-        payload: { house_id },
-        message: `Ошибка: ${
-          response.statusText ||
-          (isPhoneDelete
-            ? "Не удалось отвязать номер"
-            : "Не удалось отвязать договор")
-        }`,
-      });
-
       toast.error(
         `Ошибка: ${
           response.statusText ||
@@ -135,21 +119,6 @@ export const handleUserDelete = async (
       return;
     }
 
-    // Логирование успешного выполнения
-    await LogData({
-      login,
-      page: `Приложение`,
-      action: isPhoneDelete
-        ? "Кнопка отвязать (Телефон на адресе)"
-        : "Кнопка отвязать (Договор на телефоне)",
-      success: true,
-      url: url,
-      payload: { house_id },
-      message: isPhoneDelete
-        ? "Телефон успешно отвязан"
-        : "Договор успешно отвязан",
-    });
-
     toast.success(
       isPhoneDelete ? "Телефон успешно отвязан" : "Договор успешно отвязан",
       {
@@ -168,19 +137,6 @@ export const handleUserDelete = async (
       setData(null);
     }
   } catch (error) {
-    // Логирование исключения
-    await LogData({
-      login,
-      page: `Приложение`,
-      action: isPhoneDelete
-        ? "Кнопка отвязать (Телефон на адресе)"
-        : "Кнопка отвязать (Договор на телефоне)",
-      success: false,
-      url: url,
-      payload: { house_id },
-      message: `Ошибка: ${String(error)}`,
-    });
-
     toast.error(
       `Ошибка: ${
         error ||
@@ -217,20 +173,11 @@ export const ChangeRole = async (
         headers: {
           "x-token": token,
         },
+        // Действие записывается в журнал на сервере
+        params: { login },
       }
     );
 
-    // Логирование успешного выполнения
-    await LogData({
-      login,
-      page: `Приложение`,
-      action: "Изменение роли",
-      success: true,
-      url: url,
-      payload: { house_id, flat_id, role },
-      message: "Роль успешно изменена",
-    });
-
     toast.success("Роль успешно изменена", {
       position: "bottom-right",
     });
@@ -256,16 +203,6 @@ export const ChangeRole = async (
     const errorDetail =
       error.response?.data?.detail || "Не удалось изменить роль";
 
-    await LogData({
-      login,
-      page: `Приложение`,
-      action: "Изменение роли",
-      success: false,
-      url: url,
-      payload: { house_id, flat_id, role },
-      message: errorDetail,
-    });
-
     toast.error(`${errorDetail || "Не удалось изменить роль"}`, {
       position: "bottom-right",
     });
@@ -298,21 +235,11 @@ export const Relocate = async (
       headers: {
         "x-token": `${token}`,
       },
+      // Действие записывается в журнал на сервере
+      params: { login },
     });
 
     if (response.status !== 200) {
-      await LogData({
-        login,
-        page: `Приложение`,
-        action: "Переселение",
-        success: false,
-        url: url,
-        payload: { phones, UUID2, flat, address_house_id },
-        message: `Ошибка: ${
-          response.statusText || "Не удалось переселить договор"
-        }`,
-      });
-
       toast.error(
         `Ошибка: ${response.statusText || "Не удалось переселить договор"}`,
         { position: "bottom-right" }
@@ -320,17 +247,6 @@ export const Relocate = async (
       return;
     }
 
-    // Логирование успешного выполнения
-    await LogData({
-      login,
-      page: `Приложение`,
-      action: "Переселение",
-      success: true,
-      url: url,
-      payload: { phones, UUID2, address_house_id, flat },
-      message: "Договор успешно переселен",
-    });
-
     toast.success("Договор успешно переселен", {
       position: "bottom-right",
     });
@@ -346,17 +262,6 @@ export const Relocate = async (
       setData(null);
     }
   } catch (error) {
-    // Логирование исключения
-    await LogData({
-      login,
-      page: `Приложение`,
-      action: "Переселение",
-      success: false,
-      url: url,
-      payload: { phones, UUID2, address_house_id, flat },
-      message: `Ошибка: ${String(error)}`,
-    });
-
     toast.error(`Ошибка: ${error || "Не удалось переселить договор"}`, {
       position: "bottom-right",
     });
@@ -1,8 +1,15 @@
 import { useNavigate } from "react-router-dom";
+import api from "../../../API/api";
 
 export const Logout = () => {
     const navigate = useNavigate();
     const handleLogout = () => {
+      const token = localStorage.getItem("token");
+      if (token) {
+        api
+          .post("/v1/logout", null, { headers: { "x-token": token } })
+          .catch(() => undefined);
+      }
       localStorage.removeItem("token");
       navigate("/login");
     };
@@ -1,7 +1,6 @@
 import { useState } from "react";
 import { toast } from "react-toastify";
 import { FixManualBlock } from "./IntercomRequests";
-import { LogData } from "../../../API/Log";
 import { Button, Spinner } from "react-bootstrap";
 
 interface FixManualBlockButtonProps {
@@ -17,7 +16,7 @@ const FixManualBlockButton = ({ houseFlatId, onFixed, login }: FixManualBlockBut
     setIsLoading(true);
     
     try {
-      const result = await FixManualBlock({ house_flat_id: houseFlatId });
+      const result = await FixManualBlock({ house_flat_id: houseFlatId }, login);
       
       if (!result.success) {
         // Обработка ожидаемых ошибок (400, 404 и т.д.)
@@ -25,20 +24,6 @@ const FixManualBlockButton = ({ houseFlatId, onFixed, login }: FixManualBlockBut
           position: "bottom-right",
           autoClose: 5000,
         });
-
-        await LogData({
-          login,
-          page: "Видеонаблюдение",
-          action: "Исправление manual block",
-          success: false,
-          message: result.message || "Ошибка исправления manual block",
-          url: window.location.pathname,
-          payload: { 
-            house_flat_id: houseFlatId,
-            error_type: "api_error",
-            error_message: result.message
-          }
-        });
         return;
       }
 
@@ -49,16 +34,6 @@ const FixManualBlockButton = ({ houseFlatId, onFixed, login }: FixManualBlockBut
           autoClose: 3000,
         });
 
-        await LogData({
-          login,
-          page: "Видеонаблюдение",
-          action: "Исправление manual block",
-          success: true,
-          message: result.message || `Manual block исправлен для house_flat_id: ${houseFlatId}`,
-          url: window.location.pathname,
-          payload: { house_flat_id: houseFlatId }
-        });
-
         if (onFixed) onFixed();
       } else {
         // Значение уже было корректным
@@ -75,20 +50,6 @@ const FixManualBlockButton = ({ houseFlatId, onFixed, login }: FixManualBlockBut
         position: "top-right",
         autoClose: 7000,
       });
-      
-      await LogData({
-        login,
-        page: "Видеонаблюдение",
-        action: "Исправление manual block",
-        success: false,
-        message: errorMessage,
-        url: window.location.pathname,
-        payload: { 
-          house_flat_id: houseFlatId,
-          error_type: "system_error",
-          error_message: errorMessage
-        }
-      });
     } finally {
       setIsLoading(false);
     }
@@ -16,7 +16,7 @@ export interface FixManualBlockResponse {
   house_flat_id: number;
 }
 
-const FixManualBlock = async (data: FixManualBlockRequest): Promise<FixManualBlockResponse> => {
+const FixManualBlock = async (data: FixManualBlockRequest, login: string): Promise<FixManualBlockResponse> => {
   const token = localStorage.getItem("token");
   
   try {
@@ -28,6 +28,8 @@ const FixManualBlock = async (data: FixManualBlockRequest): Promise<FixManualBlo
           "Content-Type": "application/json",
           "x-token": token,
         },
+        // Действие записывается в журнал на сервере
+        params: { login },
       }
     );
 
@@ -11,24 +11,43 @@ const Users: React.FC = () => {
   const [actionList, setActionList] = useState<Action[] | undefined>([]);
   const [error, setError] = useState<string | null>(null);
   const [loadingCount, setLoadingCount] = useState<number>(2); // Отслеживание загрузок
+  const [nextCursor, setNextCursor] = useState<string | undefined>(undefined);
+  const [loadingMore, setLoadingMore] = useState<boolean>(false);
   const navigate = useNavigate();
 
+  // Список отдаётся постранично: следующая страница загружается по кнопке
+  const loadUsers = async (afterId?: string) => {
+    const result = await UsersList(afterId);
+    if (typeof result === "string") {
+      setError(result);
+      return;
+    }
+    setUsers((prev) =>
+      // Сортировка пользователей: сначала по роли, затем по логину
+      [...(afterId ? prev ?? [] : []), ...result.users].sort((a, b) => {
+        if (a.role === "admin" && b.role !== "admin") return -1;
+        if (a.role !== "admin" && b.role === "admin") return 1;
+        return a.username.localeCompare(b.username);
+      })
+    );
+    setNextCursor(result.nextCursor);
+  };
+
+  const loadMoreUsers = async () => {
+    setLoadingMore(true);
+    try {
+      await loadUsers(nextCursor);
+    } catch (err) {
+      setError("Неожиданная ошибка");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
     const fetchUsers = async () => {
       try {
-        const result = await UsersList();
-        if (typeof result === "string") {
-          setError(result);
-        } else {
-          // Сортировка пользователей
-          const sortedUsers = result.sort((a, b) => {
-            // Сначала по роли
-            if (a.role === "admin" && b.role !== "admin") return -1;
-            if (a.role !== "admin" && b.role === "admin") return 1;
-            return a.username.localeCompare(b.username);
-          });
-          setUsers(sortedUsers);
-        }
+        await loadUsers();
       } catch (err) {
         setError("Неожиданная ошибка");
       } finally {
@@ -101,6 +120,17 @@ const Users: React.FC = () => {
                 ))}
               </tbody>
             </table>
+            {nextCursor && (
+              <div className="text-center mb-4">
+                <button
+                  className="btn btn-primary btn-sm"
+                  onClick={loadMoreUsers}
+                  disabled={loadingMore}
+                >
+                  {loadingMore ? "Загрузка..." : "Загрузить ещё"}
+                </button>
+              </div>
+            )}
 
             <h1 className="text-center title md-5">Последние изменения</h1>
             <table className="table">